@@ -3,14 +3,49 @@ Growces AI Content Generator - Main Application
 Production-ready Streamlit app for content generation
 """
 
-# import os
-# import time
+import os
+import tempfile
+import time
+from dataclasses import asdict
 from datetime import datetime
 
 import streamlit as st
 
 from config import Config
+from src.generators.campaign import CampaignBrief, generate_campaign
 from src.generators.content_generator import ContentGenerator
+from src.generators.localization import COMMON_LOCALES, localize
+from src.generators.scoring import score_content
+from src.utils.export import DEFAULT_COLUMNS, EXPORT_COLUMNS, EXPORTERS, iter_scored
+from src.utils.ledger import summarize
+from src.utils.profiler import get_profiler
+from src.utils.request_context import DEFAULT_CLIENT, request_scope
+from src.utils.session_memory import SpillableSession, get_session_memory
+
+Config.setup_logging()
+
+# Sample this rerun when profiling is on; a rerun stopped early is dropped
+# from the profile when its script thread ends
+profiler = get_profiler()
+profiler.enter("app_rerun")
+
+# Form label -> content type, for generation-time estimates
+CONTENT_TYPE_KEYS = {
+    "Blog Post": "blog_post",
+    "Social Media Post": "social_post",
+    "Ad Copy": "ad_copy",
+    "Email Template": "email",
+    "Landing Page Copy": "landing_page",
+    "Product Description": "product_description",
+}
+
+# Form labels with a structured (JSON) output mode
+STRUCTURED_CONTENT_TYPES = {
+    "Social Media Post": "social_post",
+    "Ad Copy": "ad_copy",
+    "Email Template": "email",
+    "Landing Page Copy": "landing_page",
+}
 
 # Page configuration
 st.set_page_config(
@@ -65,13 +100,17 @@ st.markdown(
     unsafe_allow_html=True,
 )
 
-# Initialize session state
-if "generated_content" not in st.session_state:
-    st.session_state.generated_content = None
-if "generation_history" not in st.session_state:
-    st.session_state.generation_history = []
+# Initialize session state; large payloads live in a SpillableSession so idle
+# sessions can be moved to disk and restored when the user comes back
+session_memory = get_session_memory()
+if "session_data" not in st.session_state:
+    st.session_state.session_data = session_memory.track(
+        SpillableSession(generated_content=None, generation_history=[])
+    )
 if "total_generated" not in st.session_state:
     st.session_state.total_generated = 0
+session_data = st.session_state.session_data
+session_memory.maybe_evict()
 
 
 # Initialize generator
@@ -81,7 +120,14 @@ def get_generator():
     return ContentGenerator()
 
 
+@st.cache_data(ttl=60, show_spinner=False)
+def load_usage(_ledger, days: int):
+    """Daily ledger rollups for the look-back window (re-queried at most once a minute)"""
+    return _ledger.rollups("daily", since=time.time() - days * 86400)
+
+
 try:
+    Config.validate()
     generator = get_generator()
 except Exception as e:
     st.error(f"❌ Failed to initialize: {e}")
@@ -109,6 +155,7 @@ with st.sidebar:
             "Email Template",
             "Landing Page Copy",
             "Product Description",
+            "Full Campaign",
         ],
         help="Select the type of content you want to generate",
     )
@@ -129,19 +176,39 @@ with st.sidebar:
         help="Choose the writing tone",
     )
 
+    structured_output = st.checkbox(
+        "📐 Structured output (JSON)",
+        help="Ad copy, email, landing page and social posts come back as validated fields",
+    )
+
+    locales = st.multiselect(
+        "🌍 Also localize into",
+        list(COMMON_LOCALES),
+        help="The content is generated once, then translated for each locale in parallel",
+    )
+
+    st.markdown("---")
+
+    # Client attribution for usage tracking and quotas
+    client_name = st.text_input(
+        "👤 Client / Account",
+        value="growces",
+        help="Usage and token quotas are tracked per client",
+    )
+
     st.markdown("---")
 
     # Statistics
     st.markdown("## 📊 Statistics")
     st.metric("Content Generated", st.session_state.total_generated)
-    st.metric("This Session", len(st.session_state.generation_history))
+    st.metric("This Session", len(session_data["generation_history"]))
 
     st.markdown("---")
     st.markdown(f"**Version:** {Config.APP_VERSION}")
     st.markdown(f"**Model:** {Config.GROQ_MODEL}")
 
 # Main content area
-tab1, tab2, tab3 = st.tabs(["✍️ Generate", "📜 History", "ℹ️ About"])
+tab1, tab2, tab_usage, tab3 = st.tabs(["✍️ Generate", "📜 History", "📈 Usage", "ℹ️ About"])
 
 with tab1:
     # Dynamic form based on content type
@@ -235,6 +302,42 @@ with tab1:
 
             params = {"offer": offer, "target_audience": target_audience, "tone": tone}
 
+        elif content_type == "Full Campaign":
+            col1, col2 = st.columns(2)
+            with col1:
+                product = st.text_input(
+                    "📦 Product/Service",
+                    placeholder="e.g., SmartHome AI Assistant",
+                    help="What the campaign promotes",
+                )
+                target_audience = st.text_input(
+                    "👥 Target Audience",
+                    placeholder="e.g., Tech-savvy homeowners aged 30-50",
+                )
+            with col2:
+                offer = st.text_input(
+                    "🎁 Offer/Value Proposition",
+                    placeholder="e.g., 30% off during launch week",
+                )
+                keywords = st.text_input(
+                    "🔑 Keywords (comma-separated)",
+                    placeholder="e.g., smart home, voice assistant",
+                )
+            platforms = st.multiselect(
+                "📱 Social Platforms",
+                ["LinkedIn", "Twitter/X", "Instagram", "Facebook"],
+                default=["LinkedIn", "Twitter/X"],
+            )
+
+            params = {
+                "product": product,
+                "audience": target_audience,
+                "offer": offer,
+                "keywords": keywords,
+                "tone": tone,
+                "platforms": tuple(platforms),
+            }
+
         else:  # Product Description
             product_name = st.text_input(
                 "📦 Product Name",
@@ -258,48 +361,97 @@ with tab1:
         if any(not v for v in params.values() if isinstance(v, str)):
             st.error("❌ Please fill in all required fields!")
         else:
-            with st.spinner("🤖 Generating your content... Please wait."):
+            with request_scope(client=client_name or DEFAULT_CLIENT):
                 try:
-                    # Call appropriate generator method
-                    if content_type == "Blog Post":
-                        result = generator.generate_blog_post(**params)
-                    elif content_type == "Social Media Post":
-                        result = generator.generate_social_post(**params)
-                    elif content_type == "Ad Copy":
-                        result = generator.generate_ad_copy(**params)
-                    elif content_type == "Email Template":
-                        result = generator.generate_email(**params)
-                    elif content_type == "Landing Page Copy":
-                        result = generator.generate_landing_page(**params)
-                    else:
-                        result = generator.generate_product_description(**params)
-
-                    if result["success"]:
-                        st.session_state.generated_content = result
-                        st.session_state.generation_history.append(
-                            {
-                                "timestamp": datetime.now(),
-                                "type": content_type,
-                                "result": result,
+                    eta = ""
+                    if content_type in CONTENT_TYPE_KEYS:
+                        type_key = CONTENT_TYPE_KEYS[content_type]
+                        seconds = generator.estimate(type_key, **params)["eta"]
+                        eta = f" (about {max(1, round(seconds))}s)" if seconds else ""
+
+                    with st.spinner(f"🤖 Generating your content{eta}... Please wait."):
+                        # Call appropriate generator method
+                        if structured_output and content_type in STRUCTURED_CONTENT_TYPES:
+                            result = generator.generate_structured(
+                                STRUCTURED_CONTENT_TYPES[content_type], **params
+                            )
+                        elif content_type == "Blog Post":
+                            result = generator.generate_blog_post(**params)
+                        elif content_type == "Social Media Post":
+                            result = generator.generate_social_post(**params)
+                        elif content_type == "Ad Copy":
+                            result = generator.generate_ad_copy(**params)
+                        elif content_type == "Email Template":
+                            result = generator.generate_email(**params)
+                        elif content_type == "Landing Page Copy":
+                            result = generator.generate_landing_page(**params)
+                        elif content_type == "Full Campaign":
+                            result = generate_campaign(
+                                generator, CampaignBrief(**params)
+                            ).as_result()
+                        else:
+                            result = generator.generate_product_description(**params)
+
+                        # Structured results are already schema-validated
+                        if (
+                            result["success"]
+                            and result["type"] in ("email", "landing_page")
+                            and result.get("data") is None
+                        ):
+                            result = generator.repair_sections(result)
+
+                        if result["success"] and locales and result["type"] != "campaign":
+                            localized = localize(generator, result, locales)
+                            result["translations"] = {
+                                locale: translation["content"]
+                                for locale, translation in localized.translations.items()
+                                if translation["success"]
                             }
-                        )
-                        st.session_state.total_generated += 1
-
-                        st.success(
-                            f"✅ Content generated successfully in {result['time']:.2f} seconds!"
-                        )
-                    else:
-                        st.error(f"❌ Generation failed: {result.get('error', 'Unknown error')}")
+                            if localized.failed:
+                                st.warning(
+                                    f"Localization failed for: {', '.join(localized.failed)}"
+                                )
+
+                        if result["success"]:
+                            session_data["generated_content"] = result
+                            session_data["generation_history"].append(
+                                {
+                                    "timestamp": datetime.now(),
+                                    "type": content_type,
+                                    "result": result,
+                                }
+                            )
+                            st.session_state.total_generated += 1
+
+                            st.success(
+                                f"✅ Content generated successfully in {result['time']:.2f} seconds!"
+                            )
+                            if result.get("stale"):
+                                st.info(
+                                    "ℹ️ Service is busy - showing a previously generated version."
+                                )
+                            elif result.get("degraded"):
+                                st.info("ℹ️ Service is busy - output was shortened.")
+                        elif result.get("busy"):
+                            st.warning(f"⏳ {result['error']}")
+                        else:
+                            st.error(f"❌ Generation failed: {result.get('error', 'Unknown error')}")
 
                 except Exception as e:
                     st.error(f"❌ An error occurred: {str(e)}")
 
     # Display generated content
-    if st.session_state.generated_content:
+    if session_data["generated_content"]:
         st.markdown("---")
         st.markdown("## 📄 Generated Content")
 
-        result = st.session_state.generated_content
+        result = session_data["generated_content"]
+        # Scored once per result (and cached per content hash), not on every rerun
+        if "scores" not in result:
+            result["scores"] = score_content(
+                result["content"], (result.get("parameters") or {}).get("keywords")
+            )
+        scores = result["scores"]
 
         # Metrics
         col1, col2, col3 = st.columns(3)
@@ -314,12 +466,47 @@ with tab1:
                 unsafe_allow_html=True,
             )
         with col3:
-            word_count = len(result["content"].split())
             st.markdown(
-                f'<div class="metric-card"><b>Word Count</b><br/>{word_count}</div>',
+                f'<div class="metric-card"><b>Word Count</b><br/>{int(scores["words"])}</div>',
                 unsafe_allow_html=True,
             )
 
+        with st.expander(f"🔎 SEO & Readability — score {scores['seo_score']:.0f}/100"):
+            col1, col2, col3, col4 = st.columns(4)
+            col1.metric("Reading Ease", f"{scores['reading_ease']:.0f}")
+            col2.metric("Grade Level", f"{scores['grade_level']:.1f}")
+            col3.metric("Words / Sentence", f"{scores['avg_sentence_words']:.1f}")
+            col4.metric("Headings", f"{int(scores['h1'])} H1 / {int(scores['subheadings'])} sub")
+            if scores["keyword_coverage"] is not None:
+                col1, col2, col3, col4 = st.columns(4)
+                col1.metric("Keyword Coverage", f"{scores['keyword_coverage']:.0%}")
+                col2.metric("Keyword Density", f"{scores['keyword_density']:.1%}")
+                col3.metric("Keywords in Headings", f"{scores['keywords_in_headings']:.0%}")
+                col4.metric("Long Sentences", f"{scores['long_sentence_ratio']:.0%}")
+
+        if result.get("terminated_early"):
+            st.caption(
+                f"✂️ Stopped once length/structure targets were met "
+                f"(~{result['tokens_saved']} tokens saved)"
+            )
+
+        if result.get("type") == "campaign":
+            st.caption(
+                f"🧩 Campaign pieces ran in parallel: {result['time']:.1f}s vs "
+                f"{result['sequential_time']:.1f}s back to back, "
+                f"~{result['context_tokens_saved']} prompt tokens saved by summaries"
+            )
+            if result["failed"]:
+                st.warning(f"Some pieces failed: {', '.join(result['failed'])}")
+
+        if result.get("data") is not None:
+            with st.expander("📐 Structured fields"):
+                st.json(asdict(result["data"]))
+
+        repaired = result.get("validation", {}).get("repaired")
+        if repaired:
+            st.caption(f"🩹 Regenerated missing/invalid sections: {', '.join(repaired)}")
+
         st.markdown("### Content:")
         st.text_area(
             "Generated Content",
@@ -328,6 +515,17 @@ with tab1:
             label_visibility="collapsed",
         )
 
+        translations = result.get("translations")
+        if translations:
+            st.markdown("### Localized Versions:")
+            for locale_tab, (locale, text) in zip(
+                st.tabs(list(translations)), translations.items()
+            ):
+                with locale_tab:
+                    st.text_area(
+                        locale, text, height=300, label_visibility="collapsed", key=f"l10n_{locale}"
+                    )
+
         # Download options
         col1, col2 = st.columns(2)
         with col1:
@@ -356,8 +554,8 @@ with tab1:
 with tab2:
     st.markdown("## 📜 Generation History")
 
-    if st.session_state.generation_history:
-        for idx, item in enumerate(reversed(st.session_state.generation_history[-10:])):
+    if session_data["generation_history"]:
+        for idx, item in enumerate(reversed(session_data["generation_history"][-10:])):
             with st.expander(f"{item['timestamp'].strftime('%Y-%m-%d %H:%M:%S')} - {item['type']}"):
                 st.text_area(
                     "Content",
@@ -368,9 +566,127 @@ with tab2:
                 st.caption(
                     f"Tokens: {item['result']['tokens']} | Time: {item['result']['time']:.2f}s"
                 )
+
+        st.markdown("### 📦 Bulk Export")
+        col1, col2 = st.columns([1, 3])
+        with col1:
+            export_format = st.selectbox("Format", list(EXPORTERS), key="export_format")
+        with col2:
+            export_columns = st.multiselect(
+                "Columns", EXPORT_COLUMNS, default=list(DEFAULT_COLUMNS), key="export_columns"
+            )
+
+        if st.button("📦 Prepare Export", disabled=not export_columns):
+            # A private file per export, so concurrent sessions never share one
+            export_fd, export_path = tempfile.mkstemp(
+                prefix="growces_history_", suffix=f".{export_format}"
+            )
+            os.close(export_fd)
+            try:
+                history = session_data["generation_history"]
+                if "scores" in export_columns:
+                    history = iter_scored(history)
+                EXPORTERS[export_format](history, export_path, export_columns)
+                with open(export_path, "rb") as export_file:
+                    export_data = export_file.read()
+            finally:
+                os.remove(export_path)
+            st.download_button(
+                f"📥 Download {export_format.upper()}",
+                export_data,
+                file_name=f"history_{datetime.now().strftime('%Y%m%d_%H%M%S')}.{export_format}",
+                use_container_width=True,
+            )
     else:
         st.info("📭 No content generated yet. Start creating in the Generate tab!")
 
+with tab_usage:
+    st.markdown("## 📈 Token Usage")
+
+    if generator.ledger is None:
+        st.info("📭 Usage ledger is disabled (set LEDGER_ENABLED=true to enable it)")
+    elif not st.toggle("📊 Load usage report", key="usage_report"):
+        st.caption("Turn on to query the usage ledger (cached for a minute).")
+    else:
+        usage_days = st.slider("📅 Look-back window (days)", 1, 90, 30)
+        usage = load_usage(generator.ledger, usage_days)
+
+        if usage.empty:
+            st.info("📭 No usage recorded in this window yet.")
+        else:
+            by_type = summarize(usage, ["content_type"])
+            col1, col2, col3 = st.columns(3)
+            col1.metric("API Calls", int(by_type["calls"].sum()))
+            col2.metric("Tokens", f"{int(by_type['tokens'].sum()):,}")
+            col3.metric("Est. Cost", f"${by_type['cost'].sum():.2f}")
+
+            st.markdown("### Tokens per day by content type")
+            st.bar_chart(
+                usage.pivot_table(
+                    index="bucket", columns="content_type", values="tokens", aggfunc="sum"
+                )
+            )
+
+            st.markdown("### By content type")
+            st.dataframe(by_type, use_container_width=True, hide_index=True)
+            st.markdown("### By client")
+            st.dataframe(summarize(usage, ["client"]), use_container_width=True, hide_index=True)
+
+    with st.expander("⏱️ Scheduler queues"):
+        scheduler_metrics = generator.scheduler.metrics()
+        st.caption(
+            f"In flight: {scheduler_metrics['in_flight']}/{scheduler_metrics['max_concurrency']}"
+        )
+        st.table(
+            {
+                lane: {key: round(value, 3) for key, value in stats.items()}
+                for lane, stats in scheduler_metrics["lanes"].items()
+            }
+        )
+
+    with st.expander("🧠 Session memory"):
+        # Sizing walks every session's objects, so it only runs when asked
+        if st.button("📏 Measure memory"):
+            st.session_state.memory_metrics = session_memory.metrics(
+                shared={"generator": generator}
+            )
+        memory_metrics = st.session_state.get("memory_metrics")
+        if memory_metrics is None:
+            st.caption("Measures live sessions and the shared generator.")
+        else:
+            col1, col2, col3 = st.columns(3)
+            col1.metric("Sessions", memory_metrics["sessions"])
+            col2.metric("Spilled to disk", memory_metrics["spilled_sessions"])
+            col3.metric("Session memory", f"{memory_metrics['session_bytes'] / 2**20:.1f} MB")
+            st.caption(
+                f"Largest session: {memory_metrics['largest_session_bytes'] / 2**20:.1f} MB | "
+                f"Generator: {memory_metrics['shared_bytes']['generator'] / 2**20:.1f} MB | "
+                f"Evicted so far: {memory_metrics['evicted_total']}"
+            )
+
+    with st.expander("🔬 Profiler"):
+        profiling = st.toggle("Sample app reruns and generation calls", value=profiler.enabled)
+        if profiling and not profiler.enabled:
+            profiler.enable()
+        elif not profiling and profiler.enabled:
+            profiler.disable()
+        profile_summary = profiler.summary(top=10)
+        if profile_summary:
+            profile_label = st.selectbox("Scope", sorted(profile_summary), key="profile_label")
+            stats = profile_summary[profile_label]
+            st.caption(f"{stats['samples']} samples (~{stats['seconds']:.1f}s)")
+            st.table(
+                {name: f"{100 * count / stats['samples']:.1f}%" for name, count in stats["self"]}
+            )
+            col1, col2 = st.columns(2)
+            if col1.button("💾 Write flamegraph files"):
+                paths = profiler.dump()
+                st.success(f"Wrote {len(paths)} files to {os.path.dirname(paths[0])}")
+            if col2.button("🗑️ Reset samples"):
+                profiler.reset()
+        else:
+            st.info("📭 No samples yet. Enable profiling and generate some content.")
+
 with tab3:
     st.markdown("## ℹ️ About This Tool")
 
@@ -425,3 +741,5 @@ with tab3:
     Built with ❤️ for **Growces Digital Marketing Agency**
     """
     )
+
+profiler.exit("app_rerun")
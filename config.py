@@ -1,17 +1,15 @@
 """
 Configuration management for Growces Content Generator
 Handles environment variables and app settings
+
+Importing this module has no side effects: the .env file is read and the
+configuration validated only when ``Config.load()`` / ``Config.validate()``
+are first called.
 """
 
-import logging
 import os
 from typing import Optional
 
-from dotenv import load_dotenv
-
-# Load environment variables from .env file
-load_dotenv()
-
 
 class Config:
     """Application configuration"""
@@ -20,24 +18,134 @@ class Config:
     GROQ_API_KEY: Optional[str] = os.getenv("GROQ_API_KEY")
     GROQ_MODEL: str = "llama-3.3-70b-versatile"
 
+    # OpenAI-compatible server (e.g. local CPU inference) exposed as the "local" backend
+    LOCAL_LLM_BASE_URL: str = os.getenv("LOCAL_LLM_BASE_URL", "")
+    LOCAL_LLM_API_KEY: str = os.getenv("LOCAL_LLM_API_KEY", "")
+    LOCAL_LLM_MAX_CONCURRENCY: int = int(os.getenv("LOCAL_LLM_MAX_CONCURRENCY", "2"))
+
     # App Configuration
     APP_ENV: str = os.getenv("APP_ENV", "development")
     LOG_LEVEL: str = os.getenv("LOG_LEVEL", "INFO")
+    LOG_FILE: str = os.getenv("LOG_FILE", "logs/app.log")
+    LOG_MAX_BYTES: int = int(os.getenv("LOG_MAX_BYTES", str(10 * 1024 * 1024)))
+    LOG_BACKUP_COUNT: int = int(os.getenv("LOG_BACKUP_COUNT", "5"))
 
     # Content Generation Defaults
     DEFAULT_TEMPERATURE: float = 0.7
     DEFAULT_MAX_TOKENS: int = 2000
     MAX_RETRIES: int = 3
     RETRY_DELAY: int = 2
+    # Follow-up calls resuming output cut off by the token limit
+    MAX_CONTINUATIONS: int = int(os.getenv("MAX_CONTINUATIONS", "2"))
+    PROFILES_PATH: str = os.getenv("PROFILES_PATH", "profiles.json")
+    RESPONSE_CACHE_PATH: str = os.getenv("RESPONSE_CACHE_PATH", "data/responses.db")
+    TRANSLATION_CACHE_TTL: int = int(os.getenv("TRANSLATION_CACHE_TTL", str(7 * 24 * 3600)))
+    LATENCY_DB_PATH: str = os.getenv("LATENCY_DB_PATH", "data/latency.db")
+
+    # Scheduler (0 tokens per minute = unlimited); the interactive slots and token
+    # share are held back from api and batch work
+    SCHEDULER_MAX_CONCURRENCY: int = int(os.getenv("SCHEDULER_MAX_CONCURRENCY", "4"))
+    SCHEDULER_TOKENS_PER_MINUTE: int = int(os.getenv("SCHEDULER_TOKENS_PER_MINUTE", "0"))
+    SCHEDULER_INTERACTIVE_SLOTS: int = int(os.getenv("SCHEDULER_INTERACTIVE_SLOTS", "1"))
+    SCHEDULER_INTERACTIVE_TOKEN_SHARE: float = float(
+        os.getenv("SCHEDULER_INTERACTIVE_TOKEN_SHARE", "0.1")
+    )
+
+    # Admission control: shed above MAX_WAIT seconds of queueing or MAX_QUEUE waiting
+    # requests, degrade (shorter output, no long-form) above DEGRADE_WAIT seconds
+    ADMISSION_ENABLED: bool = os.getenv("ADMISSION_ENABLED", "true").lower() == "true"
+    ADMISSION_MAX_WAIT: float = float(os.getenv("ADMISSION_MAX_WAIT", "30"))
+    ADMISSION_DEGRADE_WAIT: float = float(os.getenv("ADMISSION_DEGRADE_WAIT", "10"))
+    ADMISSION_MAX_QUEUE: int = int(os.getenv("ADMISSION_MAX_QUEUE", "50"))
+    DEGRADED_MAX_TOKENS: int = int(os.getenv("DEGRADED_MAX_TOKENS", "800"))
+    STALE_CACHE_SECONDS: int = int(os.getenv("STALE_CACHE_SECONDS", str(7 * 24 * 3600)))
+
+    # Streamlit sessions idle this long have their results spilled to disk (0 = never)
+    SESSION_IDLE_SECONDS: int = int(os.getenv("SESSION_IDLE_SECONDS", "1800"))
+    SESSION_SPILL_DIR: str = os.getenv("SESSION_SPILL_DIR", "data/sessions")
+
+    # Sampling profiler (also switchable from the app's Usage tab)
+    PROFILING_ENABLED: bool = os.getenv("PROFILING_ENABLED", "false").lower() == "true"
+    PROFILING_INTERVAL_MS: float = float(os.getenv("PROFILING_INTERVAL_MS", "10"))
+    PROFILING_DIR: str = os.getenv("PROFILING_DIR", "data/profiles")
+
+    # Job Queue
+    JOB_DB_PATH: str = os.getenv("JOB_DB_PATH", "data/jobs.db")
+    JOB_LEASE_SECONDS: int = int(os.getenv("JOB_LEASE_SECONDS", "120"))
+    JOB_MAX_ATTEMPTS: int = int(os.getenv("JOB_MAX_ATTEMPTS", "3"))
+    JOB_POLL_INTERVAL: float = float(os.getenv("JOB_POLL_INTERVAL", "1.0"))
+    # Jobs run shortest-predicted-first; ones waiting longer than this go first regardless
+    JOB_MAX_WAIT: float = float(os.getenv("JOB_MAX_WAIT", "900"))
+
+    # Usage Ledger
+    LEDGER_ENABLED: bool = os.getenv("LEDGER_ENABLED", "true").lower() == "true"
+    LEDGER_DB_PATH: str = os.getenv("LEDGER_DB_PATH", "data/usage.db")
 
     # App Metadata
     APP_NAME: str = "Growces AI Content Generator"
     APP_VERSION: str = "1.0.0"
     CLIENT_NAME: str = "Growces Digital Marketing Agency"
 
+    # Settings re-read from the environment once .env has been loaded
+    _ENV_SETTINGS = {
+        "GROQ_API_KEY": str,
+        "LOCAL_LLM_BASE_URL": str,
+        "LOCAL_LLM_API_KEY": str,
+        "LOCAL_LLM_MAX_CONCURRENCY": int,
+        "APP_ENV": str,
+        "LOG_LEVEL": str,
+        "LOG_FILE": str,
+        "LOG_MAX_BYTES": int,
+        "LOG_BACKUP_COUNT": int,
+        "MAX_CONTINUATIONS": int,
+        "PROFILES_PATH": str,
+        "RESPONSE_CACHE_PATH": str,
+        "TRANSLATION_CACHE_TTL": int,
+        "LATENCY_DB_PATH": str,
+        "SCHEDULER_MAX_CONCURRENCY": int,
+        "SCHEDULER_TOKENS_PER_MINUTE": int,
+        "SCHEDULER_INTERACTIVE_SLOTS": int,
+        "SCHEDULER_INTERACTIVE_TOKEN_SHARE": float,
+        "ADMISSION_ENABLED": lambda value: value.lower() == "true",
+        "ADMISSION_MAX_WAIT": float,
+        "ADMISSION_DEGRADE_WAIT": float,
+        "ADMISSION_MAX_QUEUE": int,
+        "DEGRADED_MAX_TOKENS": int,
+        "STALE_CACHE_SECONDS": int,
+        "SESSION_IDLE_SECONDS": int,
+        "SESSION_SPILL_DIR": str,
+        "PROFILING_ENABLED": lambda value: value.lower() == "true",
+        "PROFILING_INTERVAL_MS": float,
+        "PROFILING_DIR": str,
+        "JOB_DB_PATH": str,
+        "JOB_LEASE_SECONDS": int,
+        "JOB_MAX_ATTEMPTS": int,
+        "JOB_POLL_INTERVAL": float,
+        "JOB_MAX_WAIT": float,
+        "LEDGER_ENABLED": lambda value: value.lower() == "true",
+        "LEDGER_DB_PATH": str,
+    }
+    _loaded: bool = False
+
+    @classmethod
+    def load(cls) -> None:
+        """Load the .env file (once) and refresh environment-backed settings"""
+        if cls._loaded:
+            return
+
+        from dotenv import load_dotenv
+
+        load_dotenv()
+        for name, cast in cls._ENV_SETTINGS.items():
+            value = os.getenv(name)
+            if value is not None:
+                setattr(cls, name, cast(value))
+        cls._loaded = True
+
     @classmethod
     def validate(cls) -> bool:
         """Validate required configuration"""
+        cls.load()
         if not cls.GROQ_API_KEY:
             raise ValueError("GROQ_API_KEY not found! Please add it to your .env file")
         return True
@@ -49,19 +157,8 @@ class Config:
 
     @classmethod
     def setup_logging(cls):
-        """Setup logging configuration"""
-        log_format = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
-        logging.basicConfig(
-            level=getattr(logging, cls.LOG_LEVEL),
-            format=log_format,
-            handlers=[logging.FileHandler("logs/app.log"), logging.StreamHandler()],
-        )
-
-
-# Validate configuration on import
-try:
-    Config.validate()
-except ValueError as e:
-    print(f"Configuration Error: {e}")
-    print("Please check your .env file and ensure GROQ_API_KEY is set")
-    exit(1)
+        """Setup queue-based logging: JSON lines to a rotating file, text to console"""
+        cls.load()
+        from src.utils.log_pipeline import configure_logging
+
+        configure_logging(cls.LOG_LEVEL, cls.LOG_FILE, cls.LOG_MAX_BYTES, cls.LOG_BACKUP_COUNT)
@@ -0,0 +1,79 @@
+"""
+Admission control and load shedding
+Each request is checked against the scheduler's current load before it
+queues for an API slot. Under moderate pressure it is admitted in a degraded
+mode (shorter output, no long-form pieces, stale cache allowed); under heavy
+pressure it is turned away with a retry-after hint instead of waiting
+unboundedly. Batch work is deferred before interactive work is degraded.
+"""
+
+import math
+from dataclasses import dataclass
+from typing import Optional
+
+from config import Config
+from src.generators.scheduler import FairScheduler
+
+# Content types refused while the service is degraded
+LONG_FORM_TYPES = frozenset({"blog_post", "landing_page"})
+
+
+@dataclass(frozen=True)
+class AdmissionDecision:
+    """Outcome of an admission check"""
+
+    admitted: bool
+    degraded: bool = False
+    retry_after: int = 0
+    reason: str = ""
+
+
+ADMIT = AdmissionDecision(admitted=True)
+
+
+class AdmissionController:
+    """Admit, degrade or shed requests based on queue depth and expected wait"""
+
+    def __init__(
+        self,
+        scheduler: FairScheduler,
+        max_wait: Optional[float] = None,
+        degrade_wait: Optional[float] = None,
+        max_queue: Optional[int] = None,
+    ):
+        """
+        Args:
+            scheduler: Scheduler whose load is inspected
+            max_wait: Expected or oldest queue wait (s) above which requests are shed
+            degrade_wait: Expected wait (s) above which requests are degraded
+            max_queue: Waiting requests at or above which requests are shed
+        """
+        self.scheduler = scheduler
+        self.max_wait = Config.ADMISSION_MAX_WAIT if max_wait is None else max_wait
+        self.degrade_wait = Config.ADMISSION_DEGRADE_WAIT if degrade_wait is None else degrade_wait
+        self.max_queue = Config.ADMISSION_MAX_QUEUE if max_queue is None else max_queue
+
+    def check(self, lane: str = "interactive") -> AdmissionDecision:
+        """Decide whether a new request in ``lane`` may queue for a slot"""
+        load = self.scheduler.load(lane)
+        expected_wait = max(load["expected_wait"], load["oldest_wait"])
+        retry_after = max(1, math.ceil(expected_wait))
+
+        if load["waiting"] >= self.max_queue:
+            return AdmissionDecision(
+                False, retry_after=retry_after, reason=f"{load['waiting']} requests queued"
+            )
+        if expected_wait > self.max_wait:
+            return AdmissionDecision(
+                False, retry_after=retry_after, reason=f"expected wait {expected_wait:.0f}s"
+            )
+        if expected_wait > self.degrade_wait:
+            # Batch work can always come back later; shed it rather than degrade it
+            if lane == "batch":
+                return AdmissionDecision(
+                    False, retry_after=retry_after, reason="deferring batch work under load"
+                )
+            return AdmissionDecision(
+                True, True, retry_after, reason=f"expected wait {expected_wait:.0f}s"
+            )
+        return ADMIT
@@ -0,0 +1,428 @@
+"""
+LLM backends
+Every backend speaks the chat-completions protocol through one interface
+(sync and async, streaming and non-streaming, with usage reporting), so a
+profile can route a content type to Groq or to any OpenAI-compatible
+server, e.g. a local CPU inference server for bulk work.
+"""
+
+import json
+import logging
+import threading
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import AsyncIterator, Callable, Dict, Iterator, List, Optional, Tuple
+
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+# (text delta, total tokens if reported, finish reason if reported)
+Chunk = Tuple[str, Optional[int], Optional[str]]
+
+SYSTEM_PROMPT = "You are an expert content writer for Digital Marketing."
+
+
+@dataclass(slots=True)
+class CompletionRequest:
+    """One chat completion call, independent of the backend serving it"""
+
+    model: str
+    messages: List[Dict[str, str]]
+    temperature: float
+    max_tokens: int
+    stop: Optional[List[str]] = None
+    timeout: float = 60.0
+    response_format: Optional[Dict[str, any]] = None
+
+    @classmethod
+    def for_prompt(cls, prompt: str, **kwargs) -> "CompletionRequest":
+        """Request with the standard system prompt and one user message"""
+        messages = [
+            {"role": "system", "content": SYSTEM_PROMPT},
+            {"role": "user", "content": prompt},
+        ]
+        return cls(messages=messages, **kwargs)
+
+    def payload(self) -> Dict[str, any]:
+        """Request body in the chat-completions wire format"""
+        body = {
+            "model": self.model,
+            "messages": self.messages,
+            "temperature": self.temperature,
+            "max_tokens": self.max_tokens,
+            "top_p": 1,
+            "stop": self.stop or None,
+        }
+        if self.response_format:
+            body["response_format"] = self.response_format
+        return body
+
+
+@dataclass(slots=True)
+class Completion:
+    """A finished completion; total_tokens is 0 when the server did not report usage"""
+
+    content: str
+    total_tokens: int = 0
+    finish_reason: Optional[str] = None
+
+
+class CompletionStream:
+    """
+    Iterator of text deltas from a streamed completion
+
+    ``total_tokens`` and ``finish_reason`` are filled in as the server
+    reports them. Closing (explicitly or by exhausting the iterator)
+    releases the underlying connection.
+    """
+
+    def __init__(self, chunks: Iterator[Chunk], close: Optional[Callable[[], None]] = None):
+        self._chunks = chunks
+        self._close = close
+        self.total_tokens = 0
+        self.finish_reason: Optional[str] = None
+
+    def __iter__(self) -> Iterator[str]:
+        try:
+            for delta, tokens, finish_reason in self._chunks:
+                if tokens:
+                    self.total_tokens = tokens
+                if finish_reason:
+                    self.finish_reason = finish_reason
+                if delta:
+                    yield delta
+        finally:
+            self.close()
+
+    def close(self):
+        close, self._close = self._close, None
+        if close is not None:
+            close()
+
+
+class AsyncCompletionStream:
+    """Async counterpart of CompletionStream"""
+
+    def __init__(self, chunks: AsyncIterator[Chunk], close: Optional[Callable] = None):
+        self._chunks = chunks
+        self._close = close
+        self.total_tokens = 0
+        self.finish_reason: Optional[str] = None
+
+    async def __aiter__(self) -> AsyncIterator[str]:
+        try:
+            async for delta, tokens, finish_reason in self._chunks:
+                if tokens:
+                    self.total_tokens = tokens
+                if finish_reason:
+                    self.finish_reason = finish_reason
+                if delta:
+                    yield delta
+        finally:
+            await self.aclose()
+
+    async def aclose(self):
+        close, self._close = self._close, None
+        if close is not None:
+            await close()
+
+
+class LLMBackend(ABC):
+    """Chat-completion provider used by ContentGenerator"""
+
+    name: str = "backend"
+
+    # Whether calls draw on the metered API budget enforced by the scheduler
+    uses_api_budget: bool = True
+
+    def connect(self):
+        """Create clients now so configuration errors surface before any retry loop"""
+
+    @abstractmethod
+    def complete(self, request: CompletionRequest) -> Completion:
+        """Run a completion to the end"""
+
+    @abstractmethod
+    def stream(self, request: CompletionRequest) -> CompletionStream:
+        """Start a streamed completion"""
+
+    @abstractmethod
+    async def acomplete(self, request: CompletionRequest) -> Completion:
+        """Async complete()"""
+
+    @abstractmethod
+    async def astream(self, request: CompletionRequest) -> AsyncCompletionStream:
+        """Async stream()"""
+
+
+def _sdk_chunk(chunk) -> Chunk:
+    """Fields of an SDK streaming chunk (usage may sit on chunk or chunk.x_groq)"""
+    usage = getattr(chunk, "usage", None)
+    x_groq = getattr(chunk, "x_groq", None)
+    if usage is None and x_groq is not None:
+        usage = getattr(x_groq, "usage", None)
+    tokens = usage.total_tokens if usage is not None else None
+
+    if not chunk.choices:
+        return "", tokens, None
+    choice = chunk.choices[0]
+    return choice.delta.content or "", tokens, getattr(choice, "finish_reason", None)
+
+
+class ChatCompletionsBackend(LLMBackend):
+    """Backend over an SDK client exposing ``chat.completions.create`` (Groq, OpenAI)"""
+
+    name = "chat-completions"
+
+    def __init__(self, client=None, async_client=None):
+        self._client = client
+        self._async_client = async_client
+
+    def _make_client(self):
+        raise ValueError(f"{type(self).__name__} needs a client")
+
+    def _make_async_client(self):
+        raise ValueError(f"{type(self).__name__} needs an async client")
+
+    @property
+    def client(self):
+        if self._client is None:
+            self._client = self._make_client()
+        return self._client
+
+    @property
+    def async_client(self):
+        if self._async_client is None:
+            self._async_client = self._make_async_client()
+        return self._async_client
+
+    def connect(self):
+        self.client
+
+    @staticmethod
+    def _completion(response) -> Completion:
+        choice = response.choices[0]
+        usage = getattr(response, "usage", None)
+        return Completion(
+            choice.message.content,
+            usage.total_tokens if usage is not None else 0,
+            getattr(choice, "finish_reason", None),
+        )
+
+    def complete(self, request: CompletionRequest) -> Completion:
+        response = self.client.chat.completions.create(
+            **request.payload(), stream=False, timeout=request.timeout
+        )
+        return self._completion(response)
+
+    def stream(self, request: CompletionRequest) -> CompletionStream:
+        response = self.client.chat.completions.create(
+            **request.payload(), stream=True, timeout=request.timeout
+        )
+        return CompletionStream(
+            (_sdk_chunk(chunk) for chunk in response), getattr(response, "close", None)
+        )
+
+    async def acomplete(self, request: CompletionRequest) -> Completion:
+        response = await self.async_client.chat.completions.create(
+            **request.payload(), stream=False, timeout=request.timeout
+        )
+        return self._completion(response)
+
+    async def astream(self, request: CompletionRequest) -> AsyncCompletionStream:
+        response = await self.async_client.chat.completions.create(
+            **request.payload(), stream=True, timeout=request.timeout
+        )
+
+        async def chunks():
+            async for chunk in response:
+                yield _sdk_chunk(chunk)
+
+        return AsyncCompletionStream(chunks(), getattr(response, "close", None))
+
+
+class GroqBackend(ChatCompletionsBackend):
+    """Groq API via the groq SDK, imported lazily to keep app startup cheap"""
+
+    name = "groq"
+
+    def _make_client(self):
+        try:
+            Config.validate()
+            from groq import Groq
+
+            return Groq(api_key=Config.GROQ_API_KEY)
+        except Exception as e:
+            logger.error("Failed to initialize Groq client: %s", e)
+            raise
+
+    def _make_async_client(self):
+        Config.validate()
+        from groq import AsyncGroq
+
+        return AsyncGroq(api_key=Config.GROQ_API_KEY)
+
+
+def _sse_chunk(line: str) -> Optional[Chunk]:
+    """Parse one server-sent-events line; None for keep-alives and [DONE]"""
+    if not line.startswith("data:"):
+        return None
+    data = line[5:].strip()
+    if not data or data == "[DONE]":
+        return None
+    chunk = json.loads(data)
+    usage = chunk.get("usage") or {}
+    choices = chunk.get("choices") or [{}]
+    return (
+        (choices[0].get("delta") or {}).get("content") or "",
+        usage.get("total_tokens"),
+        choices[0].get("finish_reason"),
+    )
+
+
+class OpenAICompatibleBackend(LLMBackend):
+    """
+    Any server implementing POST {base_url}/chat/completions
+
+    Talks HTTP directly (httpx), so local servers such as llama.cpp, vLLM or
+    Ollama need no extra SDK. Calls bypass the API scheduler; instead at most
+    ``max_concurrency`` run at once against the server.
+    """
+
+    uses_api_budget = False
+
+    def __init__(
+        self,
+        base_url: str,
+        api_key: Optional[str] = None,
+        name: str = "local",
+        max_concurrency: int = 2,
+        http_client=None,
+        async_http_client=None,
+    ):
+        self.name = name
+        self.url = base_url.rstrip("/") + "/chat/completions"
+        self.headers = {"Authorization": f"Bearer {api_key}"} if api_key else {}
+        self.max_concurrency = max_concurrency
+        self._slots = threading.BoundedSemaphore(max_concurrency)
+        self._async_slots = None
+        self._http = http_client
+        self._async_http = async_http_client
+
+    @property
+    def http(self):
+        if self._http is None:
+            import httpx
+
+            self._http = httpx.Client(headers=self.headers)
+        return self._http
+
+    @property
+    def async_http(self):
+        if self._async_http is None:
+            import httpx
+
+            self._async_http = httpx.AsyncClient(headers=self.headers)
+        return self._async_http
+
+    @staticmethod
+    def _completion(body: Dict[str, any]) -> Completion:
+        choice = body["choices"][0]
+        return Completion(
+            choice["message"]["content"],
+            (body.get("usage") or {}).get("total_tokens", 0),
+            choice.get("finish_reason"),
+        )
+
+    @staticmethod
+    def _stream_payload(request: CompletionRequest) -> Dict[str, any]:
+        return {**request.payload(), "stream": True, "stream_options": {"include_usage": True}}
+
+    def complete(self, request: CompletionRequest) -> Completion:
+        with self._slots:
+            response = self.http.post(self.url, json=request.payload(), timeout=request.timeout)
+            response.raise_for_status()
+            return self._completion(response.json())
+
+    def stream(self, request: CompletionRequest) -> CompletionStream:
+        self._slots.acquire()
+        try:
+            response = self.http.send(
+                self.http.build_request(
+                    "POST", self.url, json=self._stream_payload(request), timeout=request.timeout
+                ),
+                stream=True,
+            )
+            if response.is_error:
+                response.read()
+                response.close()
+                response.raise_for_status()
+        except BaseException:
+            self._slots.release()
+            raise
+
+        def close():
+            response.close()
+            self._slots.release()
+
+        chunks = (chunk for chunk in map(_sse_chunk, response.iter_lines()) if chunk)
+        return CompletionStream(chunks, close)
+
+    def _async_semaphore(self):
+        import asyncio
+
+        if self._async_slots is None:
+            self._async_slots = asyncio.Semaphore(self.max_concurrency)
+        return self._async_slots
+
+    async def acomplete(self, request: CompletionRequest) -> Completion:
+        async with self._async_semaphore():
+            response = await self.async_http.post(
+                self.url, json=request.payload(), timeout=request.timeout
+            )
+            response.raise_for_status()
+            return self._completion(response.json())
+
+    async def astream(self, request: CompletionRequest) -> AsyncCompletionStream:
+        slots = self._async_semaphore()
+        await slots.acquire()
+        try:
+            response = await self.async_http.send(
+                self.async_http.build_request(
+                    "POST", self.url, json=self._stream_payload(request), timeout=request.timeout
+                ),
+                stream=True,
+            )
+            if response.is_error:
+                await response.aread()
+                await response.aclose()
+                response.raise_for_status()
+        except BaseException:
+            slots.release()
+            raise
+
+        async def chunks():
+            async for line in response.aiter_lines():
+                chunk = _sse_chunk(line)
+                if chunk:
+                    yield chunk
+
+        async def close():
+            await response.aclose()
+            slots.release()
+
+        return AsyncCompletionStream(chunks(), close)
+
+
+def default_backends() -> Dict[str, LLMBackend]:
+    """Groq plus, when LOCAL_LLM_BASE_URL is set, the "local" OpenAI-compatible server"""
+    Config.load()
+    backends: Dict[str, LLMBackend] = {"groq": GroqBackend()}
+    if Config.LOCAL_LLM_BASE_URL:
+        backends["local"] = OpenAICompatibleBackend(
+            Config.LOCAL_LLM_BASE_URL,
+            api_key=Config.LOCAL_LLM_API_KEY or None,
+            max_concurrency=Config.LOCAL_LLM_MAX_CONCURRENCY,
+        )
+    return backends
@@ -0,0 +1,165 @@
+"""
+Response store for generation results
+An in-process LRU sits in front of an optional SQLite file shared between
+processes (app replicas, workers, the cache warmer). Entries expire after
+the per-profile cache TTL.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional
+
+
+class ResponseCache:
+    """Thread-safe LRU cache of successful API results with per-entry expiry"""
+
+    def __init__(self, max_entries: int = 1000, path: Optional[str] = None):
+        self.max_entries = max_entries
+        self.path = path or None
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._schema_ready = False
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(prompt: str, model: str, temperature: float, max_tokens: int) -> str:
+        """Stable cache key for a request"""
+        raw = f"{model}\x00{temperature}\x00{max_tokens}\x00{prompt}"
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def _connection(self) -> Optional[sqlite3.Connection]:
+        """Per-thread connection to the shared store, created on first use"""
+        if self.path is None:
+            return None
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            if not self._schema_ready:
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS responses "
+                    "(key TEXT PRIMARY KEY, expires_at REAL NOT NULL, result TEXT NOT NULL)"
+                )
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS cache_stats "
+                    "(day INTEGER PRIMARY KEY, hits INTEGER NOT NULL, misses INTEGER NOT NULL)"
+                )
+                self._schema_ready = True
+            self._local.conn = conn
+        return conn
+
+    def _count(self, hit: bool):
+        """Track hit/miss in memory and, for a shared store, per day on disk"""
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+        conn = self._connection()
+        if conn is not None:
+            conn.execute(
+                "INSERT INTO cache_stats VALUES (?, ?, ?) ON CONFLICT (day) DO UPDATE SET "
+                "hits = hits + excluded.hits, misses = misses + excluded.misses",
+                (int(time.time() // 86400), int(hit), int(not hit)),
+            )
+
+    def _remember(self, key: str, expires_at: float, result: Dict[str, any]):
+        with self._lock:
+            self._entries[key] = (expires_at, result)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def get(self, key: str, record: bool = True, max_stale: float = 0) -> Optional[Dict[str, any]]:
+        """
+        Return a copy of a live entry, or None
+
+        Args:
+            key: Cache key from make_key
+            record: Count the lookup in hit-rate stats (off for warm-up probes)
+            max_stale: Also accept entries expired for up to this many seconds
+                (used to keep serving under overload)
+        """
+        now = time.time()
+        oldest = now - max_stale
+        with self._lock:
+            # Expired entries stay until evicted so they can still be served stale
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] < oldest:
+                entry = None
+            if entry is not None:
+                self._entries.move_to_end(key)
+
+        if entry is None:
+            conn = self._connection()
+            if conn is not None:
+                row = conn.execute(
+                    "SELECT expires_at, result FROM responses WHERE key = ? AND expires_at >= ?",
+                    (key, oldest),
+                ).fetchone()
+                if row is not None:
+                    entry = (row[0], json.loads(row[1]))
+                    self._remember(key, *entry)
+
+        if record:
+            self._count(entry is not None)
+        return None if entry is None else dict(entry[1])
+
+    def set(self, key: str, result: Dict[str, any], ttl: float):
+        """Store a result for ttl seconds"""
+        if ttl <= 0:
+            return
+        expires_at = time.time() + ttl
+        self._remember(key, expires_at, dict(result))
+
+        conn = self._connection()
+        if conn is not None:
+            conn.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?)",
+                (key, expires_at, json.dumps(result, default=str)),
+            )
+
+    def purge_expired(self) -> int:
+        """Delete expired rows from the shared store; returns rows removed"""
+        conn = self._connection()
+        if conn is None:
+            return 0
+        return conn.execute("DELETE FROM responses WHERE expires_at < ?", (time.time(),)).rowcount
+
+    def stats(self, days: int = 1) -> Dict[str, any]:
+        """
+        Hit/miss counters and size
+
+        For a shared store the counters cover every process over the last
+        ``days`` days; otherwise they cover this process only.
+        """
+        hits, misses, entries = self.hits, self.misses, len(self._entries)
+        conn = self._connection()
+        if conn is not None:
+            since = int(time.time() // 86400) - days + 1
+            hits, misses = conn.execute(
+                "SELECT COALESCE(SUM(hits), 0), COALESCE(SUM(misses), 0) "
+                "FROM cache_stats WHERE day >= ?",
+                (since,),
+            ).fetchone()
+            entries = conn.execute(
+                "SELECT COUNT(*) FROM responses WHERE expires_at >= ?", (time.time(),)
+            ).fetchone()[0]
+
+        lookups = hits + misses
+        return {
+            "entries": entries,
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": hits / lookups if lookups else 0.0,
+        }
@@ -0,0 +1,265 @@
+"""
+Campaign pipeline
+One brief is fanned out to every content type as a dependency graph:
+landing page and blog post run first and in parallel, then social posts,
+ads, email and product copy are derived from a condensed summary of them.
+Independent nodes run concurrently, so a campaign takes roughly as long as
+its longest chain.
+"""
+
+import contextvars
+import logging
+import re
+import time
+import uuid
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Tuple
+
+from src.generators.constraints import estimate_tokens
+from src.utils.request_context import request_scope
+
+logger = logging.getLogger(__name__)
+
+# Words of each upstream piece passed downstream
+SUMMARY_WORDS = 60
+
+
+@dataclass
+class CampaignBrief:
+    """Everything a campaign's content is derived from"""
+
+    product: str
+    audience: str
+    offer: str
+    tone: str = "Professional"
+    keywords: str = ""
+    features: str = ""
+    topic: str = ""
+    platforms: Tuple[str, ...] = ("LinkedIn", "Twitter/X")
+    word_count: int = 800
+
+
+@dataclass
+class CampaignNode:
+    """One generation step; ``run`` receives the summaries of its dependencies"""
+
+    name: str
+    run: Callable[[Optional[str]], Dict[str, any]]
+    depends_on: Tuple[str, ...] = ()
+
+
+@dataclass
+class CampaignResult:
+    """Per-node results plus campaign-level timing and token totals"""
+
+    results: Dict[str, Dict[str, any]] = field(default_factory=dict)
+    summaries: Dict[str, str] = field(default_factory=dict)
+    elapsed: float = 0.0
+    context_tokens: int = 0
+    context_tokens_saved: int = 0
+
+    @property
+    def success(self) -> bool:
+        return bool(self.results) and all(r["success"] for r in self.results.values())
+
+    @property
+    def tokens(self) -> int:
+        return sum(r.get("tokens", 0) for r in self.results.values() if r["success"])
+
+    @property
+    def sequential_time(self) -> float:
+        """Time the same nodes would have taken one after another"""
+        return sum(r.get("time", 0.0) for r in self.results.values() if r["success"])
+
+    def as_result(self) -> Dict[str, any]:
+        """Flatten into a single generation result with one section per node"""
+        sections = []
+        for name, result in self.results.items():
+            title = name.replace("_", " ").title()
+            body = result["content"] if result["success"] else f"(failed: {result.get('error')})"
+            sections.append(f"## {title}\n\n{body}")
+        failed = [name for name, r in self.results.items() if not r["success"]]
+        return {
+            "content": "\n\n---\n\n".join(sections),
+            "tokens": self.tokens,
+            "time": self.elapsed,
+            "sequential_time": self.sequential_time,
+            "success": bool(self.results) and len(failed) < len(self.results),
+            "type": "campaign",
+            "failed": failed,
+            "context_tokens_saved": self.context_tokens_saved,
+        }
+
+
+def condense(content: str, max_words: int = SUMMARY_WORDS) -> str:
+    """
+    Extractive summary: the first sentence of each paragraph, up to max_words
+
+    Headings and separators are skipped so the summary carries claims, not
+    formatting. No API call is made.
+    """
+    words: List[str] = []
+    for paragraph in re.split(r"\n\s*\n", content):
+        text = " ".join(
+            line.strip(" #*-•>")
+            for line in paragraph.splitlines()
+            if line.strip() and not line.lstrip().startswith("#")
+        ).strip()
+        if len(text.split()) < 4:
+            continue
+        sentence = re.split(r"(?<=[.!?])\s", text, maxsplit=1)[0]
+        words.extend(sentence.split())
+        if len(words) >= max_words:
+            break
+    return " ".join(words[:max_words])
+
+
+def build_campaign(generator, brief: CampaignBrief) -> Dict[str, CampaignNode]:
+    """Default campaign graph for a brief"""
+    topic = brief.topic or f"{brief.product}: {brief.offer}"
+    sources = ("landing_page", "blog_post")
+
+    nodes = [
+        CampaignNode(
+            "landing_page",
+            lambda context: generator.generate_landing_page(
+                brief.offer, brief.audience, brief.tone
+            ),
+        ),
+        CampaignNode(
+            "blog_post",
+            lambda context: generator.generate_blog_post(
+                topic, brief.keywords or brief.product, brief.tone, brief.word_count
+            ),
+        ),
+        CampaignNode(
+            "ad_copy",
+            lambda context: generator.generate_ad_copy(
+                brief.product, brief.audience, brief.tone, context=context
+            ),
+            ("landing_page",),
+        ),
+        CampaignNode(
+            "email",
+            lambda context: generator.generate_email(
+                f"Promote {brief.offer}", brief.audience, brief.tone, context=context
+            ),
+            sources,
+        ),
+        CampaignNode(
+            "product_description",
+            lambda context: generator.generate_product_description(
+                brief.product, brief.features or brief.offer, brief.tone, context=context
+            ),
+            ("landing_page",),
+        ),
+    ]
+    for platform in brief.platforms:
+        slug = re.sub(r"\W+", "_", platform.lower()).strip("_")
+        nodes.append(
+            CampaignNode(
+                f"social_{slug}",
+                lambda context, platform=platform: generator.generate_social_post(
+                    topic, platform, brief.tone, context=context
+                ),
+                sources,
+            )
+        )
+    return {node.name: node for node in nodes}
+
+
+def _check_graph(nodes: Dict[str, CampaignNode]):
+    """Reject unknown dependencies and cycles before anything is generated"""
+    for node in nodes.values():
+        unknown = set(node.depends_on) - set(nodes)
+        if unknown:
+            raise ValueError(f"Campaign node '{node.name}' depends on unknown {sorted(unknown)}")
+
+    resolved: set = set()
+    pending = dict(nodes)
+    while pending:
+        ready = [name for name, node in pending.items() if set(node.depends_on) <= resolved]
+        if not ready:
+            raise ValueError(f"Campaign graph has a cycle among {sorted(pending)}")
+        resolved.update(ready)
+        for name in ready:
+            del pending[name]
+
+
+def run_campaign(
+    nodes: Dict[str, CampaignNode], max_workers: Optional[int] = None
+) -> CampaignResult:
+    """
+    Execute a campaign graph, starting each node as soon as its inputs exist
+
+    Downstream nodes get the condensed summaries of successful dependencies
+    (a failed dependency is simply left out). The API scheduler still bounds
+    how many calls are in flight.
+    """
+    _check_graph(nodes)
+    outcome = CampaignResult()
+    start = time.time()
+
+    with request_scope(campaign_id=uuid.uuid4().hex[:12]):
+        logger.info("Starting campaign with %d nodes", len(nodes))
+
+        with ThreadPoolExecutor(max_workers=max_workers or len(nodes) or 1) as pool:
+            running = {}
+            done: set = set()
+
+            def submit_ready():
+                for name, node in nodes.items():
+                    if name in done or name in running.values():
+                        continue
+                    if not set(node.depends_on) <= done:
+                        continue
+                    summaries = [
+                        f"{dep.replace('_', ' ').title()}: {outcome.summaries[dep]}"
+                        for dep in node.depends_on
+                        if dep in outcome.summaries
+                    ]
+                    context = "\n".join(summaries) or None
+                    if context:
+                        full = sum(
+                            estimate_tokens(outcome.results[dep]["content"])
+                            for dep in node.depends_on
+                            if dep in outcome.summaries
+                        )
+                        outcome.context_tokens += estimate_tokens(context)
+                        outcome.context_tokens_saved += max(0, full - estimate_tokens(context))
+                    # Each task runs in a copy of this context so logs carry the campaign id
+                    ctx = contextvars.copy_context()
+                    running[pool.submit(ctx.run, node.run, context)] = name
+
+            submit_ready()
+            while running:
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    name = running.pop(future)
+                    try:
+                        result = future.result()
+                    except Exception as e:
+                        logger.error("Campaign node '%s' raised: %s", name, e)
+                        result = {"content": None, "error": str(e), "success": False}
+                    outcome.results[name] = result
+                    if result["success"]:
+                        outcome.summaries[name] = condense(result["content"])
+                    done.add(name)
+                submit_ready()
+
+    outcome.results = {name: outcome.results[name] for name in nodes}
+    outcome.elapsed = time.time() - start
+    logger.info(
+        "Campaign finished in %.2fs (%.2fs sequential), %d tokens",
+        outcome.elapsed,
+        outcome.sequential_time,
+        outcome.tokens,
+        extra={"context_tokens_saved": outcome.context_tokens_saved},
+    )
+    return outcome
+
+
+def generate_campaign(generator, brief: CampaignBrief) -> CampaignResult:
+    """Generate every content type for one brief"""
+    return run_campaign(build_campaign(generator, brief))
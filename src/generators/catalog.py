@@ -0,0 +1,345 @@
+"""
+Bulk product-description generation for e-commerce catalogs
+Reads a CSV or Parquet catalog in chunks, generates one description per
+distinct (product, feature set, tone) with bounded concurrency, and writes the
+catalog back out with description, status and error columns:
+
+    python -m src.generators.catalog --input catalog.csv --out described.parquet --workers 8
+
+Feature lists are normalized (case, whitespace, bullet markers, order) before
+deduplication, so variant SKUs listing the same features share one call.
+Descriptions of the most recent keys (REUSE_ENTRIES by default) are kept
+across chunks, so duplicates in later chunks are reused without another call
+while memory stays bounded on catalogs of any size.
+"""
+
+import argparse
+import contextvars
+import json
+import logging
+import os
+import re
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from typing import Dict, Iterator, Optional, Tuple
+
+from config import Config
+from src.utils.request_context import request_scope
+
+logger = logging.getLogger(__name__)
+
+# Separators between features in a catalog cell
+FEATURE_SEPARATORS = re.compile(r"[,;|\n]+")
+
+# Row statuses written to the status column
+GENERATED = "generated"
+REUSED = "reused"
+CACHED = "cached"
+FAILED = "failed"
+SKIPPED = "skipped"
+
+# Generated descriptions remembered for reuse by later chunks
+REUSE_ENTRIES = 10000
+
+
+@dataclass
+class CatalogReport:
+    """Outcome of one catalog run"""
+
+    rows: int = 0
+    unique: int = 0
+    generated: int = 0
+    cached: int = 0
+    reused: int = 0
+    failed: int = 0
+    skipped: int = 0
+    tokens: int = 0
+    elapsed: float = 0.0
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows / self.elapsed if self.elapsed else 0.0
+
+
+def normalize_text(value) -> str:
+    """Collapse whitespace; missing cells become an empty string"""
+    if value is None or value != value:  # None or NaN
+        return ""
+    return " ".join(str(value).split())
+
+
+def cell_text(value) -> str:
+    """Cell value with surrounding whitespace stripped; missing cells become an empty string"""
+    if value is None or value != value:  # None or NaN
+        return ""
+    return str(value).strip()
+
+
+def normalize_features(value) -> str:
+    """Canonical form of a feature list: lower-cased, de-bulleted, unique and sorted"""
+    if value is None or value != value:  # None or NaN
+        return ""
+    items = FEATURE_SEPARATORS.split(str(value))
+    items = (normalize_text(item).strip(" -*•").lower() for item in items)
+    return "; ".join(sorted({item for item in items if item}))
+
+
+def read_catalog(path: str, chunk_size: int = 1000) -> Iterator:
+    """Yield a CSV or Parquet catalog as DataFrames of up to chunk_size rows"""
+    import pandas as pd
+
+    if path.endswith(".parquet"):
+        import pyarrow.parquet as pq
+
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunk_size):
+            yield batch.to_pandas()
+    else:
+        yield from pd.read_csv(path, chunksize=chunk_size, dtype=str, keep_default_na=False)
+
+
+class CatalogWriter:
+    """Appends described chunks to a CSV or Parquet file"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._parquet = None
+        self._rows = 0
+
+    def write(self, frame):
+        if self.path.endswith(".parquet"):
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+
+            if self._parquet is None:
+                table = pa.Table.from_pandas(frame, preserve_index=False)
+                # An all-empty column (e.g. no failures yet) must still accept text later
+                schema = pa.schema(
+                    [
+                        pa.field(field.name, pa.string()) if pa.types.is_null(field.type) else field
+                        for field in table.schema
+                    ]
+                )
+                table = table.cast(schema)
+                self._parquet = pq.ParquetWriter(self.path, schema)
+            else:
+                # Later chunks are cast to the first chunk's schema
+                table = pa.Table.from_pandas(
+                    frame, schema=self._parquet.schema, preserve_index=False
+                )
+            self._parquet.write_table(table)
+        else:
+            mode = "a" if self._rows else "w"
+            frame.to_csv(self.path, mode=mode, header=not self._rows, index=False)
+        self._rows += len(frame)
+
+    def close(self):
+        if self._parquet is not None:
+            self._parquet.close()
+
+
+class CatalogPipeline:
+    """Generates product descriptions for whole catalogs in the batch lane"""
+
+    def __init__(
+        self,
+        generator=None,
+        tone: str = "Professional",
+        max_workers: Optional[int] = None,
+        name_column: str = "product_name",
+        features_column: str = "features",
+        tone_column: str = "tone",
+        output_column: str = "description",
+        client: str = "catalog",
+        busy_retries: int = 3,
+        reuse_entries: int = REUSE_ENTRIES,
+    ):
+        """
+        Args:
+            generator: ContentGenerator (created if None)
+            tone: Tone for rows without a tone column value
+            max_workers: Concurrent generations (default: the scheduler's concurrency)
+            client: Scheduler/ledger client the catalog is billed to
+            busy_retries: Times a call shed by admission control is retried
+            reuse_entries: Most recent descriptions kept for reuse by later chunks
+        """
+        if generator is None:
+            from src.generators.content_generator import ContentGenerator
+
+            generator = ContentGenerator()
+        self.generator = generator
+        self.tone = tone
+        self.max_workers = max_workers or generator.scheduler.max_concurrency
+        self.name_column = name_column
+        self.features_column = features_column
+        self.tone_column = tone_column
+        self.output_column = output_column
+        self.client = client
+        self.busy_retries = busy_retries
+        self.reuse_entries = reuse_entries
+        # Successful description per dedup key, least recently used first
+        self._descriptions: "OrderedDict[Tuple[str, str, str], str]" = OrderedDict()
+
+    def _describe(self, name: str, features: str, tone: str) -> Dict[str, any]:
+        """One generation, waiting out load shedding a few times"""
+        for _ in range(self.busy_retries + 1):
+            result = self.generator.generate_product_description(name, features, tone)
+            if not result.get("busy"):
+                break
+            time.sleep(result["retry_after"])
+        return result
+
+    def _remember(self, key: Tuple[str, str, str], description: str):
+        """Keep a description for later chunks, dropping the least recently used"""
+        if self.reuse_entries <= 0:
+            return
+        self._descriptions[key] = description
+        self._descriptions.move_to_end(key)
+        while len(self._descriptions) > self.reuse_entries:
+            self._descriptions.popitem(last=False)
+
+    def describe_frame(self, frame, report: Optional[CatalogReport] = None):
+        """
+        Return a copy of frame with description, status and error columns
+
+        Each distinct key not described recently in the run is generated
+        once; every other row sharing it reuses that outcome. Failed keys are
+        tried again when they recur in a later frame.
+        """
+        report = report or CatalogReport()
+        names = [normalize_text(value) for value in frame[self.name_column].tolist()]
+        features = frame[self.features_column].tolist()
+        if self.tone_column in frame:
+            tones = [normalize_text(value) or self.tone for value in frame[self.tone_column]]
+        else:
+            tones = [self.tone] * len(frame)
+
+        keys = [
+            (name.lower(), normalize_features(feature), tone) if name else None
+            for name, feature, tone in zip(names, features, tones)
+        ]
+
+        # Outcome per dedup key in this frame: (description, status, error)
+        outcomes: Dict[Tuple[str, str, str], Tuple[Optional[str], str, str]] = {}
+        # First row of each new key carries the prompt inputs
+        pending = {}
+        for index, key in enumerate(keys):
+            if key is None or key in outcomes or key in pending:
+                continue
+            if key in self._descriptions:
+                self._descriptions.move_to_end(key)
+                outcomes[key] = (self._descriptions[key], REUSED, "")
+            else:
+                pending[key] = (names[index], cell_text(features[index]), tones[index])
+        report.unique += len(pending)
+
+        first_rows = set()
+        if pending:
+            with request_scope(lane="batch", client=self.client):
+                with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+                    futures = {
+                        key: pool.submit(contextvars.copy_context().run, self._describe, *args)
+                        for key, args in pending.items()
+                    }
+                    for key, future in futures.items():
+                        try:
+                            result = future.result()
+                        except Exception as e:
+                            result = {"content": None, "error": str(e), "success": False}
+                        if result["success"]:
+                            status = CACHED if result.get("cached") else GENERATED
+                            report.tokens += result.get("tokens", 0)
+                            outcomes[key] = (result["content"], status, "")
+                            self._remember(key, result["content"])
+                        else:
+                            outcomes[key] = (None, FAILED, result.get("error", ""))
+                        first_rows.add(key)
+
+        descriptions, statuses, errors = [], [], []
+        for key in keys:
+            if key is None:
+                outcome = (None, SKIPPED, f"missing {self.name_column}")
+            else:
+                outcome = outcomes[key]
+                if key in first_rows:
+                    first_rows.discard(key)
+                elif outcome[1] != FAILED:
+                    outcome = (outcome[0], REUSED, "")
+            descriptions.append(outcome[0])
+            statuses.append(outcome[1])
+            errors.append(outcome[2])
+            # Statuses double as CatalogReport counter names
+            setattr(report, outcome[1], getattr(report, outcome[1]) + 1)
+
+        report.rows += len(frame)
+        described = frame.copy()
+        described[self.output_column] = descriptions
+        described["status"] = statuses
+        described["error"] = errors
+        return described
+
+    def run(self, input_path: str, output_path: str, chunk_size: int = 1000) -> CatalogReport:
+        """Describe a catalog file chunk by chunk, writing each chunk as it completes"""
+        report = CatalogReport()
+        start = time.time()
+        writer = CatalogWriter(output_path)
+        try:
+            for chunk in read_catalog(input_path, chunk_size):
+                writer.write(self.describe_frame(chunk, report))
+                logger.info(
+                    "Catalog progress: %d rows, %d generated, %d failed",
+                    report.rows,
+                    report.generated,
+                    report.failed,
+                )
+        finally:
+            writer.close()
+        report.elapsed = time.time() - start
+        logger.info(
+            "Described catalog %s: %d rows in %.1fs (%.1f rows/s)",
+            os.path.basename(input_path),
+            report.rows,
+            report.elapsed,
+            report.rows_per_second,
+            extra=asdict(report),
+        )
+        return report
+
+
+def main():
+    """Command-line entry point for catalog runs"""
+    parser = argparse.ArgumentParser(description="Generate product descriptions for a catalog")
+    parser.add_argument("--input", required=True, help="Catalog CSV or Parquet file")
+    parser.add_argument("--out", required=True, help="Output CSV or Parquet file")
+    parser.add_argument("--tone", default="Professional", help="Tone for rows without one")
+    parser.add_argument("--workers", type=int, default=None, help="Concurrent generations")
+    parser.add_argument("--chunk-size", type=int, default=1000, help="Rows read per chunk")
+    parser.add_argument("--name-column", default="product_name")
+    parser.add_argument("--features-column", default="features")
+    parser.add_argument("--tone-column", default="tone")
+    parser.add_argument("--client", default="catalog", help="Client the usage is billed to")
+    parser.add_argument(
+        "--reuse-entries",
+        type=int,
+        default=REUSE_ENTRIES,
+        help="Descriptions kept for reuse by later chunks",
+    )
+    args = parser.parse_args()
+
+    Config.setup_logging()
+    pipeline = CatalogPipeline(
+        tone=args.tone,
+        max_workers=args.workers,
+        name_column=args.name_column,
+        features_column=args.features_column,
+        tone_column=args.tone_column,
+        client=args.client,
+        reuse_entries=args.reuse_entries,
+    )
+    report = pipeline.run(args.input, args.out, args.chunk_size)
+    print(json.dumps({**asdict(report), "rows_per_second": report.rows_per_second}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""
+Output constraints for early termination of streamed generations
+Once a word/character target or the expected section structure is met,
+the stream is closed instead of decoding tokens that would be discarded.
+"""
+
+import re
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
+
+# Rough characters-per-token ratio for English text
+CHARS_PER_TOKEN = 4
+
+# Slack over the requested word count before a blog post is cut off
+WORD_COUNT_SLACK = 1.2
+
+# Platform character limits
+PLATFORM_CHAR_LIMITS = {"Twitter/X": 280}
+
+# Markers that, in order, mark a structurally complete output
+SECTION_MARKERS = {
+    "ad_copy": ("VARIATION A", "VARIATION B", "VARIATION C", "CTA:"),
+    "email": ("P.S.",),
+}
+
+SENTENCE_END = re.compile(r"[.!?](?=\s|$)|\n")
+
+
+def estimate_tokens(text: str) -> int:
+    """Cheap token estimate used when the API does not report usage"""
+    return max(1, len(text) // CHARS_PER_TOKEN)
+
+
+@dataclass(frozen=True)
+class OutputConstraint:
+    """Limits that make further decoding wasteful"""
+
+    max_words: Optional[int] = None
+    max_chars: Optional[int] = None
+    sections: Tuple[str, ...] = ()
+
+    def limit_reached(self, text: str) -> bool:
+        """True once the word or character target is exceeded"""
+        if self.max_chars is not None and len(text) > self.max_chars:
+            return True
+        if self.max_words is not None and len(text.split()) > self.max_words:
+            return True
+        return False
+
+    def _sections_end(self, text: str) -> Optional[int]:
+        """Index just past the finished line of the last marker, if all markers appeared"""
+        if not self.sections:
+            return None
+        position = 0
+        for marker in self.sections:
+            position = text.find(marker, position)
+            if position == -1:
+                return None
+            position += len(marker)
+
+        line_start = position
+        while line_start < len(text) and text[line_start] in " \t:":
+            line_start += 1
+        newline = text.find("\n", line_start)
+        return newline if newline > line_start else None
+
+    def sections_complete(self, text: str) -> bool:
+        """True once every marker has appeared in order and the last line is finished"""
+        return self._sections_end(text) is not None
+
+    def is_complete(self, text: str) -> bool:
+        """True when the stream can be terminated"""
+        return self.limit_reached(text) or self.sections_complete(text)
+
+    def trim(self, text: str) -> str:
+        """Cut text back to the last sentence boundary within the limits"""
+        if not self.limit_reached(text):
+            sections_end = self._sections_end(text)
+            return text if sections_end is None else text[:sections_end].rstrip()
+
+        cutoff = len(text)
+        if self.max_chars is not None:
+            cutoff = min(cutoff, self.max_chars)
+        if self.max_words is not None:
+            words = list(re.finditer(r"\S+", text))
+            if len(words) > self.max_words:
+                cutoff = min(cutoff, words[self.max_words - 1].end())
+
+        head = text[:cutoff]
+        boundaries = [m.end() for m in SENTENCE_END.finditer(head)]
+        if boundaries:
+            return head[: boundaries[-1]].rstrip()
+        return head[: head.rfind(" ")].rstrip() if " " in head else head
+
+
+def constraint_for(content_type: str, parameters: Dict[str, any]) -> Optional[OutputConstraint]:
+    """Build the constraint implied by a request, or None if unconstrained"""
+    max_words = None
+    if content_type == "blog_post" and parameters.get("word_count"):
+        max_words = int(parameters["word_count"] * WORD_COUNT_SLACK)
+
+    max_chars = None
+    if content_type == "social_post":
+        max_chars = PLATFORM_CHAR_LIMITS.get(parameters.get("platform"))
+
+    sections = SECTION_MARKERS.get(content_type, ())
+
+    if max_words is None and max_chars is None and not sections:
+        return None
+    return OutputConstraint(max_words=max_words, max_chars=max_chars, sections=sections)
@@ -1,198 +1,950 @@
 """
-Content generation engine using Groq API
+Content generation engine using pluggable LLM backends (Groq by default)
 with error handling and retries
 """
 
+import json
 import logging
+import math
 import time
-from typing import Dict
-
-from groq import Groq
+from contextlib import nullcontext
+from dataclasses import replace
+from typing import Dict, List, Optional, Tuple
 
 from config import Config
+from src.generators.admission import (
+    ADMIT,
+    LONG_FORM_TYPES,
+    AdmissionController,
+    AdmissionDecision,
+)
+from src.generators.backends import (
+    CompletionRequest,
+    CompletionStream,
+    LLMBackend,
+    default_backends,
+)
+from src.generators.cache import ResponseCache
+from src.generators.constraints import OutputConstraint, constraint_for, estimate_tokens
+from src.generators.continuation import (
+    StreamInterrupted,
+    continuation_request,
+    merge_continuation,
+)
+from src.generators.latency import LatencyPredictor, Prediction, target_tokens
+from src.generators.profiles import GenerationProfile, ProfileStore
+from src.generators.scheduler import FairScheduler, SchedulerTimeout, get_scheduler
+from src.generators.structured import (
+    STRUCTURED_TYPES,
+    StructuredOutputError,
+    json_schema,
+    parse_structured,
+    repair_json,
+)
+from src.generators.validation import (
+    merge_section,
+    sections_to_repair,
+    validate_content,
+)
 from src.prompts.templates import PromptTemplates
+from src.utils.ledger import QuotaExceededError, UsageLedger
+from src.utils.profiler import get_profiler, profiled
+from src.utils.request_context import DEFAULT_CLIENT, current_request, request_scope
 
 logger = logging.getLogger(__name__)
 
+# Low temperature keeps translations faithful to the source
+TRANSLATION_TEMPERATURE = 0.3
+
+# Prompt template per content type; arguments match the generate_* method's
+PROMPT_TEMPLATES = {
+    "blog_post": PromptTemplates.blog_post,
+    "social_post": PromptTemplates.social_media_post,
+    "ad_copy": PromptTemplates.ad_copy,
+    "email": PromptTemplates.email_template,
+    "landing_page": PromptTemplates.landing_page_copy,
+    "product_description": PromptTemplates.product_description,
+}
+
+# generate_* method -> content type, for estimating queued jobs
+METHOD_CONTENT_TYPES = {
+    "generate_blog_post": "blog_post",
+    "generate_social_post": "social_post",
+    "generate_ad_copy": "ad_copy",
+    "generate_email": "email",
+    "generate_landing_page": "landing_page",
+    "generate_product_description": "product_description",
+}
+
 
 class ContentGenerator:
     """Professional content generation with LLM"""
 
-    def __init__(self):
-        """Initialize Groq client"""
+    def __init__(
+        self,
+        profiles: Optional[ProfileStore] = None,
+        ledger: Optional[UsageLedger] = None,
+        scheduler: Optional[FairScheduler] = None,
+        backends: Optional[Dict[str, LLMBackend]] = None,
+        admission: Optional[AdmissionController] = None,
+        predictor: Optional[LatencyPredictor] = None,
+    ):
+        """Initialize generator; backend clients are created on first use"""
+        self.model = Config.GROQ_MODEL
+        self.profiles = profiles or ProfileStore()
+        self.cache = ResponseCache(path=Config.RESPONSE_CACHE_PATH)
+        if ledger is None and Config.LEDGER_ENABLED:
+            ledger = UsageLedger()
+        self.ledger = ledger
+        self.scheduler = scheduler or get_scheduler()
+        self.backends = backends or default_backends()
+        if admission is None and Config.ADMISSION_ENABLED:
+            admission = AdmissionController(self.scheduler)
+        self.admission = admission
+        self.predictor = predictor or LatencyPredictor(path=Config.LATENCY_DB_PATH)
+        logger.info("ContentGenerator initialized with model: %s", self.model)
+
+    @property
+    def client(self):
+        """Groq SDK client of the "groq" backend, constructed lazily to keep imports cheap"""
+        return self.backend("groq").client
+
+    def backend(self, name: str) -> LLMBackend:
+        """Look up a backend named by a profile"""
         try:
-            self.client = Groq(api_key=Config.GROQ_API_KEY)
-            self.model = Config.GROQ_MODEL
-            logger.info(f"ContentGenerator initialized with model: {self.model}")
-        except Exception as e:
-            logger.error(f"Failed to initialize Groq client: {e}")
-            raise
+            return self.backends[name]
+        except KeyError:
+            raise ValueError(f"Unknown LLM backend: {name}") from None
 
     def _call_api(
         self,
         prompt: str,
-        temperature: float = Config.DEFAULT_TEMPERATURE,
-        max_tokens: int = Config.DEFAULT_MAX_TOKENS,
+        temperature: Optional[float] = None,
+        max_tokens: Optional[int] = None,
+        profile: Optional[GenerationProfile] = None,
+        stop: Optional[List[str]] = None,
+        constraint: Optional[OutputConstraint] = None,
+        response_format: Optional[Dict[str, any]] = None,
     ) -> Dict[str, any]:
         """
-        Call Groq API with retry logic
+        Call the profile's LLM backend with retry logic
 
         Args:
             prompt: The prompt to send
-            temperature: Creativity level (0-1)
-            max_tokens: Maximum response length
+            temperature: Creativity level (0-1); overrides the profile
+            max_tokens: Maximum response length; overrides the profile
+            profile: Backend, model, timeout, retry and cache settings (default profile if None)
+            stop: Stop sequences passed to the API
+            constraint: Length/structure limits; when the profile streams, the
+                stream is closed as soon as they are met
+            response_format: API response format, e.g. {"type": "json_object"}
+
+        Output cut off by the token limit is continued up to the profile's
+        max_continuations times, and a retry after a dropped stream resumes
+        from the text already received rather than starting over.
 
         Returns:
-            Dict with content, tokens, and timing info
+            Dict with content, tokens, and timing info, plus the number of
+            "continuations" made and "tokens_salvaged" (partial output reused
+            instead of regenerated). Under overload the result may be a stale
+            cache entry ("stale": True) or a busy response ("busy": True,
+            "retry_after": seconds).
 
         Raises:
-            Exception: If all retries fail
+            ValueError: If the API key is missing or the backend is unknown
         """
-        for attempt in range(Config.MAX_RETRIES):
+        request = current_request()
+        lane = request.get("lane", "interactive")
+
+        # "profile_lane" lets batch work produce exactly what another lane would serve
+        profile_lane = request.get("profile_lane", lane)
+        profile = (profile or self.profiles.get("default")).for_lane(profile_lane)
+        if temperature is None:
+            temperature = profile.temperature
+        if max_tokens is None:
+            max_tokens = profile.max_tokens
+
+        cache_key = None
+        if profile.cache_ttl > 0:
+            cache_key = ResponseCache.make_key(prompt, profile.model, temperature, max_tokens)
+            cached = self.cache.get(cache_key, record=lane != "batch")
+            if cached is not None:
+                logger.info("Serving generation from response cache", extra={"cached": True})
+                cached["cached"] = True
+                return cached
+
+        backend = self.backend(profile.backend)
+        backend.connect()
+
+        decision = ADMIT
+        if self.admission is not None and backend.uses_api_budget:
+            decision = self.admission.check(lane)
+            if not decision.admitted:
+                return self._shed(decision, cache_key, lane)
+            if decision.degraded:
+                if request.get("content_type") in LONG_FORM_TYPES:
+                    return self._shed(
+                        replace(decision, reason="long-form generation paused under load"),
+                        cache_key,
+                        lane,
+                    )
+                # Shortened output must not be cached under the full-length key
+                max_tokens = min(max_tokens, Config.DEGRADED_MAX_TOKENS)
+                cache_key = None
+
+        client_id = request.get("client", DEFAULT_CLIENT)
+        prompt_tokens = estimate_tokens(prompt)
+        estimated_tokens = prompt_tokens + max_tokens
+        content_type = request.get("content_type", "default")
+        target = target_tokens(max_tokens, constraint)
+        predicted = self.predictor.predict(content_type, profile.model, target, prompt_tokens)
+
+        if self.ledger is not None:
             try:
-                start_time = time.time()
-
-                response = self.client.chat.completions.create(
-                    model=self.model,
-                    messages=[
-                        {
-                            "role": "system",
-                            "content": "You are an expert content writer for Digital Marketing.",
-                        },
-                        {"role": "user", "content": prompt},
-                    ],
-                    temperature=temperature,
-                    max_tokens=max_tokens,
-                    top_p=1,
-                    stream=False,
-                )
-
-                generation_time = time.time() - start_time
+                self.ledger.check_quota(client_id, estimated_tokens)
+            except QuotaExceededError as e:
+                logger.warning("Request blocked: %s", e, extra={"quota_exceeded": True})
+                return {
+                    "content": None,
+                    "error": str(e),
+                    "success": False,
+                    "quota_exceeded": True,
+                }
 
-                content = response.choices[0].message.content
-                tokens_used = response.usage.total_tokens
+        call_start = time.time()
+        # A JSON object cannot be resumed by a second JSON-mode call, and a
+        # degraded request must not spend its saved tokens on follow-ups
+        max_continuations = profile.max_continuations
+        if response_format or decision.degraded:
+            max_continuations = 0
+        # Output received before a stream dropped; the next attempt continues it
+        partial = ""
+        for attempt in range(profile.max_retries):
+            try:
+                with self._slot(backend, lane, client_id, estimated_tokens) as slot:
+                    start_time = time.time()
+                    (
+                        content,
+                        tokens_used,
+                        terminated_early,
+                        continuations,
+                        tokens_salvaged,
+                    ) = self._complete_resumable(
+                        backend,
+                        CompletionRequest.for_prompt(
+                            prompt,
+                            model=profile.model,
+                            temperature=temperature,
+                            max_tokens=max_tokens,
+                            stop=stop,
+                            timeout=profile.timeout,
+                            response_format=response_format,
+                        ),
+                        profile.stream,
+                        constraint,
+                        max_continuations,
+                        partial,
+                    )
+                    generation_time = time.time() - start_time
+                    slot["actual_tokens"] = tokens_used
+
+                # An early stop saves what a typical run of this content type would
+                # still have generated, not the whole unused max_tokens budget
+                completion_tokens = estimate_tokens(content)
+                tokens_saved = 0
+                if terminated_early:
+                    tokens_saved = max(0, predicted.completion_tokens - completion_tokens)
 
                 logger.info(
-                    f"Generation successful: {tokens_used} tokens in {generation_time:.2f}s"
+                    "Generation successful: %d tokens in %.2fs",
+                    tokens_used,
+                    generation_time,
+                    extra={
+                        "tokens": tokens_used,
+                        "duration": round(generation_time, 3),
+                        "queue_wait": round(slot["waited"], 3),
+                        "lane": lane,
+                        "backend": profile.backend,
+                        "model": profile.model,
+                        "attempt": attempt + 1,
+                        "terminated_early": terminated_early,
+                        "tokens_saved": tokens_saved,
+                        "continuations": continuations,
+                        "tokens_salvaged": tokens_salvaged,
+                        "predicted_duration": round(predicted.latency, 3),
+                    },
+                )
+                self._observe_latency(
+                    content_type,
+                    profile.model,
+                    prompt_tokens,
+                    target,
+                    completion_tokens,
+                    generation_time,
+                    predicted,
                 )
 
-                return {
+                result = {
                     "content": content,
                     "tokens": tokens_used,
                     "time": generation_time,
-                    "model": self.model,
+                    "queue_wait": slot["waited"],
+                    "model": profile.model,
                     "success": True,
+                    "terminated_early": terminated_early,
+                    "tokens_saved": tokens_saved,
+                    "continuations": continuations,
+                    "tokens_salvaged": tokens_salvaged,
+                    "predicted_time": predicted.latency,
                 }
+                if decision.degraded:
+                    result["degraded"] = True
+                if cache_key is not None:
+                    self.cache.set(cache_key, result, profile.cache_ttl)
+                self._record_usage(profile.model, tokens_used, generation_time, attempt, True)
+                return result
+
+            except SchedulerTimeout as e:
+                retry_after = max(1, math.ceil(self.scheduler.load(lane)["expected_wait"]))
+                return self._shed(AdmissionDecision(False, False, retry_after, str(e)), None, lane)
 
             except Exception as e:
-                logger.warning(f"Attempt {attempt + 1} failed: {str(e)}")
+                logger.warning(
+                    "Attempt %d failed: %s", attempt + 1, e, extra={"attempt": attempt + 1}
+                )
+                if isinstance(e, StreamInterrupted) and not response_format:
+                    partial = e.partial
 
-                if attempt == Config.MAX_RETRIES - 1:
-                    logger.error(f"All {Config.MAX_RETRIES} attempts failed")
-                    return {"content": None, "error": str(e), "success": False}
+                if attempt == profile.max_retries - 1:
+                    logger.error("All %d attempts failed", profile.max_retries)
+                    self._record_usage(profile.model, 0, time.time() - call_start, attempt, False)
+                    failure = {"content": None, "error": str(e), "success": False}
+                    if partial:
+                        failure["partial_content"] = partial
+                    return failure
 
                 # Exponential backoff
-                time.sleep(Config.RETRY_DELAY**attempt)
+                time.sleep(profile.retry_delay**attempt)
+
+    def _slot(self, backend: LLMBackend, lane: str, client_id: str, estimated_tokens: int):
+        """
+        Scheduler slot for metered backends; others manage their own capacity
+
+        With admission control on, queueing is bounded by ADMISSION_MAX_WAIT.
+        """
+        if backend.uses_api_budget:
+            timeout = self.admission.max_wait if self.admission is not None else None
+            return self.scheduler.slot(lane, client_id, estimated_tokens, timeout)
+        return nullcontext({"waited": 0.0, "actual_tokens": None})
+
+    def _shed(
+        self, decision: AdmissionDecision, cache_key: Optional[str], lane: str
+    ) -> Dict[str, any]:
+        """Stale cached content when available, otherwise a busy response"""
+        if cache_key is not None:
+            stale = self.cache.get(cache_key, record=False, max_stale=Config.STALE_CACHE_SECONDS)
+            if stale is not None:
+                logger.info("Serving stale cached generation under load", extra={"stale": True})
+                stale.update(cached=True, stale=True)
+                return stale
+
+        logger.warning(
+            "Request shed: %s",
+            decision.reason,
+            extra={"shed": True, "lane": lane, "retry_after": decision.retry_after},
+        )
+        return {
+            "content": None,
+            "error": f"Service busy ({decision.reason}), retry in {decision.retry_after} s",
+            "success": False,
+            "busy": True,
+            "retry_after": decision.retry_after,
+        }
+
+    def _complete_resumable(
+        self,
+        backend: LLMBackend,
+        request: CompletionRequest,
+        stream: bool,
+        constraint: Optional[OutputConstraint],
+        max_continuations: int,
+        partial: str = "",
+    ) -> Tuple[str, int, bool, int, int]:
+        """
+        Complete a request, continuing output cut off by the token limit
+
+        Args:
+            partial: Output salvaged from an interrupted attempt; the first call continues it
+
+        Returns:
+            (content, tokens used, terminated early, continuation calls made,
+            tokens of partial output reused)
+
+        Raises:
+            StreamInterrupted: With all text received so far, including ``partial``
+        """
+        content = partial
+        tokens_total = tokens_salvaged = continuations = 0
+        # Characters of content already credited as salvaged at an earlier resume
+        credited = 0
+        while True:
+            call = request
+            if content:
+                call = continuation_request(request, content)
+                tokens_salvaged += estimate_tokens(content[credited:])
+                credited = len(content)
+            content, tokens_used, terminated_early, finish_reason = self._complete(
+                backend, call, stream, constraint, content
+            )
+            tokens_total += tokens_used
+            if finish_reason != "length" or terminated_early or continuations >= max_continuations:
+                return content, tokens_total, terminated_early, continuations, tokens_salvaged
+            continuations += 1
+            logger.info(
+                "Output hit the token limit, continuing (%d/%d)",
+                continuations,
+                max_continuations,
+                extra={"continuations": continuations},
+            )
+
+    def _complete(
+        self,
+        backend: LLMBackend,
+        request: CompletionRequest,
+        stream: bool,
+        constraint: Optional[OutputConstraint],
+        prefix: str = "",
+    ) -> Tuple[str, int, bool, Optional[str]]:
+        """
+        Issue one completion request
+
+        Args:
+            prefix: Earlier output this request continues; it is merged into the
+                returned content and counts towards the constraint
+
+        Returns:
+            (content, tokens used, terminated early, finish reason)
+        """
+        prompt_tokens = estimate_tokens("".join(m["content"] for m in request.messages[1:]))
+
+        if not (stream and constraint is not None):
+            completion = backend.complete(request)
+            tokens_used = completion.total_tokens or prompt_tokens + estimate_tokens(
+                completion.content
+            )
+            content = merge_continuation(prefix, completion.content)
+            return content, tokens_used, False, completion.finish_reason
+
+        response = backend.stream(request)
+        try:
+            content, tokens_used, terminated_early = self._read_stream(response, constraint, prefix)
+        except StreamInterrupted as e:
+            raise StreamInterrupted(merge_continuation(prefix, e.partial), e.cause) from e.cause
+        completion_tokens = estimate_tokens(content)
+        content = merge_continuation(prefix, content)
+        if terminated_early:
+            # The server never reports usage for a stream closed early
+            tokens_used = prompt_tokens + completion_tokens
+            return constraint.trim(content), tokens_used, True, response.finish_reason
+        if not tokens_used:
+            tokens_used = prompt_tokens + completion_tokens
+        return content, tokens_used, False, response.finish_reason
+
+    def _record_usage(self, model: str, tokens: int, latency: float, retries: int, success: bool):
+        """Append the call outcome to the usage ledger; never fails the request"""
+        if self.ledger is None:
+            return
+        request = current_request()
+        try:
+            self.ledger.record(
+                client=request.get("client", DEFAULT_CLIENT),
+                content_type=request.get("content_type", "default"),
+                model=model,
+                tokens=tokens,
+                latency=latency,
+                retries=retries,
+                success=success,
+                request_id=request.get("request_id"),
+            )
+        except Exception as e:
+            logger.warning("Failed to record usage: %s", e)
+
+    def _observe_latency(
+        self,
+        content_type: str,
+        model: str,
+        prompt_tokens: int,
+        target: int,
+        completion_tokens: int,
+        latency: float,
+        predicted: Prediction,
+    ):
+        """Feed a finished call to the latency predictor; never fails the request"""
+        try:
+            self.predictor.observe(
+                content_type, model, prompt_tokens, target, completion_tokens, latency, predicted
+            )
+        except Exception as e:
+            logger.warning("Failed to record latency sample: %s", e)
+
+    def estimate(self, content_type: str, **parameters) -> Dict[str, any]:
+        """
+        Predict how long a generate_* call with these parameters will take
+
+        Returns:
+            Dict with predicted completion tokens, generation "time", expected
+            scheduler "queue_wait" and their sum as "eta" (all 0 on a cache hit)
+        """
+        request = current_request()
+        lane = request.get("lane", "interactive")
+        prompt = PROMPT_TEMPLATES[content_type](**parameters)
+        profile = self.profiles.get(content_type, parameters.get("platform"))
+        profile = profile.for_lane(request.get("profile_lane", lane))
+
+        if profile.cache_ttl > 0:
+            key = ResponseCache.make_key(
+                prompt, profile.model, profile.temperature, profile.max_tokens
+            )
+            if self.cache.get(key, record=False) is not None:
+                return {"completion_tokens": 0, "time": 0.0, "queue_wait": 0.0, "eta": 0.0}
+
+        target = target_tokens(profile.max_tokens, constraint_for(content_type, parameters))
+        predicted = self.predictor.predict(
+            content_type, profile.model, target, estimate_tokens(prompt)
+        )
+        queue_wait = 0.0
+        if self.backend(profile.backend).uses_api_budget:
+            queue_wait = self.scheduler.load(lane)["expected_wait"]
+        return {
+            "completion_tokens": predicted.completion_tokens,
+            "time": predicted.latency,
+            "queue_wait": queue_wait,
+            "eta": queue_wait + predicted.latency,
+        }
+
+    def estimate_job(self, method: str, parameters: Dict[str, any]) -> float:
+        """Predicted generation seconds for a queued method call (0 if unknown)"""
+        parameters = dict(parameters)
+        if method == "generate_structured":
+            content_type = parameters.pop("content_type", None)
+        else:
+            content_type = METHOD_CONTENT_TYPES.get(method)
+        if content_type not in PROMPT_TEMPLATES:
+            return 0.0
+        with request_scope(lane="batch"):
+            try:
+                return self.estimate(content_type, **parameters)["time"]
+            except TypeError:
+                # Bad parameters fail when the job runs, not when it is queued
+                return 0.0
+
+    @staticmethod
+    def _read_stream(
+        stream: CompletionStream, constraint: OutputConstraint, prefix: str = ""
+    ) -> Tuple[str, int, bool]:
+        """
+        Accumulate a streamed completion, closing it once the constraint is met
+
+        Args:
+            prefix: Earlier output the stream continues, counted towards the constraint
+
+        Returns:
+            (text, total tokens reported by the backend or 0, terminated early)
+
+        Raises:
+            StreamInterrupted: If the stream fails after producing some text
+        """
+        parts = []
+
+        try:
+            for delta in stream:
+                parts.append(delta)
+
+                # Only re-check at word boundaries to keep the scan cheap
+                if (" " in delta or "\n" in delta) and constraint.is_complete(
+                    prefix + "".join(parts)
+                ):
+                    stream.close()
+                    return "".join(parts), stream.total_tokens, True
+        except Exception as e:
+            if not parts:
+                raise
+            raise StreamInterrupted("".join(parts), e) from e
+
+        return "".join(parts), stream.total_tokens, False
+
+    def _generate(
+        self,
+        content_type: str,
+        prompt: str,
+        parameters: Dict[str, any],
+        platform: Optional[str] = None,
+        context: Optional[str] = None,
+    ) -> Dict[str, any]:
+        """
+        Run a prompt with the content type's profile and tag the result
+
+        ``context`` (e.g. a campaign summary) is appended to the prompt but
+        kept out of the recorded parameters.
+        """
+        profile = self.profiles.get(content_type, platform)
+        if context:
+            prompt += PromptTemplates.campaign_context(context)
+        with request_scope(content_type=content_type):
+            result = self._call_api(
+                prompt,
+                profile=profile,
+                stop=PromptTemplates.stop_sequences(content_type),
+                constraint=constraint_for(content_type, parameters),
+            )
 
+        if result["success"]:
+            result["type"] = content_type
+            result["parameters"] = parameters
+
+        return result
+
+    def generate_structured(self, content_type: str, **parameters) -> Dict[str, any]:
+        """
+        Generate content as JSON and validate it into a typed result
+
+        Malformed output is fixed locally when possible; otherwise one short
+        repair call is made instead of regenerating the content.
+
+        Args:
+            content_type: A key of STRUCTURED_TYPES (ad_copy, email, ...)
+            **parameters: The content type's template parameters
+
+        Returns:
+            Result dict whose "data" is the typed result (e.g. AdCopyResult),
+            "content" its text rendering and "json_repair" one of
+            "none", "local" or "api"
+        """
+        if content_type not in STRUCTURED_TYPES:
+            raise ValueError(f"No structured output for content type: {content_type}")
+        logger.info("Generating structured %s", content_type)
+
+        result_type, template = STRUCTURED_TYPES[content_type]
+        schema = json.dumps(json_schema(result_type))
+        profile = self.profiles.get(content_type, parameters.get("platform"))
+        response_format = {"type": "json_object"}
+
+        with get_profiler().scope(content_type), request_scope(content_type=content_type):
+            result = self._call_api(
+                template(**parameters) + PromptTemplates.json_output(schema),
+                profile=profile,
+                response_format=response_format,
+            )
+            if not result["success"]:
+                return result
+
+            try:
+                data, repaired = parse_structured(content_type, result["content"])
+                result["json_repair"] = "local" if repaired else "none"
+            except StructuredOutputError as e:
+                logger.info("Repairing structured %s output: %s", content_type, e)
+                repair = self._call_api(
+                    PromptTemplates.json_repair(schema, result["content"], str(e)),
+                    temperature=0,
+                    profile=profile,
+                    response_format=response_format,
+                )
+                if not repair["success"]:
+                    return repair
+                result["tokens"] += repair["tokens"]
+                result["time"] += repair["time"]
+                try:
+                    data, _ = parse_structured(content_type, repair["content"])
+                except StructuredOutputError as e:
+                    return {
+                        "content": None,
+                        "error": f"Invalid structured output: {e}",
+                        "success": False,
+                    }
+                result["json_repair"] = "api"
+
+        result["data"] = data
+        result["content"] = data.to_text()
+        result["type"] = content_type
+        result["parameters"] = parameters
+        return result
+
+    def _translation_call(
+        self, label: str, source: str, locale: str, profile: GenerationProfile
+    ) -> Tuple[str, int, str]:
+        """Prompt, token budget and cache key for translating one piece"""
+        prompt = PromptTemplates.localize(label, source, locale)
+        # Leave room for languages that run longer than the source
+        max_tokens = estimate_tokens(source) * 3 // 2 + 50
+        key = ResponseCache.make_key(prompt, profile.model, TRANSLATION_TEMPERATURE, max_tokens)
+        return prompt, max_tokens, key
+
+    def _translation_profile(self, content_type: str) -> GenerationProfile:
+        profile = self.profiles.get(content_type)
+        return replace(profile, cache_ttl=Config.TRANSLATION_CACHE_TTL, stream=False)
+
+    @profiled("translation")
+    def translate(self, source: str, locale: str, content_type: str = "default") -> Dict[str, any]:
+        """
+        Translate and adapt one piece of content for a locale
+
+        Results are cached per (source, locale), so re-running a locale or
+        re-localizing an unchanged piece costs nothing.
+        """
+        profile = self._translation_profile(content_type)
+        prompt, max_tokens, _ = self._translation_call(
+            content_type.replace("_", " "), source, locale, profile
+        )
+        with request_scope(content_type=content_type, locale=locale):
+            result = self._call_api(
+                prompt,
+                temperature=TRANSLATION_TEMPERATURE,
+                max_tokens=max_tokens,
+                profile=profile,
+            )
+        if result["success"]:
+            result["locale"] = locale
+        return result
+
+    @profiled("translation")
+    def translate_batch(
+        self,
+        items: List[str],
+        locales: List[str],
+        content_type: str = "default",
+        max_tokens: int = 2000,
+    ) -> Dict[str, List[Optional[str]]]:
+        """
+        Localize several short items (social posts, subject lines) in few calls
+
+        Uncached (item, locale) pairs are packed into JSON calls of up to
+        max_tokens output. Each translation is cached under the same key a
+        single translate() call would use. Pairs a successful batch call did
+        not answer usably (unparseable reply, a locale mapped to something other
+        than an object, a missing or non-string text) fall back to translate().
+
+        Returns:
+            {locale: [translation or None if it failed, in item order]}
+        """
+        label = content_type.replace("_", " ")
+        profile = self._translation_profile(content_type)
+        translations = {locale: [None] * len(items) for locale in locales}
+
+        pending = []  # (locale, index, budget, key)
+        fallback = []  # (locale, index) left unanswered by a successful batch call
+        for locale in locales:
+            for index, item in enumerate(items):
+                _, budget, key = self._translation_call(label, item, locale, profile)
+                cached = self.cache.get(key)
+                if cached is not None:
+                    translations[locale][index] = cached["content"]
+                else:
+                    pending.append((locale, index, budget, key))
+
+        while pending:
+            batch, used = [], 0
+            while pending and (not batch or used + pending[0][2] <= max_tokens):
+                batch.append(pending.pop(0))
+                used += batch[-1][2]
+
+            indexes = sorted({index for _, index, _, _ in batch})
+            batch_locales = list(dict.fromkeys(locale for locale, _, _, _ in batch))
+            prompt = PromptTemplates.localize_batch(
+                label, {str(index + 1): items[index] for index in indexes}, batch_locales
+            )
+            with request_scope(content_type=content_type, locale=",".join(batch_locales)):
+                result = self._call_api(
+                    prompt,
+                    temperature=TRANSLATION_TEMPERATURE,
+                    max_tokens=used + 50,
+                    profile=replace(profile, cache_ttl=0),
+                    response_format={"type": "json_object"},
+                )
+            if not result["success"]:
+                logger.warning("Batch localization failed: %s", result.get("error"))
+                continue
+            try:
+                data = repair_json(result["content"])
+            except StructuredOutputError as e:
+                logger.warning("Unparseable batch localization: %s", e)
+                data = {}
+
+            for locale, index, _, key in batch:
+                texts = data.get(locale) if isinstance(data, dict) else None
+                text = texts.get(str(index + 1)) if isinstance(texts, dict) else None
+                if not isinstance(text, str) or not text.strip():
+                    fallback.append((locale, index))
+                else:
+                    translations[locale][index] = text.strip()
+                    self.cache.set(
+                        key,
+                        {
+                            "content": text.strip(),
+                            "tokens": 0,
+                            "time": 0.0,
+                            "model": profile.model,
+                            "success": True,
+                        },
+                        profile.cache_ttl,
+                    )
+
+        if fallback:
+            logger.info("Translating %d batch entries one at a time", len(fallback))
+        for locale, index in fallback:
+            result = self.translate(items[index], locale, content_type)
+            if result["success"]:
+                translations[locale][index] = result["content"]
+
+        return translations
+
+    def repair_sections(
+        self, result: Dict[str, any], max_tokens: int = 300, excerpt_chars: int = 800
+    ) -> Dict[str, any]:
+        """
+        Validate a result's sections and regenerate only the broken ones
+
+        Args:
+            result: Successful result from generate_email / generate_landing_page
+            max_tokens: Token budget for each section regeneration
+            excerpt_chars: Characters of the original given as context
+
+        Returns:
+            The result with merged content, extra tokens/time added, and a
+            "validation" entry listing issues found and sections repaired
+        """
+        report = validate_content(result["type"], result["content"])
+        result["validation"] = {"issues": dict(report.issues), "repaired": []}
+        if report.valid:
+            return result
+
+        profile = self.profiles.get(result["type"])
+        content = result["content"]
+        excerpt = content[:excerpt_chars]
+        label = result["type"].replace("_", " ")
+
+        for spec, problem in sections_to_repair(report):
+            logger.info("Regenerating %s section '%s': %s", label, spec.name, problem)
+            prompt = PromptTemplates.section_repair(
+                label, spec.label, spec.description, problem, result["parameters"], excerpt
+            )
+            with request_scope(content_type=result["type"]):
+                repair = self._call_api(prompt, max_tokens=max_tokens, profile=profile)
+            if not repair["success"]:
+                logger.warning("Could not repair section '%s': %s", spec.name, repair["error"])
+                continue
+
+            content = merge_section(result["type"], content, spec.name, repair["content"])
+            result["tokens"] += repair["tokens"]
+            result["time"] += repair["time"]
+            result["validation"]["repaired"].append(spec.name)
+
+        result["content"] = content
+        return result
+
+    @profiled("blog_post")
     def generate_blog_post(
         self, topic: str, keywords: str, tone: str, word_count: int
     ) -> Dict[str, any]:
         """Generate blog post"""
-        logger.info(f"Generating blog post: {topic}")
+        logger.info("Generating blog post: %s", topic)
 
         prompt = PromptTemplates.blog_post(topic, keywords, tone, word_count)
-        result = self._call_api(prompt, max_tokens=3000)
-
-        if result["success"]:
-            result["type"] = "blog_post"
-            result["parameters"] = {
+        return self._generate(
+            "blog_post",
+            prompt,
+            {
                 "topic": topic,
                 "keywords": keywords,
                 "tone": tone,
                 "word_count": word_count,
-            }
-
-        return result
+            },
+        )
 
-    def generate_social_post(self, topic: str, platform: str, tone: str) -> Dict[str, any]:
+    @profiled("social_post")
+    def generate_social_post(
+        self, topic: str, platform: str, tone: str, context: Optional[str] = None
+    ) -> Dict[str, any]:
         """Generate social media post"""
-        logger.info(f"Generating {platform} post: {topic}")
+        logger.info("Generating %s post: %s", platform, topic)
 
         prompt = PromptTemplates.social_media_post(topic, platform, tone)
-        result = self._call_api(prompt, max_tokens=500)
-
-        if result["success"]:
-            result["type"] = "social_post"
-            result["parameters"] = {"topic": topic, "platform": platform, "tone": tone}
-
-        return result
-
-    def generate_ad_copy(self, product: str, target_audience: str, tone: str) -> Dict[str, any]:
+        return self._generate(
+            "social_post",
+            prompt,
+            {"topic": topic, "platform": platform, "tone": tone},
+            platform=platform,
+            context=context,
+        )
+
+    @profiled("ad_copy")
+    def generate_ad_copy(
+        self, product: str, target_audience: str, tone: str, context: Optional[str] = None
+    ) -> Dict[str, any]:
         """Generate advertisement copy"""
-        logger.info(f"Generating ad copy for: {product}")
+        logger.info("Generating ad copy for: %s", product)
 
         prompt = PromptTemplates.ad_copy(product, target_audience, tone)
-        result = self._call_api(prompt, max_tokens=1000)
-
-        if result["success"]:
-            result["type"] = "ad_copy"
-            result["parameters"] = {
+        return self._generate(
+            "ad_copy",
+            prompt,
+            {
                 "product": product,
                 "target_audience": target_audience,
                 "tone": tone,
-            }
-
-        return result
+            },
+            context=context,
+        )
 
-    def generate_email(self, purpose: str, audience: str, tone: str) -> Dict[str, any]:
+    @profiled("email")
+    def generate_email(
+        self, purpose: str, audience: str, tone: str, context: Optional[str] = None
+    ) -> Dict[str, any]:
         """Generate email template"""
-        logger.info(f"Generating email: {purpose}")
+        logger.info("Generating email: %s", purpose)
 
         prompt = PromptTemplates.email_template(purpose, audience, tone)
-        result = self._call_api(prompt, max_tokens=1500)
-
-        if result["success"]:
-            result["type"] = "email"
-            result["parameters"] = {
+        return self._generate(
+            "email",
+            prompt,
+            {
                 "purpose": purpose,
                 "audience": audience,
                 "tone": tone,
-            }
-
-        return result
+            },
+            context=context,
+        )
 
+    @profiled("landing_page")
     def generate_landing_page(self, offer: str, target_audience: str, tone: str) -> Dict[str, any]:
         """Generate landing page copy"""
-        logger.info(f"Generating landing page: {offer}")
+        logger.info("Generating landing page: %s", offer)
 
         prompt = PromptTemplates.landing_page_copy(offer, target_audience, tone)
-        result = self._call_api(prompt, max_tokens=2000)
-
-        if result["success"]:
-            result["type"] = "landing_page"
-            result["parameters"] = {
+        return self._generate(
+            "landing_page",
+            prompt,
+            {
                 "offer": offer,
                 "target_audience": target_audience,
                 "tone": tone,
-            }
-
-        return result
+            },
+        )
 
+    @profiled("product_description")
     def generate_product_description(
-        self, product_name: str, features: str, tone: str
+        self, product_name: str, features: str, tone: str, context: Optional[str] = None
     ) -> Dict[str, any]:
         """Generate product description"""
-        logger.info(f"Generating product description: {product_name}")
+        logger.info("Generating product description: %s", product_name)
 
         prompt = PromptTemplates.product_description(product_name, features, tone)
-        result = self._call_api(prompt, max_tokens=1000)
-
-        if result["success"]:
-            result["type"] = "product_description"
-            result["parameters"] = {
+        return self._generate(
+            "product_description",
+            prompt,
+            {
                 "product_name": product_name,
                 "features": features,
                 "tone": tone,
-            }
-
-        return result
+            },
+            context=context,
+        )
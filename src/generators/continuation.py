@@ -0,0 +1,53 @@
+"""
+Resuming cut-off generations
+A completion that stops at the token limit (finish_reason "length") or whose
+stream drops mid-way keeps the text received so far; a continuation request
+replays it as the assistant's turn and asks the model to carry on, so only
+the missing tail is generated instead of the whole piece.
+"""
+
+from dataclasses import replace
+
+from src.generators.backends import CompletionRequest
+from src.prompts.templates import PromptTemplates
+
+# Longest stretch of repeated text looked for where a continuation joins
+MAX_OVERLAP_CHARS = 300
+
+# Shorter matches are likely coincidental (a shared word or space)
+MIN_OVERLAP_CHARS = 8
+
+
+class StreamInterrupted(Exception):
+    """A streamed completion failed after producing output"""
+
+    def __init__(self, partial: str, cause: Exception):
+        super().__init__(f"stream interrupted after {len(partial)} characters: {cause}")
+        self.partial = partial
+        self.cause = cause
+
+
+def continuation_request(request: CompletionRequest, partial: str) -> CompletionRequest:
+    """The original request followed by the partial answer and a request to continue it"""
+    messages = request.messages + [
+        {"role": "assistant", "content": partial},
+        {"role": "user", "content": PromptTemplates.continuation()},
+    ]
+    return replace(request, messages=messages)
+
+
+def merge_continuation(partial: str, continuation: str) -> str:
+    """
+    Join a continuation onto the text it continues
+
+    Models often restate the last few words before carrying on; the longest
+    suffix of ``partial`` that the continuation starts with is dropped.
+    """
+    if not partial:
+        return continuation
+    head = continuation.lstrip()
+    tail = partial[-MAX_OVERLAP_CHARS:]
+    for size in range(min(len(tail), len(head)), MIN_OVERLAP_CHARS - 1, -1):
+        if head.startswith(tail[-size:]):
+            return partial + head[size:]
+    return partial + continuation
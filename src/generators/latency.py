@@ -0,0 +1,296 @@
+"""
+Latency prediction for generation requests
+Two small online regressions are fitted from recorded calls: completion tokens
+from the requested length (per content type and model), and latency from
+completion and prompt tokens (per model). Predictions feed the ETA shown before
+generating and shortest-job-first ordering of batch work; every observation
+is compared with what was predicted so drift shows up in the accuracy report:
+
+    python -m src.generators.latency --days 7
+"""
+
+import argparse
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import defaultdict, deque
+from dataclasses import dataclass
+from functools import partial
+from typing import Dict, Optional, Tuple
+
+from config import Config
+from src.generators.constraints import OutputConstraint
+
+# Rough tokens-per-word ratio for English text
+TOKENS_PER_WORD = 4 / 3
+
+# Used until a model has recorded calls
+PRIOR_COMPLETION_RATIO = 0.6
+PRIOR_TOKENS_PER_SECOND = 150.0
+PRIOR_PROMPT_TOKENS_PER_SECOND = 5000.0
+PRIOR_OVERHEAD_SECONDS = 0.5
+
+# Observations needed before a fitted line replaces the prior
+MIN_SAMPLES = 5
+
+# Features more correlated than this are fitted on the first one alone
+MAX_CORRELATION = 0.999
+
+# Recent error this many times the long-run error counts as drift
+DRIFT_RATIO = 1.5
+
+
+def target_tokens(max_tokens: int, constraint: Optional[OutputConstraint] = None) -> int:
+    """Requested output length in tokens: the word target when there is one, else max_tokens"""
+    if constraint is not None and constraint.max_words:
+        return min(max_tokens, int(constraint.max_words * TOKENS_PER_WORD))
+    return max_tokens
+
+
+@dataclass(frozen=True)
+class Prediction:
+    """Expected completion size and generation time of one call"""
+
+    completion_tokens: int
+    latency: float
+
+
+class _LinearFit:
+    """
+    Running least-squares fit of y = a + b * x + c * z (z is optional)
+
+    Older samples are down-weighted by ``decay`` per new sample, so the fit
+    follows the recent behaviour of the API rather than its whole history.
+    A feature that never varies, or that moves in lockstep with x, is left
+    out of the fit instead of producing an unstable coefficient.
+    """
+
+    __slots__ = ("decay", "count", "w", "sx", "sz", "sy", "sxx", "szz", "sxz", "sxy", "szy")
+
+    def __init__(self, decay: float = 1.0):
+        self.decay = decay
+        self.count = 0
+        self.w = self.sx = self.sz = self.sy = 0.0
+        self.sxx = self.szz = self.sxz = self.sxy = self.szy = 0.0
+
+    def add(self, x: float, y: float, z: float = 0.0):
+        d = self.decay
+        self.count += 1
+        self.w = self.w * d + 1
+        self.sx = self.sx * d + x
+        self.sz = self.sz * d + z
+        self.sy = self.sy * d + y
+        self.sxx = self.sxx * d + x * x
+        self.szz = self.szz * d + z * z
+        self.sxz = self.sxz * d + x * z
+        self.sxy = self.sxy * d + x * y
+        self.szy = self.szy * d + z * y
+
+    def predict(self, x: float, z: float = 0.0) -> float:
+        w = self.w
+        mean_x, mean_z, mean_y = self.sx / w, self.sz / w, self.sy / w
+        var_x = self.sxx / w - mean_x * mean_x
+        var_z = self.szz / w - mean_z * mean_z
+        cov_xz = self.sxz / w - mean_x * mean_z
+        cov_xy = self.sxy / w - mean_x * mean_y
+        cov_zy = self.szy / w - mean_z * mean_y
+
+        if var_x > 1e-9 and var_z > 1e-9:
+            det = var_x * var_z - cov_xz * cov_xz
+            if det > (1 - MAX_CORRELATION**2) * var_x * var_z:
+                slope_x = (cov_xy * var_z - cov_zy * cov_xz) / det
+                slope_z = (cov_zy * var_x - cov_xy * cov_xz) / det
+                return mean_y + slope_x * (x - mean_x) + slope_z * (z - mean_z)
+        if var_x > 1e-9:
+            return mean_y + cov_xy / var_x * (x - mean_x)
+        if var_z > 1e-9:
+            return mean_y + cov_zy / var_z * (z - mean_z)
+        # Every sample had the same inputs (e.g. a fixed max_tokens): use the mean
+        return mean_y
+
+
+class LatencyPredictor:
+    """Thread-safe latency predictor, optionally persisted to a SQLite sample store"""
+
+    def __init__(self, path: Optional[str] = None, window: int = 5000):
+        """
+        Args:
+            path: SQLite file of recorded samples shared between processes
+            window: Samples loaded at start-up and kept for in-memory accuracy;
+                also the effective memory of the fits
+        """
+        self.path = path or None
+        self.window = window
+        new_fit = partial(_LinearFit, 1 - 1 / window)
+        self._tokens: Dict[Tuple[str, str], _LinearFit] = defaultdict(new_fit)
+        self._latency: Dict[str, _LinearFit] = defaultdict(new_fit)
+        self._samples: deque = deque(maxlen=window)
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+        conn = self._connection()
+        if conn is not None:
+            rows = conn.execute(
+                "SELECT * FROM (SELECT ts, content_type, model, prompt_tokens, target_tokens, "
+                "completion_tokens, latency, predicted_tokens, predicted_latency "
+                "FROM latency_samples ORDER BY ts DESC LIMIT ?) ORDER BY ts",
+                (window,),
+            ).fetchall()
+            for row in rows:
+                self._fit(*row)
+
+    def _connection(self) -> Optional[sqlite3.Connection]:
+        """Per-thread connection to the sample store, created on first use"""
+        if self.path is None:
+            return None
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS latency_samples (ts REAL NOT NULL, "
+                "content_type TEXT NOT NULL, model TEXT NOT NULL, prompt_tokens INTEGER NOT NULL, "
+                "target_tokens INTEGER NOT NULL, completion_tokens INTEGER NOT NULL, "
+                "latency REAL NOT NULL, predicted_tokens INTEGER NOT NULL, "
+                "predicted_latency REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_latency_ts ON latency_samples (ts)")
+            self._local.conn = conn
+        return conn
+
+    def _fit(
+        self,
+        ts: float,
+        content_type: str,
+        model: str,
+        prompt_tokens: int,
+        target: int,
+        completion: int,
+        latency: float,
+        predicted_tokens: int,
+        predicted_latency: float,
+    ):
+        """Fold one sample into the fits and the in-memory accuracy window"""
+        with self._lock:
+            self._tokens[(content_type, model)].add(target, completion)
+            self._latency[model].add(completion, latency, prompt_tokens)
+            self._samples.append(
+                (ts, content_type, completion, latency, predicted_tokens, predicted_latency)
+            )
+
+    def predict(
+        self, content_type: str, model: str, target: int, prompt_tokens: int = 0
+    ) -> Prediction:
+        """Expected completion tokens and seconds for a call asking for ``target`` tokens"""
+        with self._lock:
+            tokens_fit = self._tokens.get((content_type, model))
+            if tokens_fit is not None and tokens_fit.count >= MIN_SAMPLES:
+                completion = tokens_fit.predict(target)
+            else:
+                completion = target * PRIOR_COMPLETION_RATIO
+            completion = min(max(completion, 1.0), float(target))
+
+            latency_fit = self._latency.get(model)
+            if latency_fit is not None and latency_fit.count >= MIN_SAMPLES:
+                latency = latency_fit.predict(completion, prompt_tokens)
+            else:
+                latency = (
+                    PRIOR_OVERHEAD_SECONDS
+                    + completion / PRIOR_TOKENS_PER_SECOND
+                    + prompt_tokens / PRIOR_PROMPT_TOKENS_PER_SECOND
+                )
+        return Prediction(int(completion), max(latency, 0.0))
+
+    def observe(
+        self,
+        content_type: str,
+        model: str,
+        prompt_tokens: int,
+        target: int,
+        completion_tokens: int,
+        latency: float,
+        predicted: Prediction,
+    ):
+        """Record a finished call and the prediction made for it"""
+        ts = time.time()
+        sample = (
+            ts,
+            content_type,
+            model,
+            prompt_tokens,
+            target,
+            completion_tokens,
+            latency,
+            predicted.completion_tokens,
+            predicted.latency,
+        )
+        self._fit(*sample)
+
+        conn = self._connection()
+        if conn is not None:
+            conn.execute("INSERT INTO latency_samples VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", sample)
+
+    def accuracy(self, days: float = 7) -> Dict[str, any]:
+        """
+        Prediction error over the last ``days`` days
+
+        Reports mean absolute latency error, mean absolute percentage errors,
+        per-content-type latency MAPE, and whether the last day's latency
+        MAPE has drifted above DRIFT_RATIO times the window's.
+        """
+        since = time.time() - days * 86400
+        conn = self._connection()
+        if conn is not None:
+            samples = conn.execute(
+                "SELECT ts, content_type, completion_tokens, latency, predicted_tokens, "
+                "predicted_latency FROM latency_samples WHERE ts >= ?",
+                (since,),
+            ).fetchall()
+        else:
+            with self._lock:
+                samples = [sample for sample in self._samples if sample[0] >= since]
+
+        # Sample columns: ts, content_type, completion, latency, predicted tokens/latency
+        def mape(rows, actual, predicted):
+            errors = [abs(r[predicted] - r[actual]) / r[actual] for r in rows if r[actual]]
+            return sum(errors) / len(errors) if errors else 0.0
+
+        by_type = defaultdict(list)
+        for sample in samples:
+            by_type[sample[1]].append(sample)
+        recent = [sample for sample in samples if sample[0] >= time.time() - 86400]
+
+        latency_mape = mape(samples, 3, 5)
+        recent_mape = mape(recent, 3, 5)
+        return {
+            "samples": len(samples),
+            "latency_mae": (
+                sum(abs(s[5] - s[3]) for s in samples) / len(samples) if samples else 0.0
+            ),
+            "latency_mape": latency_mape,
+            "tokens_mape": mape(samples, 2, 4),
+            "by_content_type": {name: mape(rows, 3, 5) for name, rows in by_type.items()},
+            "recent_latency_mape": recent_mape,
+            "drifting": len(recent) >= MIN_SAMPLES and recent_mape > DRIFT_RATIO * latency_mape,
+        }
+
+
+def main():
+    """Command-line accuracy report"""
+    parser = argparse.ArgumentParser(description="Latency prediction accuracy report")
+    parser.add_argument("--db", default=None, help="Latency sample database path")
+    parser.add_argument("--days", type=float, default=7, help="Look-back window in days")
+    args = parser.parse_args()
+
+    Config.load()
+    predictor = LatencyPredictor(args.db or Config.LATENCY_DB_PATH)
+    print(json.dumps(predictor.accuracy(args.days), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+"""
+Multi-locale fan-out
+The source piece is generated once; translations for every locale then run
+concurrently, and short pieces are localized for all locales in a single
+batched call. Translations are cached per (source, locale).
+"""
+
+import contextvars
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+from src.generators.constraints import estimate_tokens
+
+logger = logging.getLogger(__name__)
+
+# Content types always localized through one batched call
+SHORT_CONTENT_TYPES = frozenset({"social_post"})
+
+# Other pieces up to this size are batched too
+SHORT_ITEM_TOKENS = 150
+
+COMMON_LOCALES = (
+    "de-DE",
+    "fr-FR",
+    "es-ES",
+    "it-IT",
+    "pt-BR",
+    "nl-NL",
+    "pl-PL",
+    "sv-SE",
+    "ja-JP",
+    "zh-CN",
+)
+
+
+@dataclass
+class LocalizationResult:
+    """Source result plus one result per locale"""
+
+    source: Dict[str, any]
+    translations: Dict[str, Dict[str, any]] = field(default_factory=dict)
+    elapsed: float = 0.0
+
+    @property
+    def failed(self) -> List[str]:
+        return [locale for locale, result in self.translations.items() if not result["success"]]
+
+
+def is_short(result: Dict[str, any]) -> bool:
+    """Whether a piece is small enough to share a batched call"""
+    return (
+        result.get("type") in SHORT_CONTENT_TYPES
+        or estimate_tokens(result["content"]) <= SHORT_ITEM_TOKENS
+    )
+
+
+def localize(
+    generator, source: Dict[str, any], locales: List[str], max_workers: Optional[int] = None
+) -> LocalizationResult:
+    """
+    Localize a successful generation result into every locale
+
+    Long pieces get one translation call per locale, run concurrently (the
+    API scheduler still bounds calls in flight); short ones share one call.
+    """
+    start = time.time()
+    outcome = LocalizationResult(source)
+    content_type = source.get("type", "default")
+    locales = list(dict.fromkeys(locales))
+
+    if is_short(source):
+        texts = generator.translate_batch([source["content"]], locales, content_type)
+        for locale in locales:
+            text = texts[locale][0]
+            outcome.translations[locale] = (
+                {"content": text, "locale": locale, "tokens": 0, "time": 0.0, "success": True}
+                if text is not None
+                else {"content": None, "error": "Batch localization failed", "success": False}
+            )
+    elif locales:
+        with ThreadPoolExecutor(max_workers=max_workers or len(locales)) as pool:
+            # Each task runs in a copy of the caller's request context
+            futures = {
+                locale: pool.submit(
+                    contextvars.copy_context().run,
+                    generator.translate,
+                    source["content"],
+                    locale,
+                    content_type,
+                )
+                for locale in locales
+            }
+            for locale, future in futures.items():
+                try:
+                    outcome.translations[locale] = future.result()
+                except Exception as e:
+                    logger.error("Localization to %s raised: %s", locale, e)
+                    outcome.translations[locale] = {
+                        "content": None,
+                        "error": str(e),
+                        "success": False,
+                    }
+
+    for result in outcome.translations.values():
+        if result["success"]:
+            result["type"] = content_type
+            result["parameters"] = source.get("parameters", {})
+
+    outcome.elapsed = time.time() - start
+    logger.info(
+        "Localized %s into %d locales in %.2fs",
+        content_type,
+        len(locales),
+        outcome.elapsed,
+        extra={"failed_locales": outcome.failed},
+    )
+    return outcome
+
+
+def generate_localized(
+    generator, method: str, locales: List[str], **parameters
+) -> LocalizationResult:
+    """Generate the source piece once with a generate_* method, then localize it"""
+    source = getattr(generator, method)(**parameters)
+    if not source["success"]:
+        return LocalizationResult(source)
+    return localize(generator, source, locales)
@@ -0,0 +1,197 @@
+"""
+Generation profiles per content type and platform
+Loaded from a JSON file, validated, and hot-reloaded when the file changes
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass, field, fields, replace
+from typing import Dict, Optional
+
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+# Token budgets used when no profile file is present
+BUILTIN_MAX_TOKENS = {
+    "blog_post": 3000,
+    "social_post": 500,
+    "ad_copy": 1000,
+    "email": 1500,
+    "landing_page": 2000,
+    "product_description": 1000,
+}
+
+
+class ProfileError(ValueError):
+    """Raised when a profile file is malformed"""
+
+
+@dataclass(frozen=True)
+class GenerationProfile:
+    """Tuning knobs applied to one generation call"""
+
+    # Config-backed defaults are read when a profile is built, after Config.load()
+    model: str = field(default_factory=lambda: Config.GROQ_MODEL)
+    temperature: float = field(default_factory=lambda: Config.DEFAULT_TEMPERATURE)
+    max_tokens: int = field(default_factory=lambda: Config.DEFAULT_MAX_TOKENS)
+    timeout: float = 60.0
+    max_retries: int = field(default_factory=lambda: Config.MAX_RETRIES)
+    retry_delay: float = field(default_factory=lambda: float(Config.RETRY_DELAY))
+    max_continuations: int = field(default_factory=lambda: Config.MAX_CONTINUATIONS)
+    cache_ttl: int = 0
+    stream: bool = False
+    backend: str = "groq"
+    # Backend/model for the batch lane (bulk, low-priority work); empty = same as above
+    batch_backend: str = ""
+    batch_model: str = ""
+
+    def validate(self) -> "GenerationProfile":
+        """Check value ranges, raising ProfileError on the first problem"""
+        if not self.model:
+            raise ProfileError("model must be a non-empty string")
+        if not 0 <= self.temperature <= 2:
+            raise ProfileError(f"temperature must be between 0 and 2, got {self.temperature}")
+        if self.max_tokens <= 0:
+            raise ProfileError(f"max_tokens must be positive, got {self.max_tokens}")
+        if self.timeout <= 0:
+            raise ProfileError(f"timeout must be positive, got {self.timeout}")
+        if self.max_retries < 1:
+            raise ProfileError(f"max_retries must be at least 1, got {self.max_retries}")
+        if self.retry_delay < 0 or self.cache_ttl < 0 or self.max_continuations < 0:
+            raise ProfileError("retry_delay, cache_ttl and max_continuations cannot be negative")
+        if not self.backend:
+            raise ProfileError("backend must be a non-empty string")
+        return self
+
+    def for_lane(self, lane: str) -> "GenerationProfile":
+        """The profile to use in a scheduler lane (batch may route elsewhere)"""
+        if lane != "batch" or not (self.batch_backend or self.batch_model):
+            return self
+        return replace(
+            self,
+            backend=self.batch_backend or self.backend,
+            model=self.batch_model or self.model,
+        )
+
+
+PROFILE_FIELDS = {f.name: f.type for f in fields(GenerationProfile)}
+
+
+def _section(value, where: str) -> Dict[str, any]:
+    """A section of the profile document, which must be a JSON object"""
+    if not isinstance(value, dict):
+        raise ProfileError(f"{where} must be an object, got {type(value).__name__}")
+    return value
+
+
+def _apply(base: GenerationProfile, overrides: Dict[str, any], where: str) -> GenerationProfile:
+    """Return base with overrides applied, rejecting unknown keys and bad types"""
+    overrides = _section(overrides, where)
+    unknown = set(overrides) - set(PROFILE_FIELDS)
+    if unknown:
+        raise ProfileError(f"{where}: unknown setting(s) {sorted(unknown)}")
+
+    values = {}
+    for key, value in overrides.items():
+        expected = PROFILE_FIELDS[key]
+        if expected is float and isinstance(value, int) and not isinstance(value, bool):
+            value = float(value)
+        if type(value) is not expected:
+            raise ProfileError(f"{where}: {key} must be {expected.__name__}, got {value!r}")
+        values[key] = value
+
+    try:
+        return replace(base, **values).validate()
+    except ProfileError as e:
+        raise ProfileError(f"{where}: {e}") from e
+
+
+def parse_profiles(data: Dict[str, any]) -> Dict[tuple, GenerationProfile]:
+    """
+    Resolve a profile document into concrete profiles
+
+    Args:
+        data: Parsed JSON with optional "defaults" and "content_types" sections
+
+    Returns:
+        Mapping of (content_type, platform) -> profile; platform None is the
+        content-type level profile and ("default", None) the global fallback
+    """
+    if not isinstance(data, dict):
+        raise ProfileError("profile file must contain a JSON object")
+
+    defaults = _apply(GenerationProfile(), data.get("defaults", {}), "defaults")
+    profiles = {("default", None): defaults}
+
+    for content_type in BUILTIN_MAX_TOKENS:
+        profiles[(content_type, None)] = replace(
+            defaults, max_tokens=BUILTIN_MAX_TOKENS[content_type]
+        )
+
+    for content_type, settings in _section(data.get("content_types", {}), "content_types").items():
+        settings = dict(_section(settings, content_type))
+        platforms = _section(settings.pop("platforms", {}), f"{content_type}/platforms")
+        base = profiles.get((content_type, None), defaults)
+        profiles[(content_type, None)] = _apply(base, settings, content_type)
+
+        for platform, platform_settings in platforms.items():
+            profiles[(content_type, platform)] = _apply(
+                profiles[(content_type, None)], platform_settings, f"{content_type}/{platform}"
+            )
+
+    return profiles
+
+
+class ProfileStore:
+    """Thread-safe profile lookup that reloads the file when it changes
+
+    An invalid edit is logged and ignored, so the last good profiles stay
+    active until the file is fixed.
+    """
+
+    def __init__(self, path: Optional[str] = None, check_interval: float = 1.0):
+        Config.load()
+        self.path = path or Config.PROFILES_PATH
+        self.check_interval = check_interval
+        self._lock = threading.Lock()
+        self._profiles = parse_profiles({})
+        self._mtime: Optional[float] = None
+        self._last_check = 0.0
+        self._reload_if_changed(force=True)
+
+    def _reload_if_changed(self, force: bool = False):
+        now = time.monotonic()
+        if not force and now - self._last_check < self.check_interval:
+            return
+
+        with self._lock:
+            self._last_check = now
+            try:
+                mtime = os.stat(self.path).st_mtime
+            except FileNotFoundError:
+                return
+            if mtime == self._mtime:
+                return
+
+            # Recorded first so a bad edit is reported once, not on every get()
+            self._mtime = mtime
+            try:
+                with open(self.path, encoding="utf-8") as f:
+                    self._profiles = parse_profiles(json.load(f))
+                logger.info("Loaded generation profiles from %s", self.path)
+            except Exception as e:
+                logger.error("Ignoring invalid profile file %s: %s", self.path, e)
+
+    def get(self, content_type: str, platform: Optional[str] = None) -> GenerationProfile:
+        """Most specific profile for a content type and optional platform"""
+        self._reload_if_changed()
+        profiles = self._profiles
+        return (
+            profiles.get((content_type, platform))
+            or profiles.get((content_type, None))
+            or profiles[("default", None)]
+        )
@@ -0,0 +1,293 @@
+"""
+Fair-share scheduler in front of the LLM API
+Requests wait in priority lanes (interactive > api > batch). Within a lane,
+clients share capacity by weighted fair queuing, and every request must fit
+in a global concurrency limit and a tokens-per-minute budget. A few slots and
+a share of the token budget are held back from the api and batch lanes, so a
+background backlog can never leave a new interactive request waiting behind it.
+"""
+
+import itertools
+import threading
+import time
+from collections import defaultdict, deque
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Dict, Iterator, Optional
+
+from config import Config
+
+# Lanes in strict priority order
+LANES = ("interactive", "api", "batch")
+
+# Wait samples kept per lane for percentile metrics
+WAIT_SAMPLES = 1000
+
+# Smoothing factor for the moving average of slot hold times
+SERVICE_TIME_ALPHA = 0.2
+
+
+class SchedulerTimeout(Exception):
+    """Raised when a request could not be admitted within its timeout"""
+
+
+@dataclass
+class _Ticket:
+    lane: str
+    client: str
+    tokens: int
+    finish_tag: float
+    seq: int
+    enqueued_at: float = field(default_factory=time.monotonic)
+    granted: bool = False
+
+
+class FairScheduler:
+    """Priority lanes with weighted fair queuing and global capacity limits"""
+
+    def __init__(
+        self,
+        max_concurrency: int = 4,
+        tokens_per_minute: Optional[int] = None,
+        client_weights: Optional[Dict[str, float]] = None,
+        interactive_slots: int = 1,
+        interactive_token_share: float = 0.1,
+    ):
+        """
+        Args:
+            interactive_slots: Slots only the interactive lane may use (at least
+                one slot is always left to the other lanes)
+            interactive_token_share: Fraction of the token budget the other lanes
+                must leave in the bucket
+        """
+        self.max_concurrency = max_concurrency
+        self.tokens_per_minute = tokens_per_minute or None
+        self.client_weights = client_weights or {}
+        self.interactive_slots = max(0, min(interactive_slots, max_concurrency - 1))
+        self._token_reserve = (self.tokens_per_minute or 0) * min(
+            max(interactive_token_share, 0.0), 1.0
+        )
+
+        self._cond = threading.Condition()
+        self._waiting: Dict[str, list] = {lane: [] for lane in LANES}
+        self._in_flight = 0
+        self._seq = itertools.count()
+
+        # Weighted fair queuing state: per-lane virtual clock and per-client last finish tag
+        self._virtual_time: Dict[str, float] = defaultdict(float)
+        self._last_finish: Dict[tuple, float] = defaultdict(float)
+
+        # Token bucket refilled continuously at tokens_per_minute
+        self._bucket = float(self.tokens_per_minute or 0)
+        self._refilled_at = time.monotonic()
+
+        self._waits: Dict[str, deque] = {lane: deque(maxlen=WAIT_SAMPLES) for lane in LANES}
+        self._admitted: Dict[str, int] = defaultdict(int)
+        self._service_time: Optional[float] = None
+
+    def _refill_locked(self):
+        if self.tokens_per_minute is None:
+            return
+        now = time.monotonic()
+        self._bucket = min(
+            float(self.tokens_per_minute),
+            self._bucket + (now - self._refilled_at) * self.tokens_per_minute / 60,
+        )
+        self._refilled_at = now
+
+    def _capacity(self, lane: str) -> int:
+        """Concurrent slots a lane may fill"""
+        if lane == "interactive":
+            return self.max_concurrency
+        return self.max_concurrency - self.interactive_slots
+
+    def _dispatch_locked(self) -> Optional[float]:
+        """
+        Grant slots to the best waiting tickets
+
+        Returns seconds until enough tokens refill for the next ticket, if
+        dispatch is blocked on the token budget.
+        """
+        self._refill_locked()
+        while True:
+            lane = next((lane for lane in LANES if self._waiting[lane]), None)
+            # Lower lanes have no more capacity than the first waiting one
+            if lane is None or self._in_flight >= self._capacity(lane):
+                return None
+
+            ticket = min(self._waiting[lane], key=lambda t: (t.finish_tag, t.seq))
+            if self.tokens_per_minute is not None:
+                reserve = 0.0 if lane == "interactive" else self._token_reserve
+                needed = min(ticket.tokens, self.tokens_per_minute - reserve)
+                if needed > self._bucket - reserve:
+                    return (needed + reserve - self._bucket) * 60 / self.tokens_per_minute
+                self._bucket -= needed
+
+            self._waiting[lane].remove(ticket)
+            self._virtual_time[lane] = max(self._virtual_time[lane], ticket.finish_tag)
+            self._in_flight += 1
+            ticket.granted = True
+            self._cond.notify_all()
+        return None
+
+    def acquire(
+        self,
+        lane: str = "interactive",
+        client: str = "anonymous",
+        estimated_tokens: int = 1,
+        timeout: Optional[float] = None,
+    ) -> float:
+        """
+        Block until the request is admitted
+
+        Returns:
+            Seconds spent waiting
+
+        Raises:
+            SchedulerTimeout: If not admitted within timeout seconds
+        """
+        if lane not in self._waiting:
+            raise ValueError(f"Unknown scheduler lane: {lane}")
+
+        with self._cond:
+            weight = self.client_weights.get(client, 1.0)
+            start_tag = max(self._virtual_time[lane], self._last_finish[(lane, client)])
+            finish_tag = start_tag + max(estimated_tokens, 1) / weight
+            self._last_finish[(lane, client)] = finish_tag
+
+            ticket = _Ticket(lane, client, estimated_tokens, finish_tag, next(self._seq))
+            self._waiting[lane].append(ticket)
+            deadline = None if timeout is None else ticket.enqueued_at + timeout
+
+            while True:
+                refill_wait = self._dispatch_locked()
+                if ticket.granted:
+                    break
+
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    self._waiting[lane].remove(ticket)
+                    raise SchedulerTimeout(f"Not admitted to '{lane}' lane within {timeout}s")
+
+                wait_for = [w for w in (refill_wait, remaining) if w is not None]
+                self._cond.wait(min(wait_for) if wait_for else None)
+
+            waited = time.monotonic() - ticket.enqueued_at
+            self._waits[lane].append(waited)
+            self._admitted[lane] += 1
+            return waited
+
+    def release(
+        self,
+        estimated_tokens: int = 0,
+        actual_tokens: Optional[int] = None,
+        held: Optional[float] = None,
+    ):
+        """Free a slot, refunding over-estimated tokens to the budget
+
+        ``held`` (seconds the slot was in use) feeds the service-time
+        average behind expected-wait estimates.
+        """
+        with self._cond:
+            self._in_flight -= 1
+            if held is not None:
+                self._service_time = (
+                    held
+                    if self._service_time is None
+                    else SERVICE_TIME_ALPHA * held + (1 - SERVICE_TIME_ALPHA) * self._service_time
+                )
+            if self.tokens_per_minute is not None and actual_tokens is not None:
+                self._refill_locked()
+                self._bucket = min(
+                    float(self.tokens_per_minute),
+                    self._bucket + max(0, estimated_tokens - actual_tokens),
+                )
+            self._dispatch_locked()
+            self._cond.notify_all()
+
+    @contextmanager
+    def slot(
+        self,
+        lane: str = "interactive",
+        client: str = "anonymous",
+        estimated_tokens: int = 1,
+        timeout: Optional[float] = None,
+    ) -> Iterator[Dict[str, any]]:
+        """
+        Hold a scheduler slot for the enclosed API call
+
+        Yields a dict with "waited"; set "actual_tokens" on it to refund the
+        unused part of the estimate.
+        """
+        waited = self.acquire(lane, client, estimated_tokens, timeout)
+        usage = {"waited": waited, "actual_tokens": None}
+        granted_at = time.monotonic()
+        try:
+            yield usage
+        finally:
+            self.release(estimated_tokens, usage["actual_tokens"], time.monotonic() - granted_at)
+
+    def load(self, lane: str = "interactive") -> Dict[str, any]:
+        """
+        Pressure as seen by a new request in ``lane``
+
+        Only lanes of equal or higher priority count, since lower ones never
+        delay it. ``expected_wait`` assumes everything ahead is served at the
+        recent average slot hold time.
+        """
+        with self._cond:
+            ahead = [t for name in LANES[: LANES.index(lane) + 1] for t in self._waiting[name]]
+            now = time.monotonic()
+            oldest_wait = max((now - t.enqueued_at for t in ahead), default=0.0)
+            capacity = self._capacity(lane)
+            expected_wait = 0.0
+            if self._in_flight >= capacity and self._service_time is not None:
+                expected_wait = (len(ahead) + 1) * self._service_time / capacity
+            return {
+                "in_flight": self._in_flight,
+                "waiting": len(ahead),
+                "oldest_wait": oldest_wait,
+                "expected_wait": expected_wait,
+                "service_time": self._service_time,
+            }
+
+    def metrics(self) -> Dict[str, any]:
+        """Queue depth, admissions and wait percentiles per lane"""
+        with self._cond:
+            lanes = {}
+            for lane in LANES:
+                waits = sorted(self._waits[lane])
+                lanes[lane] = {
+                    "waiting": len(self._waiting[lane]),
+                    "admitted": self._admitted[lane],
+                    "wait_p50": waits[len(waits) // 2] if waits else 0.0,
+                    "wait_p95": waits[int(len(waits) * 0.95)] if waits else 0.0,
+                    "wait_max": waits[-1] if waits else 0.0,
+                }
+            return {
+                "in_flight": self._in_flight,
+                "max_concurrency": self.max_concurrency,
+                "interactive_slots": self.interactive_slots,
+                "service_time": self._service_time,
+                "token_budget": None if self.tokens_per_minute is None else int(self._bucket),
+                "lanes": lanes,
+            }
+
+
+_default_scheduler: Optional[FairScheduler] = None
+_default_lock = threading.Lock()
+
+
+def get_scheduler() -> FairScheduler:
+    """Process-wide scheduler shared by every ContentGenerator"""
+    global _default_scheduler
+    with _default_lock:
+        if _default_scheduler is None:
+            Config.load()
+            _default_scheduler = FairScheduler(
+                max_concurrency=Config.SCHEDULER_MAX_CONCURRENCY,
+                tokens_per_minute=Config.SCHEDULER_TOKENS_PER_MINUTE,
+                interactive_slots=Config.SCHEDULER_INTERACTIVE_SLOTS,
+                interactive_token_share=Config.SCHEDULER_INTERACTIVE_TOKEN_SHARE,
+            )
+        return _default_scheduler
@@ -0,0 +1,284 @@
+"""
+SEO and readability scoring of generated content
+Text is reduced to a few counts per document (words, sentences, syllables,
+headings, keyword hits) with regex passes; every metric is then computed for
+all documents at once with NumPy, so batch outputs are scored in bulk.
+Scores are cached per content hash.
+"""
+
+import hashlib
+import re
+import threading
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional, Sequence
+
+WORD = re.compile(r"[A-Za-z0-9][A-Za-z0-9'’-]*")
+SENTENCE_SPLIT = re.compile(r"(?<=[.!?])\s+|\n+")
+PARAGRAPH_SPLIT = re.compile(r"\n\s*\n")
+HEADING = re.compile(r"^(#{1,6})\s+(.+)$", re.MULTILINE)
+VOWEL_GROUP = re.compile(r"[aeiouy]+")
+SILENT_E = re.compile(r"[^aeiouy\W]e\b")
+
+# Sentences and paragraphs longer than this many words count as long
+LONG_SENTENCE_WORDS = 25
+LONG_PARAGRAPH_WORDS = 100
+
+# Keyword density (keyword words / all words) considered natural
+DENSITY_RANGE = (0.005, 0.025)
+
+# Weights of the overall 0-100 SEO score; keyword parts are dropped when no keywords are given
+SCORE_WEIGHTS = {
+    "keyword_coverage": 30,
+    "keyword_density": 20,
+    "headings": 20,
+    "readability": 15,
+    "sentence_length": 15,
+}
+
+SCORE_FIELDS = (
+    "words",
+    "sentences",
+    "paragraphs",
+    "avg_sentence_words",
+    "long_sentence_ratio",
+    "avg_paragraph_words",
+    "long_paragraph_ratio",
+    "reading_ease",
+    "grade_level",
+    "headings",
+    "h1",
+    "subheadings",
+    "heading_skips",
+    "keyword_coverage",
+    "keyword_density",
+    "keywords_in_headings",
+    "seo_score",
+)
+
+
+def parse_keywords(keywords: Optional[str]) -> List[str]:
+    """Split a comma-separated keyword string into lower-cased keywords"""
+    if not keywords:
+        return []
+    return list(dict.fromkeys(k.strip().lower() for k in keywords.split(",") if k.strip()))
+
+
+def _counts(text: str, keywords: List[str]):
+    """
+    Per-document counts; the only part of scoring that walks the text
+
+    Returns:
+        ((words, body syllables, H1s, subheadings, heading level skips),
+        words per body sentence, words per body paragraph,
+        hits per keyword, whether each keyword appears in a heading)
+    """
+    headings = HEADING.findall(text)
+    levels = [len(marks) for marks, _ in headings]
+    skips = sum(1 for prev, level in zip(levels, levels[1:]) if level > prev + 1)
+    heading_text = " ".join(title for _, title in headings).lower()
+
+    # Readability is measured on the body, without heading lines
+    body = HEADING.sub("", text)
+    body_lower = body.lower()
+    sentence_words = [n for n in map(len, map(WORD.findall, SENTENCE_SPLIT.split(body))) if n]
+    paragraph_words = [n for n in map(len, map(WORD.findall, PARAGRAPH_SPLIT.split(body))) if n]
+    syllables = len(VOWEL_GROUP.findall(body_lower)) - len(SILENT_E.findall(body_lower))
+
+    lower = text.lower()
+    hits = [len(re.findall(rf"\b{re.escape(k)}\b", lower)) for k in keywords]
+    in_headings = [k in heading_text for k in keywords]
+    h1 = levels.count(1)
+    return (
+        (len(WORD.findall(text)), syllables, h1, len(levels) - h1, skips),
+        sentence_words,
+        paragraph_words,
+        hits,
+        in_headings,
+    )
+
+
+def score_texts(
+    texts: Sequence[str], keywords: Optional[Sequence[Optional[str]]] = None
+) -> Dict[str, any]:
+    """
+    Score many documents at once
+
+    Args:
+        texts: Documents to score
+        keywords: Comma-separated target keywords per document (or None)
+
+    Returns:
+        Dict of SCORE_FIELDS -> NumPy array with one value per document; keyword
+        metrics are NaN for documents without keywords
+    """
+    import numpy as np
+
+    n = len(texts)
+    keywords = keywords if keywords is not None else [None] * n
+    keyword_lists = [parse_keywords(k) for k in keywords]
+
+    doc_counts = []
+    sentence_lengths, sentence_doc = [], []
+    paragraph_lengths, paragraph_doc = [], []
+    hits, hits_in_headings, keyword_words, keyword_doc = [], [], [], []
+    for index, (text, keyword_list) in enumerate(zip(texts, keyword_lists)):
+        counts, sentences, paragraphs, doc_hits, in_headings = _counts(text or "", keyword_list)
+        doc_counts.append(counts)
+        sentence_lengths += sentences
+        sentence_doc += [index] * len(sentences)
+        paragraph_lengths += paragraphs
+        paragraph_doc += [index] * len(paragraphs)
+        hits += doc_hits
+        hits_in_headings += in_headings
+        keyword_words += [len(k.split()) for k in keyword_list]
+        keyword_doc += [index] * len(keyword_list)
+
+    words, syllables, h1, subheadings, skips = np.array(doc_counts, dtype=float).reshape(n, 5).T
+    sentence_lengths = np.array(sentence_lengths, dtype=float)
+    sentence_doc = np.array(sentence_doc, dtype=int)
+    paragraph_lengths = np.array(paragraph_lengths, dtype=float)
+    paragraph_doc = np.array(paragraph_doc, dtype=int)
+
+    def per_doc(doc_index, values=None):
+        return np.bincount(doc_index, weights=values, minlength=n).astype(float)
+
+    def ratio(numerator, denominator, empty=0.0):
+        return np.divide(numerator, denominator, out=np.full(n, empty), where=denominator > 0)
+
+    sentences = per_doc(sentence_doc)
+    paragraphs = per_doc(paragraph_doc)
+    body_words = per_doc(sentence_doc, sentence_lengths)
+    words_per_sentence = ratio(body_words, sentences)
+    syllables_per_word = np.maximum(ratio(syllables, body_words), 1.0)
+    scores = {
+        "words": words,
+        "sentences": sentences,
+        "paragraphs": paragraphs,
+        "avg_sentence_words": words_per_sentence,
+        "long_sentence_ratio": ratio(
+            per_doc(sentence_doc, sentence_lengths > LONG_SENTENCE_WORDS), sentences
+        ),
+        "avg_paragraph_words": ratio(per_doc(paragraph_doc, paragraph_lengths), paragraphs),
+        "long_paragraph_ratio": ratio(
+            per_doc(paragraph_doc, paragraph_lengths > LONG_PARAGRAPH_WORDS), paragraphs
+        ),
+        # Flesch reading ease and Flesch-Kincaid grade level
+        "reading_ease": np.where(
+            body_words > 0, 206.835 - 1.015 * words_per_sentence - 84.6 * syllables_per_word, 0.0
+        ),
+        "grade_level": np.where(
+            body_words > 0, 0.39 * words_per_sentence + 11.8 * syllables_per_word - 15.59, 0.0
+        ),
+        "headings": h1 + subheadings,
+        "h1": h1,
+        "subheadings": subheadings,
+        "heading_skips": skips,
+    }
+
+    keyword_doc = np.array(keyword_doc, dtype=int)
+    keyword_count = per_doc(keyword_doc)
+    hits = np.array(hits, dtype=float)
+    scores["keyword_coverage"] = ratio(per_doc(keyword_doc, hits > 0), keyword_count, np.nan)
+    scores["keyword_density"] = np.where(
+        keyword_count > 0,
+        ratio(per_doc(keyword_doc, hits * np.array(keyword_words, dtype=float)), words),
+        np.nan,
+    )
+    scores["keywords_in_headings"] = ratio(
+        per_doc(keyword_doc, np.array(hits_in_headings, dtype=float)), keyword_count, np.nan
+    )
+
+    # Each component is scaled to 0-1 before weighting
+    low, high = DENSITY_RANGE
+    density = scores["keyword_density"]
+    components = {
+        "keyword_coverage": scores["keyword_coverage"],
+        "keyword_density": np.clip(np.minimum(density / low, 1 - (density - high) / high), 0, 1),
+        "headings": np.mean([h1 == 1, subheadings >= 2, skips == 0], axis=0),
+        "readability": np.clip(scores["reading_ease"] / 60, 0, 1),
+        "sentence_length": np.clip(1 - (scores["long_sentence_ratio"] - 0.1) / 0.4, 0, 1),
+    }
+    total = np.zeros(n)
+    weight = np.zeros(n)
+    for name, value in components.items():
+        present = ~np.isnan(value)
+        total += np.where(present, value, 0) * SCORE_WEIGHTS[name]
+        weight += present * SCORE_WEIGHTS[name]
+    scores["seo_score"] = np.round(100 * ratio(total, weight), 1)
+    return scores
+
+
+class ScoreCache:
+    """Thread-safe LRU of score dicts keyed by content and keyword hash"""
+
+    def __init__(self, max_entries: int = 10000):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Dict[str, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(text: str, keywords: Optional[str]) -> str:
+        keyword_key = ",".join(parse_keywords(keywords))
+        return hashlib.sha256(f"{keyword_key}\x00{text}".encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[Dict[str, float]]:
+        with self._lock:
+            scores = self._entries.get(key)
+            if scores is not None:
+                self._entries.move_to_end(key)
+            return scores
+
+    def set(self, key: str, scores: Dict[str, float]):
+        with self._lock:
+            self._entries[key] = scores
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+
+_cache = ScoreCache()
+
+
+def score_many(
+    texts: Sequence[str], keywords: Optional[Sequence[Optional[str]]] = None
+) -> List[Dict[str, Optional[float]]]:
+    """
+    Score documents as JSON-friendly dicts, computing only uncached ones
+
+    Keyword metrics are None for documents without keywords.
+    """
+    keywords = keywords if keywords is not None else [None] * len(texts)
+    keys = [ScoreCache.make_key(text or "", kw) for text, kw in zip(texts, keywords)]
+    results = [_cache.get(key) for key in keys]
+
+    missing = [index for index, scores in enumerate(results) if scores is None]
+    if missing:
+        arrays = score_texts([texts[i] for i in missing], [keywords[i] for i in missing])
+        for row, index in enumerate(missing):
+            scores = {}
+            for name in SCORE_FIELDS:
+                value = float(arrays[name][row])
+                scores[name] = None if value != value else round(value, 4)
+            _cache.set(keys[index], scores)
+            results[index] = scores
+    return [dict(scores) for scores in results]
+
+
+def score_content(text: str, keywords: Optional[str] = None) -> Dict[str, Optional[float]]:
+    """Score one document (cached per content hash)"""
+    return score_many([text], [keywords])[0]
+
+
+def score_results(results: Iterable[Dict[str, any]]) -> List[Dict[str, any]]:
+    """
+    Attach "scores" to successful generation results that lack them
+
+    Target keywords come from the result's parameters (blog posts, campaigns).
+    """
+    results = list(results)
+    pending = [r for r in results if r.get("content") and "scores" not in r]
+    if pending:
+        keywords = [(r.get("parameters") or {}).get("keywords") for r in pending]
+        for result, scores in zip(pending, score_many([r["content"] for r in pending], keywords)):
+            result["scores"] = scores
+    return results
@@ -0,0 +1,259 @@
+"""
+Structured (JSON) output mode
+Templates with a fixed layout can be requested as JSON and validated into
+compact typed results instead of regex-parsing free text. Malformed JSON is
+repaired locally (code fences, trailing commas, truncation) before falling
+back to a short repair call.
+"""
+
+import json
+import re
+from dataclasses import dataclass, fields, is_dataclass
+from typing import Callable, Dict, Tuple, Type, get_args, get_origin, get_type_hints
+
+from src.prompts.templates import PromptTemplates
+
+
+class StructuredOutputError(ValueError):
+    """Raised when output cannot be parsed or does not match the schema"""
+
+
+@dataclass(slots=True, frozen=True)
+class AdVariation:
+    """One A/B/C ad variation"""
+
+    headline: str
+    body: str
+    cta: str
+    usp: str
+
+
+@dataclass(slots=True, frozen=True)
+class AdCopyResult:
+    """Three ad variations"""
+
+    variations: Tuple[AdVariation, ...]
+
+    def to_text(self) -> str:
+        blocks = []
+        for letter, variation in zip("ABCDEFGH", self.variations):
+            blocks.append(
+                f"VARIATION {letter}:\nHeadline: {variation.headline}\nBody: {variation.body}\n"
+                f"CTA: {variation.cta}\nUSP: {variation.usp}"
+            )
+        return "\n\n".join(blocks)
+
+
+@dataclass(slots=True, frozen=True)
+class EmailResult:
+    """Email with the sections the email template asks for"""
+
+    subject: str
+    preview: str
+    body: str
+    cta: str
+    ps: str
+
+    def to_text(self) -> str:
+        return (
+            f"Subject Line: {self.subject}\nPreview Text: {self.preview}\n\n{self.body}\n\n"
+            f"CTA Button: {self.cta}\n\nP.S. {self.ps}"
+        )
+
+
+@dataclass(slots=True, frozen=True)
+class LandingPageResult:
+    """Landing page copy, one field per template section"""
+
+    headline: str
+    subheadline: str
+    primary_cta: str
+    problem: str
+    solution: str
+    benefits: Tuple[str, ...]
+    testimonial: str
+    urgency: str
+    final_cta: str
+    risk_reversal: str
+
+    def to_text(self) -> str:
+        benefits = "\n".join(f"- {benefit}" for benefit in self.benefits)
+        return (
+            f"HERO SECTION:\n{self.headline}\n{self.subheadline}\nCTA: {self.primary_cta}\n\n"
+            f"PROBLEM STATEMENT:\n{self.problem}\n\nSOLUTION:\n{self.solution}\n\n"
+            f"KEY BENEFITS:\n{benefits}\n\nSOCIAL PROOF:\n{self.testimonial}\n\n"
+            f"FINAL CTA SECTION:\n{self.urgency}\nCTA: {self.final_cta}\n{self.risk_reversal}"
+        )
+
+
+@dataclass(slots=True, frozen=True)
+class SocialPostResult:
+    """Post text with hashtags kept separate"""
+
+    text: str
+    hashtags: Tuple[str, ...]
+
+    def to_text(self) -> str:
+        if not self.hashtags:
+            return self.text
+        return self.text + "\n\n" + " ".join("#" + tag.lstrip("#") for tag in self.hashtags)
+
+
+# Content type -> (result type, prompt template)
+STRUCTURED_TYPES: Dict[str, Tuple[Type, Callable[..., str]]] = {
+    "ad_copy": (AdCopyResult, PromptTemplates.ad_copy),
+    "email": (EmailResult, PromptTemplates.email_template),
+    "landing_page": (LandingPageResult, PromptTemplates.landing_page_copy),
+    "social_post": (SocialPostResult, PromptTemplates.social_media_post),
+}
+
+# Key spellings models commonly use instead of the field name
+KEY_ALIASES = {
+    "subject_line": "subject",
+    "preview_text": "preview",
+    "call_to_action": "cta",
+    "cta_button": "cta",
+    "p_s": "ps",
+    "postscript": "ps",
+    "body_copy": "body",
+    "unique_selling_proposition": "usp",
+    "sub_headline": "subheadline",
+    "cta_button_text": "primary_cta",
+    "key_benefits": "benefits",
+    "social_proof": "testimonial",
+    "guarantee": "risk_reversal",
+    "post": "text",
+    "content": "text",
+}
+
+
+def _normalize_key(key: str) -> str:
+    key = re.sub(r"[\s\-.]+", "_", key.strip().lower()).strip("_")
+    return KEY_ALIASES.get(key, key)
+
+
+def json_schema(result_type: Type) -> Dict[str, any]:
+    """JSON schema for a result dataclass (strings, tuples and nested results)"""
+    properties = {}
+    for name, hint in get_type_hints(result_type).items():
+        if get_origin(hint) is tuple:
+            item = get_args(hint)[0]
+            items = json_schema(item) if is_dataclass(item) else {"type": "string"}
+            properties[name] = {"type": "array", "items": items}
+        else:
+            properties[name] = {"type": "string"}
+    return {
+        "type": "object",
+        "properties": properties,
+        "required": list(properties),
+        "additionalProperties": False,
+    }
+
+
+def from_dict(result_type: Type, data: Dict[str, any]):
+    """Build a result dataclass, checking every field's presence and type"""
+    if not isinstance(data, dict):
+        raise StructuredOutputError(f"{result_type.__name__}: expected an object")
+    data = {_normalize_key(key): value for key, value in data.items()}
+    hints = get_type_hints(result_type)
+
+    values = {}
+    for spec in fields(result_type):
+        if spec.name not in data:
+            raise StructuredOutputError(f"{result_type.__name__}: missing '{spec.name}'")
+        value = data[spec.name]
+        hint = hints[spec.name]
+        if get_origin(hint) is tuple:
+            item = get_args(hint)[0]
+            if isinstance(value, str) and item is str:
+                value = [line.strip(" -•*") for line in value.splitlines() if line.strip()]
+            if not isinstance(value, list) or not value:
+                raise StructuredOutputError(
+                    f"{result_type.__name__}: '{spec.name}' must be a non-empty list"
+                )
+            if item is str:
+                value = tuple(str(element).strip() for element in value)
+            else:
+                value = tuple(from_dict(item, element) for element in value)
+        elif isinstance(value, (int, float)):
+            value = str(value)
+        elif not isinstance(value, str) or not value.strip():
+            raise StructuredOutputError(
+                f"{result_type.__name__}: '{spec.name}' must be a non-empty string"
+            )
+        else:
+            value = value.strip()
+        values[spec.name] = value
+    return result_type(**values)
+
+
+def _close_truncated(text: str) -> str:
+    """Close strings, arrays and objects left open by a cut-off response"""
+    stack = []
+    in_string = escaped = False
+    for char in text:
+        if in_string:
+            if escaped:
+                escaped = False
+            elif char == "\\":
+                escaped = True
+            elif char == '"':
+                in_string = False
+        elif char == '"':
+            in_string = True
+        elif char in "{[":
+            stack.append("}" if char == "{" else "]")
+        elif char in "}]" and stack:
+            stack.pop()
+
+    if in_string:
+        text += '"'
+    text = re.sub(r"[,:\s]+$", "", text)
+    if stack and stack[-1] == "}":
+        # A dangling key without a value cannot be completed; drop it
+        text = re.sub(r'[,{]\s*"[^"]*"$', lambda m: m.group(0)[0].strip(","), text)
+    return text + "".join(reversed(stack))
+
+
+def repair_json(text: str) -> Dict[str, any]:
+    """
+    Parse model output as JSON, fixing common defects without another call
+
+    Handles markdown fences, prose around the object, trailing commas and
+    output truncated mid-object.
+    """
+    text = (text or "").strip()
+    fenced = re.search(r"```(?:json)?\s*(.*?)(?:```|$)", text, re.S)
+    if fenced:
+        text = fenced.group(1).strip()
+
+    start = text.find("{")
+    if start == -1:
+        raise StructuredOutputError("no JSON object in output")
+    end = text.rfind("}")
+    candidates = [text[start : end + 1]] if end > start else []
+    candidates.append(text[start:])
+
+    for candidate in candidates:
+        candidate = re.sub(r",(\s*[}\]])", r"\1", candidate)
+        for attempt in (candidate, _close_truncated(candidate)):
+            try:
+                return json.loads(attempt)
+            except json.JSONDecodeError:
+                continue
+    raise StructuredOutputError("output is not valid JSON")
+
+
+def parse_structured(content_type: str, text: str) -> Tuple[any, bool]:
+    """
+    Validate output into the content type's result object
+
+    Returns:
+        (result object, whether local repair was needed)
+    """
+    result_type = STRUCTURED_TYPES[content_type][0]
+    try:
+        data, repaired = json.loads(text), False
+    except (json.JSONDecodeError, TypeError):
+        data, repaired = repair_json(text), True
+    return from_dict(result_type, data), repaired
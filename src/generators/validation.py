@@ -0,0 +1,203 @@
+"""
+Section-level validation of generated content
+Parses output into the sections PromptTemplates asks for, flags missing or
+invalid ones, and merges targeted regenerations back into the original text.
+"""
+
+import re
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+
+@dataclass(frozen=True)
+class SectionSpec:
+    """A section a template requires"""
+
+    name: str
+    heading: str  # regex matching the start of the section's first line
+    label: str  # heading the regenerated section must start with
+    description: str  # what the section should contain, used in repair prompts
+    inline: bool = False  # value lives on the heading line (e.g. "Subject: ...")
+    max_chars: Optional[int] = None
+
+
+# Sections mirror what PromptTemplates asks for: the email template only
+# labels its subject, preview and P.S. lines (the CTA is free text in the
+# body), while every landing page section is a heading of its own.
+SECTION_SPECS: Dict[str, Tuple[SectionSpec, ...]] = {
+    "email": (
+        SectionSpec(
+            "subject",
+            r"subject(?:\s+line)?\s*:",
+            "Subject Line:",
+            "a compelling subject line of at most 50 characters",
+            inline=True,
+            max_chars=50,
+        ),
+        SectionSpec(
+            "preview",
+            r"preview(?:\s+text)?\s*:",
+            "Preview Text:",
+            "one line of preview text supporting the subject line",
+            inline=True,
+        ),
+        SectionSpec(
+            "ps",
+            r"p\.\s?s\.?",
+            "P.S.",
+            "a P.S. line adding an extra incentive or urgency",
+            inline=True,
+        ),
+    ),
+    "landing_page": (
+        SectionSpec(
+            "hero",
+            r"hero(?:\s+section)?",
+            "HERO SECTION:",
+            "a benefit-driven headline, a supporting subheadline and primary CTA button text",
+        ),
+        SectionSpec(
+            "problem",
+            r"problem(?:\s+statement)?",
+            "PROBLEM STATEMENT:",
+            "2-3 sentences identifying the audience's pain point",
+        ),
+        SectionSpec(
+            "solution",
+            r"(?:the\s+)?solution",
+            "SOLUTION:",
+            "3-4 sentences on how the offer solves the problem",
+        ),
+        SectionSpec(
+            "benefits",
+            r"key\s+benefits|benefits",
+            "KEY BENEFITS:",
+            "3-5 bullet points of concrete benefits",
+        ),
+        SectionSpec(
+            "social_proof",
+            r"social\s+proof|testimonials?",
+            "SOCIAL PROOF:",
+            "a realistic testimonial quote with attribution",
+        ),
+        SectionSpec(
+            "final_cta",
+            r"final\s+cta(?:\s+section)?|final\s+call[\s-]to[\s-]action",
+            "FINAL CTA SECTION:",
+            "an urgency statement, CTA button text and a risk reversal (guarantee or trial)",
+        ),
+    ),
+}
+
+# Leading list numbers, markdown headings/bold and bullets before a heading
+HEADING_PREFIX = r"^[ \t#>*_\-]*(?:\d+[.)]\s*)?[*_]*\s*"
+
+# What may follow a block heading: an echoed "(3-5 bullet points)", closing
+# emphasis, then a colon or the end of the line. Prose that merely starts
+# with "Problem" or "Benefits" does not match.
+HEADING_SUFFIX = r"(?:[ \t]*\([^)\n]*\))?[ \t]*[*_]*[ \t]*(?::|$)"
+
+
+@dataclass
+class ParsedSection:
+    """Location and content of a section in the generated text"""
+
+    name: str
+    start: int
+    end: int
+    value: str
+
+
+@dataclass
+class ValidationReport:
+    """Result of validating one piece of content"""
+
+    content_type: str
+    sections: Dict[str, ParsedSection] = field(default_factory=dict)
+    issues: Dict[str, str] = field(default_factory=dict)
+
+    @property
+    def valid(self) -> bool:
+        return not self.issues
+
+
+def _spec(content_type: str, name: str) -> SectionSpec:
+    return next(spec for spec in SECTION_SPECS[content_type] if spec.name == name)
+
+
+def parse_sections(content_type: str, text: str) -> Dict[str, ParsedSection]:
+    """Locate each required section; a section runs until the next one starts"""
+    found = []
+    for spec in SECTION_SPECS.get(content_type, ()):
+        pattern = HEADING_PREFIX + f"(?:{spec.heading})"
+        if not spec.inline:
+            pattern += HEADING_SUFFIX
+        match = re.search(pattern, text, re.I | re.M)
+        if match:
+            found.append((match.start(), match.end(), spec))
+
+    found.sort(key=lambda item: item[0])
+    sections = {}
+    for index, (start, heading_end, spec) in enumerate(found):
+        end = found[index + 1][0] if index + 1 < len(found) else len(text)
+        if spec.inline:
+            line_end = text.find("\n", heading_end)
+            line_end = end if line_end == -1 else min(line_end, end)
+            value = text[heading_end:line_end]
+            if not value.strip("*_\"' \t") and line_end < end:
+                # Value placed on the line after the heading
+                next_end = text.find("\n", line_end + 1)
+                line_end = end if next_end == -1 else min(next_end, end)
+                value = text[heading_end:line_end]
+            if spec.name != "ps":
+                end = line_end
+        else:
+            value = text[heading_end:end]
+        value = value.strip().strip("*_\"' ").strip()
+        sections[spec.name] = ParsedSection(spec.name, start, end, value)
+    return sections
+
+
+def validate_content(content_type: str, text: str) -> ValidationReport:
+    """Flag missing, empty or over-long sections"""
+    report = ValidationReport(content_type, parse_sections(content_type, text or ""))
+
+    for spec in SECTION_SPECS.get(content_type, ()):
+        section = report.sections.get(spec.name)
+        if section is None:
+            report.issues[spec.name] = "missing"
+        elif not section.value:
+            report.issues[spec.name] = "empty"
+        elif spec.max_chars is not None and len(section.value) > spec.max_chars:
+            length = len(section.value)
+            report.issues[spec.name] = f"too long ({length} > {spec.max_chars} characters)"
+    return report
+
+
+def merge_section(content_type: str, text: str, name: str, replacement: str) -> str:
+    """
+    Splice a regenerated section into the text
+
+    An existing section is replaced in place; a missing one is inserted before
+    the next required section that is present, or appended at the end.
+    """
+    replacement = replacement.strip()
+    sections = parse_sections(content_type, text)
+
+    if name in sections:
+        section = sections[name]
+        tail = text[section.end :]
+        separator = "" if not tail or tail.startswith("\n") else "\n"
+        return text[: section.start] + replacement + separator + tail
+
+    names = [spec.name for spec in SECTION_SPECS[content_type]]
+    for later in names[names.index(name) + 1 :]:
+        if later in sections:
+            position = sections[later].start
+            return text[:position] + replacement + "\n\n" + text[position:]
+    return text.rstrip() + "\n\n" + replacement
+
+
+def sections_to_repair(report: ValidationReport) -> List[Tuple[SectionSpec, str]]:
+    """Specs and problems for every flagged section, in template order"""
+    return [(_spec(report.content_type, name), problem) for name, problem in report.issues.items()]
@@ -0,0 +1,194 @@
+"""
+Cache warmer for predictable traffic
+Expands a manifest of topic x tone x platform/content-type combinations and
+pre-generates them off-peak into the shared response store:
+
+    python -m src.generators.warmer --manifest cache_manifest.json --rpm 20 --window 01:00-06:00
+"""
+
+import argparse
+import itertools
+import json
+import logging
+import time
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from datetime import time as dt_time
+from typing import Dict, List, Optional, Tuple
+
+from config import Config
+from src.utils.request_context import request_scope
+
+logger = logging.getLogger(__name__)
+
+# Content type -> ContentGenerator method and its parameters
+CONTENT_METHODS = {
+    "blog_post": ("generate_blog_post", ("topic", "keywords", "tone", "word_count")),
+    "social_post": ("generate_social_post", ("topic", "platform", "tone")),
+    "ad_copy": ("generate_ad_copy", ("product", "target_audience", "tone")),
+    "email": ("generate_email", ("purpose", "audience", "tone")),
+    "landing_page": ("generate_landing_page", ("offer", "target_audience", "tone")),
+    "product_description": ("generate_product_description", ("product_name", "features", "tone")),
+}
+
+
+@dataclass
+class WarmReport:
+    """Outcome of one warming pass"""
+
+    total: int = 0
+    uncacheable: int = 0
+    already_cached: int = 0
+    generated: int = 0
+    failed: int = 0
+    remaining: int = 0
+    coverage_before: float = 0.0
+    coverage_after: float = 0.0
+    hit_rate: float = 0.0
+
+
+def expand_manifest(manifest: Dict[str, any]) -> List[Tuple[str, Dict[str, any]]]:
+    """
+    Expand manifest entries into concrete (content_type, parameters) requests
+
+    Each entry names a content_type; every parameter may be a single value or
+    a list, and lists are crossed. A missing "tone" falls back to the
+    manifest-level "tones" list.
+    """
+    requests = []
+    default_tones = manifest.get("tones", ["Professional"])
+
+    for entry in manifest.get("entries", []):
+        entry = dict(entry)
+        content_type = entry.pop("content_type")
+        if content_type not in CONTENT_METHODS:
+            raise ValueError(f"Unknown content type in manifest: {content_type}")
+        entry.setdefault("tone", default_tones)
+
+        names = CONTENT_METHODS[content_type][1]
+        missing = [name for name in names if name not in entry]
+        if missing:
+            raise ValueError(f"{content_type} entry is missing {missing}")
+
+        values = [entry[name] if isinstance(entry[name], list) else [entry[name]] for name in names]
+        for combination in itertools.product(*values):
+            requests.append((content_type, dict(zip(names, combination))))
+    return requests
+
+
+def parse_window(window: str) -> Tuple[dt_time, dt_time]:
+    """Parse an "HH:MM-HH:MM" off-peak window"""
+    start, end = window.split("-")
+    return dt_time.fromisoformat(start.strip()), dt_time.fromisoformat(end.strip())
+
+
+def in_window(window: Optional[str], now: Optional[datetime] = None) -> bool:
+    """True if now falls inside the window (which may wrap past midnight)"""
+    if not window:
+        return True
+    start, end = parse_window(window)
+    current = (now or datetime.now()).time()
+    if start <= end:
+        return start <= current < end
+    return current >= start or current < end
+
+
+class CacheWarmer:
+    """Pre-generates manifest requests through ContentGenerator under a rate budget"""
+
+    def __init__(self, generator=None, requests_per_minute: float = 20):
+        if generator is None:
+            from src.generators.content_generator import ContentGenerator
+
+            generator = ContentGenerator()
+        self.generator = generator
+        self.min_interval = 60.0 / requests_per_minute if requests_per_minute > 0 else 0.0
+        self._last_call = 0.0
+
+    def _pace(self):
+        """Sleep so API calls stay within the requests-per-minute budget"""
+        wait = self._last_call + self.min_interval - time.monotonic()
+        if wait > 0:
+            time.sleep(wait)
+        self._last_call = time.monotonic()
+
+    def _predicted_time(self, request: Tuple[str, Dict[str, any]]) -> float:
+        content_type, parameters = request
+        return self.generator.estimate(content_type, **parameters)["time"]
+
+    def warm(
+        self, requests: List[Tuple[str, Dict[str, any]]], window: Optional[str] = None
+    ) -> WarmReport:
+        """
+        Generate every uncached request, stopping early if the window closes
+
+        Runs in the batch scheduler lane so interactive traffic keeps priority,
+        but with the interactive profiles (model, backend) so the warmed cache
+        keys are the ones interactive requests look up. Requests run
+        shortest-predicted first, so as many entries as possible are warm by
+        the time the window closes.
+        """
+        report = WarmReport(total=len(requests))
+
+        with request_scope(lane="batch", profile_lane="interactive", client="cache-warmer"):
+            requests = sorted(requests, key=self._predicted_time)
+            for index, (content_type, parameters) in enumerate(requests):
+                if not in_window(window):
+                    report.remaining = len(requests) - index
+                    logger.info("Off-peak window closed; %d requests left", report.remaining)
+                    break
+
+                profile = self.generator.profiles.get(content_type, parameters.get("platform"))
+                if profile.cache_ttl <= 0:
+                    report.uncacheable += 1
+                    continue
+
+                # A cache hit returns before the API is called, so only misses are paced
+                method = getattr(self.generator, CONTENT_METHODS[content_type][0])
+                result = method(**parameters)
+
+                if result.get("cached"):
+                    report.already_cached += 1
+                    continue
+
+                self._pace()
+                if result["success"]:
+                    report.generated += 1
+                else:
+                    report.failed += 1
+                    logger.warning("Warm-up failed for %s: %s", content_type, result.get("error"))
+
+        cacheable = report.total - report.uncacheable
+        if cacheable:
+            report.coverage_before = report.already_cached / cacheable
+            report.coverage_after = (report.already_cached + report.generated) / cacheable
+        report.hit_rate = self.generator.cache.stats()["hit_rate"]
+        return report
+
+
+def main():
+    """Command-line entry point for scheduled warm-up runs"""
+    parser = argparse.ArgumentParser(description="Pre-generate common requests into the cache")
+    parser.add_argument("--manifest", default="cache_manifest.json", help="Manifest JSON path")
+    parser.add_argument("--rpm", type=float, default=20, help="Max API requests per minute")
+    parser.add_argument("--window", default=None, help="Off-peak window, e.g. 01:00-06:00")
+    parser.add_argument("--loop", action="store_true", help="Keep running every --interval")
+    parser.add_argument("--interval", type=float, default=3600, help="Seconds between passes")
+    args = parser.parse_args()
+
+    Config.setup_logging()
+    with open(args.manifest, encoding="utf-8") as f:
+        requests = expand_manifest(json.load(f))
+    warmer = CacheWarmer(requests_per_minute=args.rpm)
+
+    while True:
+        if in_window(args.window):
+            report = warmer.warm(requests, args.window)
+            print(json.dumps(asdict(report), indent=2))
+        if not args.loop:
+            break
+        time.sleep(args.interval)
+
+
+if __name__ == "__main__":
+    main()
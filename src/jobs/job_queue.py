@@ -0,0 +1,424 @@
+"""
+Durable job queue for horizontally scaled content generation
+Jobs are claimed with time-limited leases so crashed workers never lose work
+"""
+
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from abc import ABC, abstractmethod
+from contextlib import closing, contextmanager
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterator, List, Optional
+
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+# Job lifecycle states
+PENDING = "pending"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+
+
+@dataclass
+class Job:
+    """A unit of generation work stored in the queue"""
+
+    id: str
+    queue: str
+    method: str
+    params: Dict[str, any]
+    status: str = PENDING
+    attempts: int = 0
+    max_attempts: int = field(default_factory=lambda: Config.JOB_MAX_ATTEMPTS)
+    created_at: float = field(default_factory=time.time)
+    available_at: float = field(default_factory=time.time)
+    lease_owner: Optional[str] = None
+    lease_expires_at: Optional[float] = None
+    result: Optional[Dict[str, any]] = None
+    error: Optional[str] = None
+    # Predicted run time in seconds, for shortest-job-first claiming
+    cost: float = 0.0
+    deadline: Optional[float] = None
+
+
+class JobBackend(ABC):
+    """Storage interface for the job queue
+
+    Implementations must make ``claim`` atomic across processes and hosts:
+    a job may only be leased to one worker at a time. Available jobs are
+    claimed earliest-deadline first, then shortest predicted cost first;
+    jobs waiting longer than ``Config.JOB_MAX_WAIT`` jump ahead so long ones
+    are not starved.
+    """
+
+    @abstractmethod
+    def enqueue(self, job: Job) -> str:
+        """Persist a new job and return its id"""
+
+    @abstractmethod
+    def claim(self, queue: str, worker_id: str, lease_seconds: int) -> Optional[Job]:
+        """Lease the oldest available job (or an expired lease) to a worker"""
+
+    @abstractmethod
+    def heartbeat(self, job_id: str, worker_id: str, lease_seconds: int) -> bool:
+        """Extend a lease; returns False if the worker no longer owns the job"""
+
+    @abstractmethod
+    def complete(self, job_id: str, worker_id: str, result: Dict[str, any]) -> bool:
+        """Mark a leased job done; returns False if the lease was lost"""
+
+    @abstractmethod
+    def fail(self, job_id: str, worker_id: str, error: str, retry_delay: float = 0) -> bool:
+        """Record a failed attempt, re-queueing it while attempts remain"""
+
+    @abstractmethod
+    def defer(self, job_id: str, worker_id: str, delay: float, reason: str = "") -> bool:
+        """Hand a leased job back for later without counting the attempt"""
+
+    @abstractmethod
+    def get(self, job_id: str) -> Optional[Job]:
+        """Fetch a job by id"""
+
+    @abstractmethod
+    def iter_jobs(self, queue: Optional[str] = None, status: Optional[str] = None) -> Iterator[Job]:
+        """Stream jobs in creation order without loading them all at once"""
+
+    @abstractmethod
+    def stats(self) -> Dict[str, Dict[str, any]]:
+        """Per-queue depth and age metrics"""
+
+
+class SQLiteJobBackend(JobBackend):
+    """SQLite-backed job table (default backend)
+
+    Uses WAL mode and ``BEGIN IMMEDIATE`` transactions so several worker
+    processes can share one database file. For workers on many hosts, put
+    the file on storage with reliable locking or plug in a server backend.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        Config.load()
+        self.path = path or Config.JOB_DB_PATH
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._transaction() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS jobs (
+                    id TEXT PRIMARY KEY,
+                    queue TEXT NOT NULL,
+                    method TEXT NOT NULL,
+                    params TEXT NOT NULL,
+                    status TEXT NOT NULL,
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    max_attempts INTEGER NOT NULL,
+                    created_at REAL NOT NULL,
+                    available_at REAL NOT NULL,
+                    lease_owner TEXT,
+                    lease_expires_at REAL,
+                    result TEXT,
+                    error TEXT,
+                    cost REAL NOT NULL DEFAULT 0,
+                    deadline REAL
+                )
+                """
+            )
+            # Databases created before cost/deadline existed
+            columns = {row["name"] for row in conn.execute("PRAGMA table_info(jobs)")}
+            if "cost" not in columns:
+                conn.execute("ALTER TABLE jobs ADD COLUMN cost REAL NOT NULL DEFAULT 0")
+            if "deadline" not in columns:
+                conn.execute("ALTER TABLE jobs ADD COLUMN deadline REAL")
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_jobs_claim ON jobs (queue, status, available_at)"
+            )
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        """Connection that is committed on success and always closed"""
+        with closing(self._connect()) as conn, conn:
+            yield conn
+
+    @staticmethod
+    def _to_job(row: sqlite3.Row) -> Job:
+        return Job(
+            id=row["id"],
+            queue=row["queue"],
+            method=row["method"],
+            params=json.loads(row["params"]),
+            status=row["status"],
+            attempts=row["attempts"],
+            max_attempts=row["max_attempts"],
+            created_at=row["created_at"],
+            available_at=row["available_at"],
+            lease_owner=row["lease_owner"],
+            lease_expires_at=row["lease_expires_at"],
+            result=json.loads(row["result"]) if row["result"] else None,
+            error=row["error"],
+            cost=row["cost"],
+            deadline=row["deadline"],
+        )
+
+    def enqueue(self, job: Job) -> str:
+        with self._transaction() as conn:
+            conn.execute(
+                "INSERT INTO jobs (id, queue, method, params, status, attempts, max_attempts, "
+                "created_at, available_at, cost, deadline) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    job.id,
+                    job.queue,
+                    job.method,
+                    json.dumps(job.params),
+                    job.status,
+                    job.attempts,
+                    job.max_attempts,
+                    job.created_at,
+                    job.available_at,
+                    job.cost,
+                    job.deadline,
+                ),
+            )
+        return job.id
+
+    def claim(self, queue: str, worker_id: str, lease_seconds: int) -> Optional[Job]:
+        now = time.time()
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+
+            # Expired leases that have used up their attempts are dead
+            conn.execute(
+                "UPDATE jobs SET status = ?, lease_owner = NULL, error = ? "
+                "WHERE queue = ? AND status = ? AND lease_expires_at < ? "
+                "AND attempts >= max_attempts",
+                (FAILED, "lease expired on final attempt", queue, RUNNING, now),
+            )
+
+            row = conn.execute(
+                "SELECT * FROM jobs WHERE queue = ? AND ("
+                "(status = ? AND available_at <= ?) OR "
+                "(status = ? AND lease_expires_at < ?)"
+                ") ORDER BY deadline IS NULL, deadline, created_at > ?, cost, "
+                "available_at, created_at LIMIT 1",
+                (queue, PENDING, now, RUNNING, now, now - Config.JOB_MAX_WAIT),
+            ).fetchone()
+
+            if row is None:
+                conn.execute("COMMIT")
+                return None
+
+            if row["status"] == RUNNING:
+                logger.warning(
+                    "Reclaiming job %s from expired lease %s", row["id"], row["lease_owner"]
+                )
+
+            conn.execute(
+                "UPDATE jobs SET status = ?, attempts = attempts + 1, lease_owner = ?, "
+                "lease_expires_at = ? WHERE id = ?",
+                (RUNNING, worker_id, now + lease_seconds, row["id"]),
+            )
+            claimed = conn.execute("SELECT * FROM jobs WHERE id = ?", (row["id"],)).fetchone()
+            conn.execute("COMMIT")
+            return self._to_job(claimed)
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+
+    def heartbeat(self, job_id: str, worker_id: str, lease_seconds: int) -> bool:
+        with self._transaction() as conn:
+            cursor = conn.execute(
+                "UPDATE jobs SET lease_expires_at = ? "
+                "WHERE id = ? AND status = ? AND lease_owner = ?",
+                (time.time() + lease_seconds, job_id, RUNNING, worker_id),
+            )
+            return cursor.rowcount == 1
+
+    def complete(self, job_id: str, worker_id: str, result: Dict[str, any]) -> bool:
+        with self._transaction() as conn:
+            cursor = conn.execute(
+                "UPDATE jobs SET status = ?, result = ?, error = NULL, lease_owner = NULL, "
+                "lease_expires_at = NULL WHERE id = ? AND status = ? AND lease_owner = ?",
+                (DONE, json.dumps(result, default=str), job_id, RUNNING, worker_id),
+            )
+            return cursor.rowcount == 1
+
+    def fail(self, job_id: str, worker_id: str, error: str, retry_delay: float = 0) -> bool:
+        with self._transaction() as conn:
+            cursor = conn.execute(
+                "UPDATE jobs SET "
+                "status = CASE WHEN attempts >= max_attempts THEN ? ELSE ? END, "
+                "available_at = ?, error = ?, lease_owner = NULL, lease_expires_at = NULL "
+                "WHERE id = ? AND status = ? AND lease_owner = ?",
+                (FAILED, PENDING, time.time() + retry_delay, error, job_id, RUNNING, worker_id),
+            )
+            return cursor.rowcount == 1
+
+    def defer(self, job_id: str, worker_id: str, delay: float, reason: str = "") -> bool:
+        with self._transaction() as conn:
+            cursor = conn.execute(
+                "UPDATE jobs SET status = ?, attempts = attempts - 1, available_at = ?, error = ?, "
+                "lease_owner = NULL, lease_expires_at = NULL "
+                "WHERE id = ? AND status = ? AND lease_owner = ?",
+                (PENDING, time.time() + delay, reason, job_id, RUNNING, worker_id),
+            )
+            return cursor.rowcount == 1
+
+    def get(self, job_id: str) -> Optional[Job]:
+        with self._transaction() as conn:
+            row = conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return self._to_job(row) if row else None
+
+    def iter_jobs(
+        self, queue: Optional[str] = None, status: Optional[str] = None, batch_size: int = 500
+    ) -> Iterator[Job]:
+        conditions, args = [], []
+        if queue is not None:
+            conditions.append("queue = ?")
+            args.append(queue)
+        if status is not None:
+            conditions.append("status = ?")
+            args.append(status)
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+
+        conn = self._connect()
+        try:
+            cursor = conn.execute(f"SELECT * FROM jobs {where} ORDER BY created_at", args)
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                for row in rows:
+                    yield self._to_job(row)
+        finally:
+            conn.close()
+
+    def stats(self) -> Dict[str, Dict[str, any]]:
+        now = time.time()
+        with self._transaction() as conn:
+            rows = conn.execute(
+                "SELECT queue, status, COUNT(*) AS n, MIN(created_at) AS oldest "
+                "FROM jobs GROUP BY queue, status"
+            ).fetchall()
+
+        stats: Dict[str, Dict[str, any]] = {}
+        for row in rows:
+            queue_stats = stats.setdefault(
+                row["queue"],
+                {PENDING: 0, RUNNING: 0, DONE: 0, FAILED: 0, "oldest_pending_age": 0.0},
+            )
+            queue_stats[row["status"]] = row["n"]
+            if row["status"] == PENDING:
+                queue_stats["oldest_pending_age"] = round(now - row["oldest"], 3)
+
+        for queue_stats in stats.values():
+            queue_stats["depth"] = queue_stats[PENDING] + queue_stats[RUNNING]
+        return stats
+
+
+_estimating_generator = None
+_estimating_lock = threading.Lock()
+
+
+def estimate_job(method: str, params: Dict[str, any]) -> float:
+    """
+    Predicted run time of a queued call, from a process-wide ContentGenerator
+
+    Queueing never fails because of a prediction: errors give a cost of 0.
+    """
+    global _estimating_generator
+    try:
+        with _estimating_lock:
+            if _estimating_generator is None:
+                from src.generators.content_generator import ContentGenerator
+
+                _estimating_generator = ContentGenerator()
+        return _estimating_generator.estimate_job(method, params)
+    except Exception as e:
+        logger.warning("Could not estimate %s job: %s", method, e)
+        return 0.0
+
+
+class JobQueue:
+    """Named queue of ContentGenerator calls backed by a durable store"""
+
+    def __init__(
+        self,
+        name: str = "default",
+        backend: Optional[JobBackend] = None,
+        estimator: Optional[Callable[[str, Dict[str, any]], float]] = None,
+    ):
+        """
+        Args:
+            name: Queue name workers subscribe to
+            backend: Job store (SQLite by default)
+            estimator: Predicts a job's run time from (method, params); jobs run
+                shortest first. Defaults to estimate_job; pass a generator's
+                estimate_job to share its latency model
+        """
+        self.name = name
+        self.backend = backend or SQLiteJobBackend()
+        self.estimator = estimator or estimate_job
+
+    def submit(
+        self,
+        method: str,
+        max_attempts: Optional[int] = None,
+        deadline: Optional[float] = None,
+        **params,
+    ) -> str:
+        """
+        Enqueue a generation call
+
+        Args:
+            method: ContentGenerator method name, e.g. "generate_blog_post"
+            max_attempts: Attempts before the job is marked failed
+            deadline: Unix time the result is wanted by; such jobs run first
+            **params: Keyword arguments for the method
+
+        Returns:
+            The job id
+        """
+        job = Job(
+            id=uuid.uuid4().hex,
+            queue=self.name,
+            method=method,
+            params=params,
+            max_attempts=max_attempts or Config.JOB_MAX_ATTEMPTS,
+            cost=self.estimator(method, params),
+            deadline=deadline,
+        )
+        self.backend.enqueue(job)
+        logger.info("Queued %s job %s on '%s'", method, job.id, self.name)
+        return job.id
+
+    def submit_many(self, method: str, params_list: List[Dict[str, any]]) -> List[str]:
+        """Enqueue one job per parameter dict"""
+        return [self.submit(method, **params) for params in params_list]
+
+    def get(self, job_id: str) -> Optional[Job]:
+        """Fetch a job by id"""
+        return self.backend.get(job_id)
+
+    def metrics(self) -> Dict[str, any]:
+        """Depth and age metrics for this queue"""
+        return self.backend.stats().get(
+            self.name,
+            {PENDING: 0, RUNNING: 0, DONE: 0, FAILED: 0, "oldest_pending_age": 0.0, "depth": 0},
+        )
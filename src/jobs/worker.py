@@ -0,0 +1,178 @@
+"""
+Queue worker that executes ContentGenerator jobs
+Run any number of these processes, on one or many hosts, against the same queue:
+
+    python -m src.jobs.worker --queue default --threads 4
+"""
+
+import argparse
+import logging
+import socket
+import threading
+import time
+import uuid
+from dataclasses import asdict, is_dataclass
+from typing import Iterable, Optional
+
+from config import Config
+from src.jobs.job_queue import Job, JobBackend, SQLiteJobBackend
+from src.utils.request_context import request_scope
+
+logger = logging.getLogger(__name__)
+
+# Only generation methods may be invoked through the queue
+GENERATOR_METHODS = frozenset(
+    {
+        "generate_blog_post",
+        "generate_social_post",
+        "generate_ad_copy",
+        "generate_email",
+        "generate_landing_page",
+        "generate_product_description",
+        "generate_structured",
+    }
+)
+
+
+class Worker:
+    """Claims jobs with leases, heartbeats while generating, and records results"""
+
+    def __init__(
+        self,
+        backend: Optional[JobBackend] = None,
+        queues: Iterable[str] = ("default",),
+        generator=None,
+        lease_seconds: Optional[int] = None,
+        poll_interval: Optional[float] = None,
+        worker_id: Optional[str] = None,
+    ):
+        self.backend = backend or SQLiteJobBackend()
+        self.queues = list(queues)
+        self.lease_seconds = lease_seconds or Config.JOB_LEASE_SECONDS
+        self.poll_interval = poll_interval or Config.JOB_POLL_INTERVAL
+        self.worker_id = worker_id or f"{socket.gethostname()}-{uuid.uuid4().hex[:8]}"
+        self._generator = generator
+
+    @property
+    def generator(self):
+        """ContentGenerator, created on first job"""
+        if self._generator is None:
+            from src.generators.content_generator import ContentGenerator
+
+            self._generator = ContentGenerator()
+        return self._generator
+
+    def run_once(self) -> bool:
+        """Claim and execute at most one job; returns True if a job was processed"""
+        for queue in self.queues:
+            job = self.backend.claim(queue, self.worker_id, self.lease_seconds)
+            if job is not None:
+                self._execute(job)
+                return True
+        return False
+
+    def run(self, stop_event: Optional[threading.Event] = None, max_jobs: Optional[int] = None):
+        """Process jobs until stopped, sleeping while the queues are empty"""
+        stop_event = stop_event or threading.Event()
+        processed = 0
+        logger.info("Worker %s polling queues %s", self.worker_id, self.queues)
+
+        while not stop_event.is_set():
+            if self.run_once():
+                processed += 1
+                if max_jobs is not None and processed >= max_jobs:
+                    break
+            else:
+                stop_event.wait(self.poll_interval)
+
+    def _heartbeat(self, job: Job, done: threading.Event):
+        """Extend the lease until the job finishes or the lease is lost"""
+        interval = max(self.lease_seconds / 3, 0.1)
+        while not done.wait(interval):
+            if not self.backend.heartbeat(job.id, self.worker_id, self.lease_seconds):
+                logger.warning("Lost lease on job %s", job.id)
+                return
+
+    def _execute(self, job: Job):
+        """Run the generator method for a claimed job"""
+        done = threading.Event()
+        heartbeat = threading.Thread(target=self._heartbeat, args=(job, done), daemon=True)
+        heartbeat.start()
+        start_time = time.time()
+
+        try:
+            if job.method not in GENERATOR_METHODS:
+                raise ValueError(f"Unknown job method: {job.method}")
+
+            with request_scope(lane="batch", client=job.queue, request_id=job.id):
+                result = getattr(self.generator, job.method)(**job.params)
+
+            if is_dataclass(result.get("data")):
+                result["data"] = asdict(result["data"])
+
+            if result.get("success"):
+                if not self.backend.complete(job.id, self.worker_id, result):
+                    logger.warning("Job %s finished after its lease was reclaimed", job.id)
+                else:
+                    logger.info("Job %s done in %.2fs", job.id, time.time() - start_time)
+            elif result.get("busy"):
+                # Shed by admission control: come back later without using an attempt
+                logger.info("Job %s deferred %ss: service busy", job.id, result["retry_after"])
+                self.backend.defer(job.id, self.worker_id, result["retry_after"], result["error"])
+            else:
+                self._fail(job, result.get("error", "Unknown error"))
+
+        except Exception as e:
+            self._fail(job, str(e))
+        finally:
+            done.set()
+            heartbeat.join()
+
+    def _fail(self, job: Job, error: str):
+        """Record a failed attempt with exponential backoff before the retry"""
+        logger.warning("Job %s attempt %d failed: %s", job.id, job.attempts, error)
+        retry_delay = Config.RETRY_DELAY**job.attempts
+        self.backend.fail(job.id, self.worker_id, error, retry_delay=retry_delay)
+
+
+def main():
+    """Command-line entry point for worker processes"""
+    Config.load()
+    parser = argparse.ArgumentParser(description="Run content generation queue workers")
+    parser.add_argument("--queue", action="append", dest="queues", help="Queue(s) to poll")
+    parser.add_argument("--db", default=Config.JOB_DB_PATH, help="Job database path")
+    parser.add_argument("--threads", type=int, default=1, help="Worker threads in this process")
+    parser.add_argument(
+        "--profile-startup", action="store_true", help="Report cold-start timings and exit"
+    )
+    args = parser.parse_args()
+
+    if args.profile_startup:
+        from src.utils.startup import print_startup_report
+
+        print_startup_report()
+        return
+
+    Config.setup_logging()
+    backend = SQLiteJobBackend(args.db)
+    queues = args.queues or ["default"]
+    stop_event = threading.Event()
+
+    threads = [
+        threading.Thread(target=Worker(backend, queues).run, args=(stop_event,), daemon=True)
+        for _ in range(args.threads)
+    ]
+    for thread in threads:
+        thread.start()
+
+    try:
+        while any(thread.is_alive() for thread in threads):
+            time.sleep(1)
+    except KeyboardInterrupt:
+        stop_event.set()
+        for thread in threads:
+            thread.join()
+
+
+if __name__ == "__main__":
+    main()
@@ -3,10 +3,28 @@ Prompt templates for content generation
 Professional prompt engineering for different content types
 """
 
+import json
+
 
 class PromptTemplates:
     """Engineered prompts for high-quality content generation"""
 
+    # Sequences that only appear once the requested content is finished
+    # (trailing commentary or extra variations); at most 4 per request
+    STOP_SEQUENCES = {
+        "blog_post": ["\n\nNote:", "\n\n*Note"],
+        "social_post": ["\n\nNote:", "\n\nThis post"],
+        "ad_copy": ["VARIATION D", "\n\nNote:"],
+        "email": ["\n\nNote:", "\n\nThis email"],
+        "landing_page": ["\n\nNote:"],
+        "product_description": ["\n\nNote:"],
+    }
+
+    @staticmethod
+    def stop_sequences(content_type: str) -> list:
+        """Stop sequences for a content type's template"""
+        return list(PromptTemplates.STOP_SEQUENCES.get(content_type, []))
+
     @staticmethod
     def blog_post(topic: str, keywords: str, tone: str, word_count: int) -> str:
         """Generate blog post prompt"""
@@ -244,3 +262,107 @@ E-COMMERCE BEST PRACTICES:
 - Make it scannable with formatting
 
 Generate now:"""
+
+    @staticmethod
+    def section_repair(
+        content_label: str,
+        section_label: str,
+        section_description: str,
+        problem: str,
+        parameters: dict,
+        excerpt: str,
+    ) -> str:
+        """Generate a focused prompt that rewrites a single section"""
+        brief = "\n".join(
+            f"- {key.replace('_', ' ').title()}: {value}" for key, value in parameters.items()
+        )
+        return f"""You are fixing one section of an existing {content_label}.
+
+BRIEF:
+{brief}
+
+EXISTING CONTENT (excerpt):
+{excerpt}
+
+SECTION TO WRITE: {section_label}
+It must contain {section_description}.
+Problem with the current version: {problem}
+
+Match the tone and details of the existing content.
+Output ONLY the section, starting with "{section_label}", and nothing else:"""
+
+    @staticmethod
+    def campaign_context(summary: str) -> str:
+        """Generate the campaign context block appended to derived prompts"""
+        return f"""
+
+CAMPAIGN CONTEXT (already published pieces of this campaign, summarized):
+{summary}
+
+Stay consistent with the campaign's messaging, offer and terminology above."""
+
+    @staticmethod
+    def json_output(schema: str) -> str:
+        """Generate the instruction switching a template to JSON output"""
+        return f"""
+
+OUTPUT FORMAT:
+Ignore the plain-text layout above. Respond with ONLY a JSON object (no markdown,
+no commentary) matching this JSON schema:
+{schema}"""
+
+    @staticmethod
+    def continuation() -> str:
+        """Generate the follow-up asking the model to resume a cut-off answer"""
+        return """Your previous answer was cut off. Continue it exactly where it stopped,
+mid-sentence if needed. Do not repeat any earlier text, do not add an introduction,
+and keep the same format and tone."""
+
+    @staticmethod
+    def json_repair(schema: str, output: str, problem: str) -> str:
+        """Generate a prompt that fixes malformed JSON without rewriting the content"""
+        return f"""The JSON below is malformed or does not match the schema ({problem}).
+
+SCHEMA:
+{schema}
+
+JSON TO FIX:
+{output}
+
+Return ONLY the corrected JSON object. Keep the existing wording; only fix the
+structure, fill any missing field briefly and close anything left open."""
+
+    @staticmethod
+    def localize(content_label: str, source: str, locale: str) -> str:
+        """Generate a prompt that translates and adapts one piece for a locale"""
+        return f"""You are a professional marketing localizer. Translate and culturally adapt
+the {content_label} below for the {locale} market.
+
+RULES:
+- Keep the structure, headings, line breaks and markdown formatting
+- Keep brand and product names, URLs and placeholders like {{name}} unchanged
+- Adapt idioms, units, currency and date formats to {locale}
+- Keep hashtags relevant for {locale} audiences
+
+SOURCE:
+{source}
+
+Output ONLY the localized {content_label}:"""
+
+    @staticmethod
+    def localize_batch(content_label: str, items: dict, locales: list) -> str:
+        """Generate a prompt that localizes several short items in one call"""
+        numbered = json.dumps(items, ensure_ascii=False, indent=2)
+        return f"""You are a professional marketing localizer. Translate and culturally adapt
+each numbered {content_label} below (a JSON object of number -> text) for every
+locale listed. Keep brand names, URLs, placeholders and emojis; adapt idioms
+and hashtags.
+
+LOCALES: {", ".join(locales)}
+
+ITEMS:
+{numbered}
+
+Respond with ONLY a JSON object mapping each locale to an object that maps
+every item number to its localized text, e.g.
+{{"{locales[0]}": {{"{next(iter(items))}": "..."}}}}"""
@@ -0,0 +1,234 @@
+"""
+Streaming bulk export of generation history and batch results
+Records are written incrementally so exports run in bounded memory:
+
+    python -m src.utils.export --format parquet --queue default --out results.parquet --score
+"""
+
+import argparse
+import json
+import shutil
+import tempfile
+import zipfile
+from datetime import datetime
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence
+
+EXPORT_COLUMNS = (
+    "id",
+    "timestamp",
+    "type",
+    "content",
+    "tokens",
+    "time",
+    "model",
+    "parameters",
+    "scores",
+)
+
+DEFAULT_COLUMNS = ("timestamp", "type", "content", "tokens", "time", "parameters")
+
+
+def _result_of(record: Dict[str, any]) -> Dict[str, any]:
+    """The generation result of a history item, or the record itself if bare"""
+    return record.get("result") if isinstance(record.get("result"), dict) else record
+
+
+def normalize_record(record: Dict[str, any], index: int = 0) -> Dict[str, any]:
+    """
+    Flatten a history item ({"timestamp", "type", "result"}) or a bare
+    generation result into one export row with every column in EXPORT_COLUMNS
+    """
+    result = _result_of(record)
+    timestamp = record.get("timestamp")
+    if isinstance(timestamp, (int, float)):
+        timestamp = datetime.fromtimestamp(timestamp)
+    if isinstance(timestamp, datetime):
+        timestamp = timestamp.isoformat(timespec="seconds")
+
+    return {
+        "id": record.get("id", str(index)),
+        "timestamp": timestamp,
+        "type": result.get("type") or record.get("type"),
+        "content": result.get("content"),
+        "tokens": result.get("tokens"),
+        "time": result.get("time"),
+        "model": result.get("model"),
+        "parameters": result.get("parameters") or {},
+        "scores": result.get("scores"),
+    }
+
+
+def _check_columns(columns: Sequence[str]):
+    unknown = set(columns) - set(EXPORT_COLUMNS)
+    if unknown:
+        raise ValueError(f"Unknown export column(s): {sorted(unknown)}")
+
+
+def iter_rows(
+    records: Iterable[Dict[str, any]], columns: Sequence[str] = DEFAULT_COLUMNS
+) -> Iterator[Dict[str, any]]:
+    """Lazily normalize records and keep only the selected columns"""
+    _check_columns(columns)
+    for index, record in enumerate(records):
+        row = normalize_record(record, index)
+        yield {column: row[column] for column in columns}
+
+
+def iter_scored(
+    records: Iterable[Dict[str, any]], chunk_size: int = 1000
+) -> Iterator[Dict[str, any]]:
+    """Attach SEO/readability scores to records, scoring chunk_size results at a time"""
+    from src.generators.scoring import score_results
+
+    chunk: List[Dict[str, any]] = []
+    for record in records:
+        chunk.append(record)
+        if len(chunk) >= chunk_size:
+            score_results(_result_of(item) for item in chunk)
+            yield from chunk
+            chunk = []
+    score_results(_result_of(item) for item in chunk)
+    yield from chunk
+
+
+def export_jsonl(
+    records: Iterable[Dict[str, any]], path: str, columns: Sequence[str] = DEFAULT_COLUMNS
+) -> int:
+    """Write one JSON object per line; returns the number of rows written"""
+    count = 0
+    with open(path, "w", encoding="utf-8") as f:
+        for row in iter_rows(records, columns):
+            f.write(json.dumps(row, ensure_ascii=False, default=str))
+            f.write("\n")
+            count += 1
+    return count
+
+
+def export_zip(
+    records: Iterable[Dict[str, any]],
+    path: str,
+    columns: Sequence[str] = DEFAULT_COLUMNS,
+    extension: str = "md",
+) -> int:
+    """
+    Write each piece as its own file plus a manifest.jsonl of the other columns
+
+    Entries are compressed one at a time, so only the current document is
+    held in memory.
+    """
+    count = 0
+    metadata_columns = [column for column in columns if column != "content"]
+    all_columns = list(dict.fromkeys(["id", "type", "content", *metadata_columns]))
+
+    # zipfile allows one open write handle, so the manifest is spooled to a
+    # temporary file and copied in last
+    with tempfile.TemporaryFile() as manifest, zipfile.ZipFile(
+        path, "w", compression=zipfile.ZIP_DEFLATED
+    ) as archive:
+        for row in iter_rows(records, all_columns):
+            name = f"{count:06d}_{row['type'] or 'content'}.{extension}"
+            archive.writestr(name, row["content"] or "")
+
+            entry = {"file": name, **{column: row[column] for column in metadata_columns}}
+            manifest.write(json.dumps(entry, ensure_ascii=False, default=str).encode("utf-8"))
+            manifest.write(b"\n")
+            count += 1
+
+        manifest.seek(0)
+        with archive.open("manifest.jsonl", "w") as target:
+            shutil.copyfileobj(manifest, target)
+    return count
+
+
+def export_parquet(
+    records: Iterable[Dict[str, any]],
+    path: str,
+    columns: Sequence[str] = DEFAULT_COLUMNS,
+    chunk_size: int = 1000,
+) -> int:
+    """Write row groups of chunk_size rows; parameters and scores are stored as JSON text"""
+    _check_columns(columns)
+
+    import pandas as pd
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    arrow_types = {
+        "id": pa.string(),
+        "timestamp": pa.string(),
+        "type": pa.string(),
+        "content": pa.large_string(),
+        "tokens": pa.int64(),
+        "time": pa.float64(),
+        "model": pa.string(),
+        "parameters": pa.string(),
+        "scores": pa.string(),
+    }
+    schema = pa.schema([(column, arrow_types[column]) for column in columns])
+
+    count = 0
+    writer = pq.ParquetWriter(path, schema)
+    chunk: List[Dict[str, any]] = []
+
+    def flush():
+        frame = pd.DataFrame.from_records(chunk, columns=list(columns))
+        for column in ("parameters", "scores"):
+            if column in frame:
+                frame[column] = frame[column].map(lambda value: json.dumps(value, default=str))
+        writer.write_table(pa.Table.from_pandas(frame, schema=schema, preserve_index=False))
+        chunk.clear()
+
+    try:
+        for row in iter_rows(records, columns):
+            chunk.append(row)
+            count += 1
+            if len(chunk) >= chunk_size:
+                flush()
+        if chunk:
+            flush()
+    finally:
+        writer.close()
+    return count
+
+
+EXPORTERS = {"jsonl": export_jsonl, "zip": export_zip, "parquet": export_parquet}
+
+
+def iter_job_records(
+    db_path: Optional[str] = None, queue: Optional[str] = None
+) -> Iterator[Dict[str, any]]:
+    """Stream completed job results from the job queue as export records"""
+    from src.jobs.job_queue import DONE, SQLiteJobBackend
+
+    for job in SQLiteJobBackend(db_path).iter_jobs(queue=queue, status=DONE):
+        yield {"id": job.id, "timestamp": job.created_at, "result": job.result or {}}
+
+
+def main():
+    """Command-line entry point for exporting batch results"""
+    parser = argparse.ArgumentParser(description="Export completed generation jobs")
+    parser.add_argument("--format", choices=sorted(EXPORTERS), default="jsonl")
+    parser.add_argument("--out", required=True, help="Output file path")
+    parser.add_argument("--db", default=None, help="Job database path")
+    parser.add_argument("--queue", default=None, help="Only export this queue")
+    parser.add_argument(
+        "--columns",
+        default=",".join(DEFAULT_COLUMNS),
+        help=f"Comma-separated columns from: {', '.join(EXPORT_COLUMNS)}",
+    )
+    parser.add_argument(
+        "--score", action="store_true", help="Add SEO/readability scores (scores column)"
+    )
+    args = parser.parse_args()
+
+    columns = [column.strip() for column in args.columns.split(",") if column.strip()]
+    records = iter_job_records(args.db, args.queue)
+    if args.score:
+        records = iter_scored(records)
+        columns = list(dict.fromkeys([*columns, "scores"]))
+    count = EXPORTERS[args.format](records, args.out, columns)
+    print(f"Exported {count} records to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
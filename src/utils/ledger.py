@@ -0,0 +1,251 @@
+"""
+Append-only token and cost ledger with incremental usage rollups
+Every API call outcome is recorded once; hourly and daily rollups are
+updated in the same transaction so reports never scan the raw events:
+
+    python -m src.utils.ledger --granularity daily --days 30 --by client content_type
+"""
+
+import argparse
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Iterable, List, Optional
+
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+# Blended USD price per million tokens, used for cost estimates
+MODEL_PRICE_PER_MTOKEN = {
+    "llama-3.3-70b-versatile": 0.69,
+    "llama-3.1-8b-instant": 0.065,
+}
+
+GRANULARITIES = {"hourly": 3600, "daily": 86400}
+
+ROLLUP_DIMENSIONS = ("client", "content_type", "model")
+
+
+class QuotaExceededError(Exception):
+    """Raised by a quota hook to block a request before it reaches the API"""
+
+
+class DailyTokenQuota:
+    """Quota hook limiting tokens per client per UTC day"""
+
+    def __init__(self, limits: Dict[str, int], default_limit: Optional[int] = None):
+        self.limits = limits
+        self.default_limit = default_limit
+
+    def __call__(self, ledger: "UsageLedger", client: str, estimated_tokens: int):
+        limit = self.limits.get(client, self.default_limit)
+        if limit is None:
+            return
+        used = ledger.tokens_used(client, "daily")
+        if used + estimated_tokens > limit:
+            raise QuotaExceededError(
+                f"Daily token quota for '{client}' exhausted ({used}/{limit} tokens used)"
+            )
+
+
+class UsageLedger:
+    """SQLite-backed usage ledger shared by every generator in the process"""
+
+    def __init__(self, path: Optional[str] = None):
+        Config.load()
+        self.path = path or Config.LEDGER_DB_PATH
+        self.quota_hooks: List = []
+        self._local = threading.local()
+
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        conn = self._connection()
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS usage_events (
+                ts REAL NOT NULL,
+                request_id TEXT,
+                client TEXT NOT NULL,
+                content_type TEXT NOT NULL,
+                model TEXT NOT NULL,
+                tokens INTEGER NOT NULL,
+                latency REAL NOT NULL,
+                retries INTEGER NOT NULL,
+                success INTEGER NOT NULL
+            )
+            """
+        )
+        for granularity in GRANULARITIES:
+            conn.execute(
+                f"""
+                CREATE TABLE IF NOT EXISTS usage_{granularity} (
+                    bucket INTEGER NOT NULL,
+                    client TEXT NOT NULL,
+                    content_type TEXT NOT NULL,
+                    model TEXT NOT NULL,
+                    calls INTEGER NOT NULL,
+                    failures INTEGER NOT NULL,
+                    tokens INTEGER NOT NULL,
+                    latency_sum REAL NOT NULL,
+                    retries INTEGER NOT NULL,
+                    PRIMARY KEY (bucket, client, content_type, model)
+                )
+                """
+            )
+
+    def _connection(self) -> sqlite3.Connection:
+        """One connection per thread, reused across calls"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            self._local.conn = conn
+        return conn
+
+    def record(
+        self,
+        client: str,
+        content_type: str,
+        model: str,
+        tokens: int,
+        latency: float,
+        retries: int,
+        success: bool,
+        request_id: Optional[str] = None,
+        ts: Optional[float] = None,
+    ):
+        """Append one call outcome and fold it into the hourly/daily rollups"""
+        ts = time.time() if ts is None else ts
+        failures = 0 if success else 1
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute(
+                "INSERT INTO usage_events VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (ts, request_id, client, content_type, model, tokens, latency, retries, success),
+            )
+            for granularity, seconds in GRANULARITIES.items():
+                conn.execute(
+                    f"INSERT INTO usage_{granularity} VALUES (?, ?, ?, ?, 1, ?, ?, ?, ?) "
+                    "ON CONFLICT (bucket, client, content_type, model) DO UPDATE SET "
+                    "calls = calls + 1, failures = failures + excluded.failures, "
+                    "tokens = tokens + excluded.tokens, "
+                    "latency_sum = latency_sum + excluded.latency_sum, "
+                    "retries = retries + excluded.retries",
+                    (
+                        int(ts // seconds) * seconds,
+                        client,
+                        content_type,
+                        model,
+                        failures,
+                        tokens,
+                        latency,
+                        retries,
+                    ),
+                )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    def tokens_used(self, client: str, granularity: str = "daily") -> int:
+        """Tokens a client has used in the current hour/day bucket"""
+        seconds = GRANULARITIES[granularity]
+        bucket = int(time.time() // seconds) * seconds
+        row = (
+            self._connection()
+            .execute(
+                f"SELECT COALESCE(SUM(tokens), 0) FROM usage_{granularity} "
+                "WHERE bucket = ? AND client = ?",
+                (bucket, client),
+            )
+            .fetchone()
+        )
+        return row[0]
+
+    def check_quota(self, client: str, estimated_tokens: int):
+        """Run every quota hook; raises QuotaExceededError to block the call"""
+        for hook in self.quota_hooks:
+            hook(self, client, estimated_tokens)
+
+    def rollups(
+        self,
+        granularity: str = "daily",
+        since: Optional[float] = None,
+        until: Optional[float] = None,
+    ):
+        """Rollup rows as a pandas DataFrame, with bucket as a UTC timestamp"""
+        import pandas as pd
+
+        since = 0 if since is None else since
+        until = time.time() if until is None else until
+        frame = pd.read_sql_query(
+            f"SELECT * FROM usage_{granularity} WHERE bucket >= ? AND bucket <= ?",
+            self._connection(),
+            params=(int(since), int(until)),
+        )
+        frame["bucket"] = pd.to_datetime(frame["bucket"], unit="s", utc=True)
+        return frame
+
+
+def summarize(frame, by: Iterable[str] = ("content_type",)):
+    """
+    Aggregate rollup rows by the given dimensions
+
+    Returns calls, failure rate, tokens, mean latency and estimated cost,
+    sorted by tokens (largest consumers first).
+    """
+    import numpy as np
+
+    by = list(by)
+    prices = frame["model"].map(MODEL_PRICE_PER_MTOKEN).fillna(0).to_numpy(dtype=float)
+    frame = frame.assign(cost=frame["tokens"].to_numpy(dtype=float) * prices / 1_000_000)
+
+    grouped = frame.groupby(by, as_index=False)[
+        ["calls", "failures", "tokens", "latency_sum", "retries", "cost"]
+    ].sum()
+
+    calls = grouped["calls"].to_numpy(dtype=float)
+    grouped["failure_rate"] = np.divide(
+        grouped["failures"].to_numpy(dtype=float), calls, out=np.zeros_like(calls), where=calls > 0
+    )
+    grouped["mean_latency"] = np.divide(
+        grouped["latency_sum"].to_numpy(dtype=float),
+        calls,
+        out=np.zeros_like(calls),
+        where=calls > 0,
+    )
+
+    return grouped.drop(columns=["latency_sum"]).sort_values("tokens", ascending=False)
+
+
+def main():
+    """Command-line usage report"""
+    parser = argparse.ArgumentParser(description="Token and cost usage report")
+    parser.add_argument("--db", default=None, help="Ledger database path")
+    parser.add_argument("--granularity", choices=sorted(GRANULARITIES), default="daily")
+    parser.add_argument("--days", type=float, default=30, help="Look-back window in days")
+    parser.add_argument(
+        "--by",
+        nargs="+",
+        default=["content_type"],
+        choices=["bucket", *ROLLUP_DIMENSIONS],
+        help="Dimensions to group by",
+    )
+    args = parser.parse_args()
+
+    ledger = UsageLedger(args.db)
+    frame = ledger.rollups(args.granularity, since=time.time() - args.days * 86400)
+    if frame.empty:
+        print("No usage recorded in this window")
+        return
+    print(summarize(frame, args.by).to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
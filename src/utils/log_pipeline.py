@@ -0,0 +1,113 @@
+"""
+Non-blocking structured logging
+Request threads only enqueue log records; a background listener formats
+them as JSON lines and writes them to a size-rotated file.
+"""
+
+import atexit
+import json
+import logging
+import logging.handlers
+import os
+import queue
+from datetime import datetime, timezone
+from typing import Optional
+
+from src.utils.request_context import current_request
+
+# Attributes every LogRecord has; anything else was passed via ``extra=``
+_RECORD_ATTRS = frozenset(
+    vars(logging.LogRecord("", logging.INFO, "", 0, "", (), None)).keys()
+    | {"message", "asctime", "taskName"}
+)
+
+_listener: Optional[logging.handlers.QueueListener] = None
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per record, including request context and extra fields"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(
+                timespec="milliseconds"
+            ),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRS and not key.startswith("_"):
+                entry[key] = value
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+class ContextQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that defers all formatting to the listener thread
+
+    The stock handler formats the message on the calling thread before
+    enqueueing. Records never leave the process here, so they are passed
+    through untouched apart from snapshotting the request context, which
+    lives in a contextvar and would be lost on the listener thread.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        for key, value in current_request().items():
+            if not hasattr(record, key):
+                setattr(record, key, value)
+        return record
+
+
+def shutdown_logging():
+    """Flush queued records and stop the listener thread"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+def configure_logging(
+    level: str = "INFO",
+    log_file: str = "logs/app.log",
+    max_bytes: int = 10 * 1024 * 1024,
+    backup_count: int = 5,
+) -> logging.handlers.QueueListener:
+    """
+    Route the root logger through a queue to file and console handlers
+
+    Safe to call repeatedly (e.g. on every Streamlit rerun): the pipeline
+    is only built once per process.
+    """
+    global _listener
+    if _listener is not None:
+        return _listener
+
+    directory = os.path.dirname(log_file)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+    file_handler = logging.handlers.RotatingFileHandler(
+        log_file, maxBytes=max_bytes, backupCount=backup_count, encoding="utf-8"
+    )
+    file_handler.setFormatter(JsonFormatter())
+
+    console_handler = logging.StreamHandler()
+    console_handler.setFormatter(
+        logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+    )
+
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    _listener = logging.handlers.QueueListener(
+        log_queue, file_handler, console_handler, respect_handler_level=True
+    )
+    _listener.start()
+    atexit.register(shutdown_logging)
+
+    root = logging.getLogger()
+    root.setLevel(getattr(logging, level))
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.addHandler(ContextQueueHandler(log_queue))
+    return _listener
@@ -0,0 +1,238 @@
+"""
+Opt-in sampling profiler for app reruns and generation calls
+While enabled, a background thread samples the stacks of threads inside a
+profiled scope (an app rerun, a generate_* call) every few milliseconds and
+aggregates them per scope label. dump() writes one collapsed-stack file per
+label, ready for flamegraph.pl or speedscope, plus a top-N summary of the
+functions where the time went:
+
+    PROFILING_ENABLED=true streamlit run app.py
+
+Scopes cost one attribute check when profiling is disabled.
+"""
+
+import functools
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from collections import Counter, defaultdict
+from contextlib import contextmanager, nullcontext
+from typing import Dict, List, Optional
+
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+# Frames deeper than this are cut from the root end of the stack
+MAX_STACK_DEPTH = 128
+
+
+def _frame_name(frame) -> str:
+    code = frame.f_code
+    return f"{os.path.basename(code.co_filename)}:{code.co_name}"
+
+
+def _collapse(frame) -> str:
+    """Root-first "file:function;file:function" form of a stack"""
+    names = []
+    while frame is not None and len(names) < MAX_STACK_DEPTH:
+        names.append(_frame_name(frame))
+        frame = frame.f_back
+    return ";".join(reversed(names))
+
+
+class SamplingProfiler:
+    """Samples the stacks of threads inside profiled scopes"""
+
+    def __init__(self, interval: Optional[float] = None, enabled: Optional[bool] = None):
+        """
+        Args:
+            interval: Seconds between samples
+            enabled: Start sampling immediately (default: PROFILING_ENABLED)
+        """
+        self.interval = Config.PROFILING_INTERVAL_MS / 1000 if interval is None else interval
+        self.enabled = False
+        self._scopes: Dict[int, List[str]] = {}
+        self._stacks: Dict[str, Counter] = defaultdict(Counter)
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        if Config.PROFILING_ENABLED if enabled is None else enabled:
+            self.enable()
+
+    def enable(self):
+        """Start the sampling thread"""
+        with self._lock:
+            if self.enabled:
+                return
+            self.enabled = True
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="profiler", daemon=True)
+            self._thread.start()
+        logger.info("Sampling profiler enabled (every %.1f ms)", self.interval * 1000)
+
+    def disable(self):
+        """Stop sampling; samples collected so far are kept for dump()"""
+        with self._lock:
+            if not self.enabled:
+                return
+            self.enabled = False
+            self._stop.set()
+            thread, self._thread = self._thread, None
+            self._scopes.clear()
+        thread.join()
+        logger.info("Sampling profiler disabled")
+
+    def reset(self):
+        """Discard collected samples"""
+        with self._lock:
+            self._stacks.clear()
+
+    def enter(self, label: str):
+        """Mark the current thread as inside ``label`` until exit() (or the thread ends)"""
+        if not self.enabled:
+            return
+        with self._lock:
+            self._scopes.setdefault(threading.get_ident(), []).append(label)
+
+    def exit(self, label: str):
+        """Leave the innermost ``label`` scope of the current thread"""
+        ident = threading.get_ident()
+        with self._lock:
+            labels = self._scopes.get(ident)
+            if labels and label in labels:
+                del labels[len(labels) - 1 - labels[::-1].index(label)]
+                if not labels:
+                    del self._scopes[ident]
+
+    @contextmanager
+    def _scope(self, label: str):
+        self.enter(label)
+        try:
+            yield
+        finally:
+            self.exit(label)
+
+    def scope(self, label: str):
+        """Context manager profiling its body under ``label``"""
+        return self._scope(label) if self.enabled else nullcontext()
+
+    def _run(self):
+        own = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            frames = sys._current_frames()
+            with self._lock:
+                # Threads that ended without leaving their scope (e.g. a stopped rerun)
+                for ident in [i for i in self._scopes if i not in frames]:
+                    del self._scopes[ident]
+                scopes = [(i, list(labels)) for i, labels in self._scopes.items() if i != own]
+            for ident, labels in scopes:
+                stack = _collapse(frames[ident])
+                with self._lock:
+                    # A sample counts towards every enclosing scope: a rerun's
+                    # profile includes the generation calls made during it
+                    for label in set(labels):
+                        self._stacks[label][stack] += 1
+            del frames
+
+    def collapsed(self) -> Dict[str, Counter]:
+        """Sample counts per collapsed stack, per label"""
+        with self._lock:
+            return {label: Counter(stacks) for label, stacks in self._stacks.items()}
+
+    def summary(self, top: int = 15) -> Dict[str, any]:
+        """
+        Where the sampled time went, per label
+
+        Returns:
+            Dict of label -> samples, estimated seconds, and the ``top``
+            functions by self samples (leaf frame) and by total samples
+            (anywhere on the stack)
+        """
+        report = {}
+        for label, stacks in self.collapsed().items():
+            own, total = Counter(), Counter()
+            for stack, count in stacks.items():
+                frames = stack.split(";")
+                own[frames[-1]] += count
+                for name in set(frames):
+                    total[name] += count
+            samples = sum(stacks.values())
+            report[label] = {
+                "samples": samples,
+                "seconds": round(samples * self.interval, 3),
+                "self": own.most_common(top),
+                "total": total.most_common(top),
+            }
+        return report
+
+    def dump(self, directory: Optional[str] = None, top: int = 15) -> List[str]:
+        """
+        Write <label>.collapsed files and summary.json/summary.txt
+
+        Returns:
+            Paths of the files written
+        """
+        directory = os.path.join(directory or Config.PROFILING_DIR, time.strftime("%Y%m%d_%H%M%S"))
+        os.makedirs(directory, exist_ok=True)
+        paths = []
+        for label, stacks in self.collapsed().items():
+            path = os.path.join(directory, f"{label}.collapsed")
+            with open(path, "w", encoding="utf-8") as out:
+                for stack, count in stacks.most_common():
+                    out.write(f"{stack} {count}\n")
+            paths.append(path)
+
+        summary = self.summary(top)
+        path = os.path.join(directory, "summary.json")
+        with open(path, "w", encoding="utf-8") as out:
+            json.dump(summary, out, indent=2)
+        paths.append(path)
+
+        lines = []
+        for label, stats in sorted(summary.items(), key=lambda item: -item[1]["samples"]):
+            lines.append(f"== {label}: {stats['samples']} samples (~{stats['seconds']}s)")
+            for name, count in stats["self"]:
+                lines.append(f"  {100 * count / stats['samples']:5.1f}% self   {name}")
+            lines.append("")
+        path = os.path.join(directory, "summary.txt")
+        with open(path, "w", encoding="utf-8") as out:
+            out.write("\n".join(lines))
+        paths.append(path)
+
+        logger.info("Wrote profiles for %d labels to %s", len(summary), directory)
+        return paths
+
+
+_default_profiler: Optional[SamplingProfiler] = None
+_default_lock = threading.Lock()
+
+
+def get_profiler() -> SamplingProfiler:
+    """Process-wide profiler shared by the app and every ContentGenerator"""
+    global _default_profiler
+    with _default_lock:
+        if _default_profiler is None:
+            Config.load()
+            _default_profiler = SamplingProfiler()
+        return _default_profiler
+
+
+def profiled(label: str):
+    """Decorator profiling each call of the function under ``label``"""
+
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            profiler = _default_profiler or get_profiler()
+            if not profiler.enabled:
+                return func(*args, **kwargs)
+            with profiler.scope(label):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,35 @@
+"""
+Per-request context shared by the generation path
+Carries who asked for what (client, content type, request id) without
+threading extra arguments through every ContentGenerator method.
+"""
+
+import uuid
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Iterator
+
+_context: ContextVar[Dict[str, any]] = ContextVar("request_context", default={})
+
+DEFAULT_CLIENT = "anonymous"
+
+
+def current_request() -> Dict[str, any]:
+    """The active request's fields (empty dict outside a request scope)"""
+    return _context.get()
+
+
+@contextmanager
+def request_scope(**fields) -> Iterator[Dict[str, any]]:
+    """
+    Layer fields onto the current request context for the enclosed block
+
+    A request id is generated for the outermost scope if none is given.
+    """
+    merged = {**_context.get(), **fields}
+    merged.setdefault("request_id", uuid.uuid4().hex[:12])
+    token = _context.set(merged)
+    try:
+        yield merged
+    finally:
+        _context.reset(token)
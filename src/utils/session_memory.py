@@ -0,0 +1,220 @@
+"""
+Per-session memory accounting and idle-session spilling for the Streamlit app
+Each browser session keeps its large payloads (current result, generation
+history) in a SpillableSession rather than directly in st.session_state. A
+process-wide SessionMemory tracks every live session, reports approximate
+sizes for sessions and shared resources, and pickles the payloads of
+sessions idle longer than SESSION_IDLE_SECONDS to disk. A spilled session is
+restored transparently the next time it reads a value.
+"""
+
+import gc
+import logging
+import os
+import pickle
+import sys
+import threading
+import time
+import uuid
+import weakref
+from types import FunctionType, ModuleType
+from typing import Dict, Optional
+
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+# Objects shared process-wide; counting them would charge every session for them
+_SHARED_TYPES = (type, ModuleType, FunctionType)
+
+
+def deep_sizeof(obj) -> int:
+    """Approximate bytes reachable from obj (classes, modules and functions excluded)"""
+    seen = set()
+    size = 0
+    pending = [obj]
+    while pending:
+        current = pending.pop()
+        if isinstance(current, _SHARED_TYPES) or id(current) in seen:
+            continue
+        seen.add(id(current))
+        size += sys.getsizeof(current, 0)
+        pending.extend(gc.get_referents(current))
+    return size
+
+
+def _remove_file(path: str):
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+class SpillableSession:
+    """
+    Dict-like holder of one session's large values
+
+    Reading or writing a value restores spilled payloads and marks the
+    session active.
+    """
+
+    def __init__(self, spill_dir: Optional[str] = None, **defaults):
+        self.spill_path = os.path.join(
+            spill_dir or Config.SESSION_SPILL_DIR, f"session_{uuid.uuid4().hex}.pkl"
+        )
+        self.last_access = time.time()
+        self.spilled_bytes = 0
+        self._values: Optional[Dict[str, any]] = dict(defaults)
+        self._lock = threading.RLock()
+        # Streamlit drops session_state when the browser session ends
+        weakref.finalize(self, _remove_file, self.spill_path)
+
+    @property
+    def spilled(self) -> bool:
+        return self._values is None
+
+    def _resident(self) -> Dict[str, any]:
+        """Values in memory, loading them back from disk if spilled"""
+        self.last_access = time.time()
+        if self._values is None:
+            with open(self.spill_path, "rb") as spill_file:
+                self._values = pickle.load(spill_file)
+            _remove_file(self.spill_path)
+            logger.info(
+                "Restored spilled session (%d bytes)",
+                self.spilled_bytes,
+                extra={"session_restored": True, "spilled_bytes": self.spilled_bytes},
+            )
+            self.spilled_bytes = 0
+        return self._values
+
+    def __getitem__(self, name: str):
+        with self._lock:
+            return self._resident()[name]
+
+    def __setitem__(self, name: str, value):
+        with self._lock:
+            self._resident()[name] = value
+
+    def __contains__(self, name: str) -> bool:
+        with self._lock:
+            return name in self._resident()
+
+    def get(self, name: str, default=None):
+        with self._lock:
+            return self._resident().get(name, default)
+
+    def nbytes(self) -> int:
+        """Approximate memory held by the session's values (0 while spilled)"""
+        with self._lock:
+            return 0 if self._values is None else deep_sizeof(self._values)
+
+    def spill(self) -> int:
+        """Write the values to disk and drop them from memory; returns bytes written"""
+        with self._lock:
+            if self._values is None:
+                return 0
+            directory = os.path.dirname(self.spill_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            with open(self.spill_path, "wb") as spill_file:
+                pickle.dump(self._values, spill_file, protocol=pickle.HIGHEST_PROTOCOL)
+            self.spilled_bytes = os.path.getsize(self.spill_path)
+            self._values = None
+            return self.spilled_bytes
+
+
+class SessionMemory:
+    """Thread-safe registry of live sessions with idle eviction"""
+
+    def __init__(self, idle_seconds: Optional[float] = None, check_interval: float = 60.0):
+        """
+        Args:
+            idle_seconds: Inactivity after which a session is spilled (0 disables spilling)
+            check_interval: Minimum seconds between idle scans triggered by maybe_evict()
+        """
+        self.idle_seconds = Config.SESSION_IDLE_SECONDS if idle_seconds is None else idle_seconds
+        self.check_interval = check_interval
+        self._sessions: "weakref.WeakSet[SpillableSession]" = weakref.WeakSet()
+        self._lock = threading.Lock()
+        self._last_check = time.time()
+        self._evicted = 0
+
+    def track(self, session: SpillableSession) -> SpillableSession:
+        """Register a session; it is forgotten once garbage collected"""
+        with self._lock:
+            self._sessions.add(session)
+        return session
+
+    def evict_idle(self, now: Optional[float] = None) -> int:
+        """Spill every resident session idle longer than idle_seconds; returns how many"""
+        if self.idle_seconds <= 0:
+            return 0
+        now = time.time() if now is None else now
+        with self._lock:
+            sessions = list(self._sessions)
+
+        evicted = 0
+        for session in sessions:
+            if session.spilled or now - session.last_access < self.idle_seconds:
+                continue
+            try:
+                written = session.spill()
+            except Exception as e:
+                logger.warning("Failed to spill idle session: %s", e)
+                continue
+            evicted += 1
+            logger.info(
+                "Spilled idle session to disk (%d bytes)",
+                written,
+                extra={"session_spilled": True, "spilled_bytes": written},
+            )
+        with self._lock:
+            self._evicted += evicted
+        return evicted
+
+    def maybe_evict(self) -> int:
+        """evict_idle() at most once per check_interval; cheap enough to call every rerun"""
+        now = time.time()
+        with self._lock:
+            if now - self._last_check < self.check_interval:
+                return 0
+            self._last_check = now
+        return self.evict_idle(now)
+
+    def metrics(self, shared: Optional[Dict[str, any]] = None) -> Dict[str, any]:
+        """
+        Session counts and approximate memory
+
+        Args:
+            shared: Process-wide resources to size as well, by name (e.g. the generator)
+        """
+        with self._lock:
+            sessions = list(self._sessions)
+            evicted = self._evicted
+
+        sizes = [session.nbytes() for session in sessions if not session.spilled]
+        return {
+            "sessions": len(sessions),
+            "resident_sessions": len(sizes),
+            "spilled_sessions": len(sessions) - len(sizes),
+            "session_bytes": sum(sizes),
+            "largest_session_bytes": max(sizes, default=0),
+            "spilled_bytes": sum(s.spilled_bytes for s in sessions if s.spilled),
+            "evicted_total": evicted,
+            "shared_bytes": {name: deep_sizeof(obj) for name, obj in (shared or {}).items()},
+        }
+
+
+_default_memory: Optional[SessionMemory] = None
+_default_lock = threading.Lock()
+
+
+def get_session_memory() -> SessionMemory:
+    """Process-wide session registry shared by every Streamlit session"""
+    global _default_memory
+    with _default_lock:
+        if _default_memory is None:
+            Config.load()
+            _default_memory = SessionMemory()
+        return _default_memory
@@ -0,0 +1,103 @@
+"""
+Cold-start profiling
+Reports where import and initialization time goes:
+
+    python -m src.utils.startup
+    python -m src.jobs.worker --profile-startup
+"""
+
+import subprocess
+import sys
+import time
+from typing import Dict, Iterable, List
+
+# Modules imported on the app / worker startup path
+STARTUP_MODULES = (
+    "config",
+    "src.prompts.templates",
+    "src.generators.content_generator",
+    "src.jobs.worker",
+)
+
+
+def profile_imports(modules: Iterable[str] = STARTUP_MODULES) -> List[Dict[str, any]]:
+    """
+    Measure import cost in a fresh interpreter using ``python -X importtime``
+
+    Args:
+        modules: Modules to import
+
+    Returns:
+        One dict per imported module with self/cumulative microseconds,
+        sorted by cumulative time (most expensive first)
+    """
+    statement = "; ".join(f"import {module}" for module in modules)
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+
+    timings = []
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:") :].split("|")
+        timings.append(
+            {
+                "module": name.strip(),
+                "depth": (len(name) - len(name.lstrip())) // 2,
+                "self_us": int(self_us),
+                "cumulative_us": int(cumulative_us),
+            }
+        )
+
+    return sorted(timings, key=lambda t: t["cumulative_us"], reverse=True)
+
+
+def profile_phases() -> Dict[str, float]:
+    """Time the lazy initialization steps that follow import, in seconds"""
+    from config import Config
+    from src.generators.content_generator import ContentGenerator
+
+    phases = {}
+
+    start = time.perf_counter()
+    Config.load()
+    phases["config_load"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    generator = ContentGenerator()
+    phases["generator_init"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    try:
+        generator.client
+        phases["client_init"] = time.perf_counter() - start
+    except Exception:
+        phases["client_init"] = float("nan")
+
+    return phases
+
+
+def print_startup_report(top: int = 15):
+    """Print the slowest imports and the initialization phase timings"""
+    timings = profile_imports()
+    total_us = max((t["cumulative_us"] for t in timings if t["depth"] == 0), default=0)
+
+    print(f"Top {top} imports by cumulative time:")
+    for timing in timings[:top]:
+        print(
+            f"  {timing['cumulative_us'] / 1000:8.1f} ms  "
+            f"(self {timing['self_us'] / 1000:6.1f} ms)  {timing['module']}"
+        )
+    print(f"Slowest top-level import: {total_us / 1000:.1f} ms")
+
+    print("Initialization phases:")
+    for phase, seconds in profile_phases().items():
+        print(f"  {seconds * 1000:8.1f} ms  {phase}")
+
+
+if __name__ == "__main__":
+    print_startup_report()
@@ -1,9 +1,68 @@
 """
 Pytest configuration and fixtures
 """
+import os
 import sys
 from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+# Keep unit tests from writing to the real usage ledger, response and latency stores
+os.environ.setdefault("LEDGER_ENABLED", "false")
+os.environ.setdefault("RESPONSE_CACHE_PATH", "")
+os.environ.setdefault("LATENCY_DB_PATH", "")
 
 # Add project root to Python path
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
+
+
+class FakeStream:
+    """Iterable of word-sized streaming chunks that records close()"""
+
+    def __init__(self, content):
+        self.words = content.split(" ")
+        self.closed = False
+        self.sent = 0
+
+    def __iter__(self):
+        for index, word in enumerate(self.words):
+            self.sent += 1
+            text = word if index == len(self.words) - 1 else word + " "
+            delta = SimpleNamespace(content=text)
+            yield SimpleNamespace(choices=[SimpleNamespace(delta=delta)], x_groq=None)
+
+    def close(self):
+        self.closed = True
+
+
+class FakeCompletions:
+    """Records chat.completions.create calls and returns canned responses"""
+
+    def __init__(self, responses):
+        self.responses = list(responses)
+        self.calls = []
+
+    def create(self, **kwargs):
+        self.calls.append(kwargs)
+        content = self.responses.pop(0) if len(self.responses) > 1 else self.responses[0]
+        if isinstance(content, Exception):
+            raise content
+        if kwargs.get("stream"):
+            return FakeStream(content)
+        return SimpleNamespace(
+            choices=[SimpleNamespace(message=SimpleNamespace(content=content))],
+            usage=SimpleNamespace(total_tokens=len(content.split()) + 10),
+        )
+
+
+@pytest.fixture
+def fake_client():
+    """Factory for a Groq-like client returning the given responses in order"""
+
+    def make(*responses):
+        completions = FakeCompletions(responses or ["Generated content"])
+        return SimpleNamespace(chat=SimpleNamespace(completions=completions))
+
+    return make
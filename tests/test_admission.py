@@ -0,0 +1,122 @@
+"""
+Unit tests for admission control and load shedding
+"""
+import time
+
+import pytest
+
+from src.generators.admission import AdmissionController, AdmissionDecision
+from src.generators.backends import GroqBackend
+from src.generators.cache import ResponseCache
+from src.generators.content_generator import ContentGenerator
+from src.generators.profiles import GenerationProfile
+from src.generators.scheduler import FairScheduler
+from src.utils.request_context import request_scope
+
+DEGRADED = AdmissionDecision(True, True, 15, "expected wait 15s")
+
+
+def loaded_scheduler(service_time):
+    """Single-slot scheduler whose slot is busy and whose calls take service_time"""
+    scheduler = FairScheduler(max_concurrency=1)
+    scheduler.acquire()
+    scheduler.release(held=service_time)
+    scheduler.acquire()
+    return scheduler
+
+
+def make_generator(scheduler, fake_client, **thresholds):
+    admission = AdmissionController(
+        scheduler, **{"max_wait": 30, "degrade_wait": 10, "max_queue": 50, **thresholds}
+    )
+    generator = ContentGenerator(scheduler=scheduler, admission=admission)
+    generator.backends["groq"] = GroqBackend(client=fake_client())
+    return generator
+
+
+class TestAdmissionController:
+    """Test suite for admit / degrade / shed decisions"""
+
+    @pytest.mark.unit
+    def test_load_estimates_expected_wait(self):
+        """Test expected wait comes from the slot hold-time average"""
+        load = loaded_scheduler(12.0).load("interactive")
+        assert load["in_flight"] == 1
+        assert load["expected_wait"] == pytest.approx(12.0)
+
+    @pytest.mark.unit
+    def test_idle_service_admits(self):
+        """Test requests are admitted normally when nothing is queued"""
+        decision = AdmissionController(FairScheduler(max_concurrency=1)).check()
+        assert decision.admitted and not decision.degraded
+
+    @pytest.mark.unit
+    def test_moderate_load_degrades_interactive_and_defers_batch(self):
+        """Test batch work is shed before interactive work is degraded"""
+        controller = AdmissionController(loaded_scheduler(15.0), max_wait=30, degrade_wait=10)
+        interactive = controller.check("interactive")
+        batch = controller.check("batch")
+        assert interactive.admitted and interactive.degraded
+        assert not batch.admitted
+        assert batch.retry_after == 15
+
+    @pytest.mark.unit
+    def test_heavy_load_sheds_with_retry_hint(self):
+        """Test requests are rejected with a retry-after once waits exceed the limit"""
+        decision = AdmissionController(loaded_scheduler(45.0), max_wait=30).check()
+        assert not decision.admitted
+        assert decision.retry_after == 45
+
+
+class TestLoadShedding:
+    """Test suite for generator behaviour under overload"""
+
+    @pytest.mark.unit
+    def test_shed_request_returns_busy_without_calling_api(self, fake_client):
+        """Test a shed request gets a clear busy response"""
+        generator = make_generator(loaded_scheduler(45.0), fake_client)
+        result = generator._call_api("prompt")
+        assert result["busy"] is True
+        assert result["retry_after"] == 45
+        assert "retry in 45 s" in result["error"]
+        assert generator.client.chat.completions.calls == []
+
+    @pytest.mark.unit
+    def test_degraded_request_is_shortened(self, fake_client):
+        """Test degraded requests are capped at DEGRADED_MAX_TOKENS and not cached"""
+        generator = make_generator(FairScheduler(max_concurrency=1), fake_client)
+        generator.admission.check = lambda lane: DEGRADED
+        generator.cache = ResponseCache()
+
+        result = generator._call_api(
+            "prompt", max_tokens=4000, profile=GenerationProfile(cache_ttl=60)
+        )
+
+        assert result["success"] and result["degraded"]
+        assert generator.client.chat.completions.calls[0]["max_tokens"] == 800
+        assert generator.cache.stats()["entries"] == 0
+
+    @pytest.mark.unit
+    def test_long_form_paused_while_degraded(self, fake_client):
+        """Test long-form content types are refused under degradation"""
+        generator = make_generator(FairScheduler(max_concurrency=1), fake_client)
+        generator.admission.check = lambda lane: DEGRADED
+        with request_scope(content_type="blog_post"):
+            result = generator._call_api("prompt")
+        assert result["busy"] is True
+        assert "long-form" in result["error"]
+
+    @pytest.mark.unit
+    def test_stale_cache_served_when_shed(self, fake_client):
+        """Test an expired cached response is served instead of a busy error"""
+        generator = make_generator(loaded_scheduler(45.0), fake_client)
+        generator.cache = ResponseCache()
+        profile = GenerationProfile(cache_ttl=60)
+        key = ResponseCache.make_key("prompt", profile.model, profile.temperature, 2000)
+        generator.cache._remember(key, time.time() - 60, {"content": "Old", "success": True})
+
+        result = generator._call_api("prompt", max_tokens=2000, profile=profile)
+
+        assert result["content"] == "Old"
+        assert result["stale"] is True
+        assert generator.client.chat.completions.calls == []
@@ -0,0 +1,169 @@
+"""
+Unit tests for pluggable LLM backends
+"""
+import asyncio
+import json
+
+import pytest
+
+from src.generators.backends import (
+    Completion,
+    CompletionRequest,
+    CompletionStream,
+    GroqBackend,
+    LLMBackend,
+    OpenAICompatibleBackend,
+)
+from src.generators.content_generator import ContentGenerator
+from src.generators.profiles import GenerationProfile, parse_profiles
+from src.utils.request_context import request_scope
+
+
+class RecordingBackend(LLMBackend):
+    """Unmetered backend that records requests"""
+
+    uses_api_budget = False
+
+    def __init__(self, content="Local content"):
+        self.content = content
+        self.requests = []
+
+    def complete(self, request):
+        self.requests.append(request)
+        return Completion(self.content, 42, "stop")
+
+    def stream(self, request):
+        self.requests.append(request)
+        return CompletionStream(iter([(self.content, 42, "stop")]))
+
+    async def acomplete(self, request):
+        return self.complete(request)
+
+    async def astream(self, request):
+        raise NotImplementedError
+
+
+def make_request(**kwargs):
+    return CompletionRequest.for_prompt(
+        "Write", model="m", temperature=0.5, max_tokens=50, **kwargs
+    )
+
+
+class TestBackendRouting:
+    """Test suite for selecting backends from profiles"""
+
+    @pytest.mark.unit
+    def test_batch_lane_uses_batch_backend(self):
+        """Test batch work can be routed to a different backend and model"""
+        profiles = parse_profiles(
+            {
+                "content_types": {
+                    "product_description": {"batch_backend": "local", "batch_model": "llama3:8b"}
+                }
+            }
+        )
+        profile = profiles[("product_description", None)]
+        assert profile.for_lane("interactive") is profile
+        assert profile.for_lane("batch").backend == "local"
+        assert profile.for_lane("batch").model == "llama3:8b"
+
+    @pytest.mark.unit
+    def test_generator_calls_profile_backend(self, fake_client):
+        """Test a content type's profile picks the backend; Groq is untouched"""
+        local = RecordingBackend()
+        generator = ContentGenerator(
+            backends={"groq": GroqBackend(client=fake_client()), "local": local}
+        )
+        admitted = generator.scheduler.metrics()["lanes"]["interactive"]["admitted"]
+
+        result = generator._call_api(
+            "prompt", profile=GenerationProfile(backend="local", model="llama3:8b")
+        )
+
+        assert result["content"] == "Local content"
+        assert result["tokens"] == 42
+        assert local.requests[0].model == "llama3:8b"
+        assert generator.client.chat.completions.calls == []
+        assert generator.scheduler.metrics()["lanes"]["interactive"]["admitted"] == admitted
+
+    @pytest.mark.unit
+    def test_batch_lane_routed_in_generator(self, fake_client):
+        """Test the batch lane switches backend while interactive stays on Groq"""
+        local = RecordingBackend()
+        generator = ContentGenerator(
+            backends={"groq": GroqBackend(client=fake_client()), "local": local}
+        )
+        profile = GenerationProfile(batch_backend="local")
+
+        generator._call_api("interactive prompt", profile=profile)
+        with request_scope(lane="batch"):
+            generator._call_api("batch prompt", profile=profile)
+
+        assert len(generator.client.chat.completions.calls) == 1
+        assert len(local.requests) == 1
+
+    @pytest.mark.unit
+    def test_unknown_backend_rejected(self):
+        """Test a profile naming a missing backend fails clearly"""
+        generator = ContentGenerator(backends={"groq": RecordingBackend()})
+        with pytest.raises(ValueError, match="Unknown LLM backend"):
+            generator._call_api("prompt", profile=GenerationProfile(backend="local"))
+
+
+class TestOpenAICompatibleBackend:
+    """Test suite for the HTTP backend against a mock server"""
+
+    @pytest.fixture
+    def backend(self):
+        httpx = pytest.importorskip("httpx")
+        seen = []
+
+        def handler(request):
+            body = json.loads(request.content)
+            seen.append(body)
+            if body.get("stream"):
+                events = [
+                    {"choices": [{"delta": {"content": "Hello "}, "finish_reason": None}]},
+                    {"choices": [{"delta": {"content": "world"}, "finish_reason": "stop"}]},
+                    {"choices": [], "usage": {"total_tokens": 17}},
+                ]
+                lines = "".join(f"data: {json.dumps(event)}\n\n" for event in events)
+                return httpx.Response(200, text=lines + "data: [DONE]\n\n")
+            return httpx.Response(
+                200,
+                json={
+                    "choices": [{"message": {"content": "Hello world"}, "finish_reason": "stop"}],
+                    "usage": {"total_tokens": 12},
+                },
+            )
+
+        transport = httpx.MockTransport(handler)
+        backend = OpenAICompatibleBackend(
+            "http://localhost:8080/v1",
+            http_client=httpx.Client(transport=transport),
+            async_http_client=httpx.AsyncClient(transport=transport),
+        )
+        backend.seen = seen
+        return backend
+
+    @pytest.mark.unit
+    def test_complete_reports_usage(self, backend):
+        """Test non-streaming completions parse content and usage"""
+        completion = backend.complete(make_request(response_format={"type": "json_object"}))
+        assert completion == Completion("Hello world", 12, "stop")
+        assert backend.seen[0]["response_format"] == {"type": "json_object"}
+
+    @pytest.mark.unit
+    def test_stream_yields_deltas_and_releases_slot(self, backend):
+        """Test SSE deltas are streamed and usage captured at the end"""
+        stream = backend.stream(make_request())
+        assert "".join(stream) == "Hello world"
+        assert stream.total_tokens == 17
+        assert stream.finish_reason == "stop"
+        assert backend._slots.acquire(blocking=False)
+
+    @pytest.mark.unit
+    def test_async_complete(self, backend):
+        """Test the async path shares the same wire format"""
+        completion = asyncio.run(backend.acomplete(make_request()))
+        assert completion.content == "Hello world"
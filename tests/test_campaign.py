@@ -0,0 +1,119 @@
+"""
+Unit tests for the campaign pipeline
+"""
+import time
+
+import pytest
+
+from src.generators.backends import GroqBackend
+from src.generators.campaign import (
+    CampaignBrief,
+    CampaignNode,
+    condense,
+    generate_campaign,
+    run_campaign,
+)
+from src.generators.content_generator import ContentGenerator
+
+
+def ok(content, delay=0.0):
+    """Node body returning a successful result after a delay"""
+
+    def run(context):
+        time.sleep(delay)
+        return {"content": content, "tokens": 10, "time": delay, "success": True}
+
+    return run
+
+
+class TestCampaign:
+    """Test suite for campaign graphs"""
+
+    @pytest.mark.unit
+    def test_condense_skips_headings(self):
+        """Test summaries keep first sentences and drop formatting"""
+        text = (
+            "# Big Launch\n\nOur assistant saves you ten hours a week. It learns fast.\n\n"
+            "## Benefits\n\n- Works with every smart device you own today."
+        )
+        summary = condense(text, max_words=40)
+        assert summary.startswith("Our assistant saves you ten hours a week.")
+        assert "It learns fast" not in summary
+        assert "#" not in summary
+        assert len(condense(text * 20, max_words=15).split()) == 15
+
+    @pytest.mark.unit
+    def test_independent_nodes_run_concurrently(self):
+        """Test a campaign takes about as long as its longest chain"""
+        seen = {}
+
+        def downstream(context):
+            seen["context"] = context
+            return {"content": "Derived piece", "tokens": 5, "time": 0.0, "success": True}
+
+        nodes = {
+            "landing_page": CampaignNode(
+                "landing_page", ok("The page promises faster setup for teams.", 0.2)
+            ),
+            "blog_post": CampaignNode("blog_post", ok("The blog explains setup in depth.", 0.2)),
+            "email": CampaignNode("email", downstream, ("landing_page", "blog_post")),
+        }
+        outcome = run_campaign(nodes)
+
+        assert outcome.success
+        assert outcome.elapsed < 0.35
+        assert list(outcome.results) == ["landing_page", "blog_post", "email"]
+        assert "Landing Page: The page promises faster setup" in seen["context"]
+        assert "Blog Post:" in seen["context"]
+
+    @pytest.mark.unit
+    def test_failed_dependency_still_runs_downstream(self):
+        """Test downstream nodes run without the failed piece's summary"""
+        nodes = {
+            "landing_page": CampaignNode(
+                "landing_page", lambda context: {"content": None, "error": "x", "success": False}
+            ),
+            "ad_copy": CampaignNode("ad_copy", ok("Buy now."), ("landing_page",)),
+        }
+        outcome = run_campaign(nodes)
+        assert outcome.results["ad_copy"]["success"] is True
+        assert outcome.as_result()["failed"] == ["landing_page"]
+
+    @pytest.mark.unit
+    def test_cycle_rejected(self):
+        """Test cyclic graphs fail before generating anything"""
+        nodes = {
+            "a": CampaignNode("a", ok("A"), ("b",)),
+            "b": CampaignNode("b", ok("B"), ("a",)),
+        }
+        with pytest.raises(ValueError, match="cycle"):
+            run_campaign(nodes)
+
+    @pytest.mark.unit
+    def test_generate_campaign_passes_summaries(self, fake_client):
+        """Test derived pieces get a compact summary instead of the full text"""
+        generator = ContentGenerator()
+        long_page = "Smart homes made simple for every busy family today. " * 200
+        generator.backends["groq"] = GroqBackend(client=fake_client(long_page))
+        brief = CampaignBrief(
+            product="SmartHome AI",
+            audience="Homeowners",
+            offer="Launch discount",
+            platforms=("LinkedIn",),
+        )
+
+        outcome = generate_campaign(generator, brief)
+
+        assert outcome.success
+        assert set(outcome.results) == {
+            "landing_page",
+            "blog_post",
+            "ad_copy",
+            "email",
+            "product_description",
+            "social_linkedin",
+        }
+        prompts = [c["messages"][1]["content"] for c in generator.client.chat.completions.calls]
+        assert sum("CAMPAIGN CONTEXT" in prompt for prompt in prompts) == 4
+        assert outcome.context_tokens_saved > 0
+        assert outcome.as_result()["type"] == "campaign"
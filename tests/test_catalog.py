@@ -0,0 +1,147 @@
+"""
+Unit tests for bulk catalog description generation
+"""
+import pytest
+
+from src.generators.backends import GroqBackend
+from src.generators.catalog import CatalogPipeline, CatalogReport, normalize_features
+from src.generators.content_generator import ContentGenerator
+from src.generators.profiles import ProfileStore
+
+
+@pytest.fixture
+def pd():
+    """pandas is only needed by the catalog tooling"""
+    return pytest.importorskip("pandas")
+
+
+def make_pipeline(fake_client, **kwargs):
+    generator = ContentGenerator()
+    generator.backends["groq"] = GroqBackend(client=fake_client("A great product."))
+    return CatalogPipeline(generator, max_workers=4, **kwargs)
+
+
+class TestNormalization:
+    """Test suite for feature-set deduplication keys"""
+
+    @pytest.mark.unit
+    def test_equivalent_feature_lists_match(self):
+        """Test order, case, bullets and separators do not change the key"""
+        assert normalize_features("- USB-C, 20h battery\n* Waterproof") == normalize_features(
+            "waterproof; 20h  Battery;usb-c"
+        )
+
+    @pytest.mark.unit
+    def test_missing_features(self):
+        """Test empty and NaN cells normalize to an empty key"""
+        assert normalize_features(None) == normalize_features(float("nan")) == ""
+
+
+class TestCatalogPipeline:
+    """Test suite for chunked catalog runs"""
+
+    @pytest.mark.unit
+    def test_duplicate_feature_sets_generated_once(self, pd, fake_client):
+        """Test variant rows share one generation and report per-row status"""
+        pipeline = make_pipeline(fake_client)
+        frame = pd.DataFrame(
+            {
+                "sku": ["A-S", "A-M", "B", "C"],
+                "product_name": ["Trail Shoe", "trail shoe", "Rain Jacket", ""],
+                "features": ["Light, Grippy", "grippy; light", "Waterproof", "x"],
+            }
+        )
+        report = CatalogReport()
+
+        described = pipeline.describe_frame(frame, report)
+
+        assert len(pipeline.generator.client.chat.completions.calls) == 2
+        assert described["status"].tolist() == ["generated", "reused", "generated", "skipped"]
+        assert described["description"].tolist()[:3] == ["A great product."] * 3
+        assert described["sku"].tolist() == ["A-S", "A-M", "B", "C"]
+        assert (report.rows, report.unique, report.reused, report.skipped) == (4, 2, 1, 1)
+
+    @pytest.mark.unit
+    def test_csv_round_trip_in_chunks(self, pd, fake_client, tmp_path):
+        """Test chunks are written back with duplicates reused across chunks"""
+        source = tmp_path / "catalog.csv"
+        pd.DataFrame(
+            {
+                "product_name": ["Mug"] * 5 + ["Bowl"],
+                "features": ["Ceramic"] * 5 + ["Ceramic"],
+                "tone": ["Casual"] * 6,
+            }
+        ).to_csv(source, index=False)
+        pipeline = make_pipeline(fake_client)
+
+        report = pipeline.run(str(source), str(tmp_path / "out.csv"), chunk_size=2)
+
+        output = pd.read_csv(tmp_path / "out.csv")
+        assert len(output) == 6
+        assert output["status"].tolist() == ["generated"] + ["reused"] * 4 + ["generated"]
+        assert len(pipeline.generator.client.chat.completions.calls) == 2
+        assert report.rows_per_second > 0
+
+    @pytest.mark.unit
+    def test_reordered_features_reused_in_later_chunk(self, pd, fake_client, tmp_path):
+        """Test a later chunk listing the same features differently makes no new call"""
+        profiles = tmp_path / "profiles.json"
+        profiles.write_text('{"content_types": {"product_description": {"cache_ttl": 0}}}')
+        pipeline = make_pipeline(fake_client)
+        generator = pipeline.generator
+        generator.profiles = ProfileStore(path=str(profiles))
+        first = pd.DataFrame({"product_name": ["Mug"], "features": ["Ceramic, Blue"]})
+        later = pd.DataFrame({"product_name": ["mug"], "features": ["- blue\n- ceramic"]})
+
+        pipeline.describe_frame(first)
+        described = pipeline.describe_frame(later)
+
+        assert described["status"].tolist() == ["reused"]
+        assert len(generator.client.chat.completions.calls) == 1
+
+    @pytest.mark.unit
+    def test_reuse_bounded(self, pd, fake_client):
+        """Test only the most recent descriptions are kept across chunks"""
+        pipeline = make_pipeline(fake_client, reuse_entries=2)
+        names = ["Mug", "Bowl", "Plate"]
+
+        pipeline.describe_frame(pd.DataFrame({"product_name": names, "features": ["x"] * 3}))
+
+        assert [key[0] for key in pipeline._descriptions] == ["bowl", "plate"]
+
+    @pytest.mark.unit
+    def test_failures_and_busy_results_recorded_per_row(self, pd):
+        """Test shed calls are retried and failures mark rows without stopping the run"""
+
+        class FlakyGenerator:
+            def __init__(self):
+                busy = {"busy": True, "retry_after": 0}
+                self.results = [
+                    {"content": None, "error": "busy", "success": False, **busy},
+                    {"content": None, "error": "down", "success": False},
+                ]
+
+            def generate_product_description(self, product_name, features, tone):
+                return self.results.pop(0)
+
+        pipeline = CatalogPipeline(FlakyGenerator(), max_workers=1)
+        frame = pd.DataFrame({"product_name": ["Lamp", "Lamp"], "features": ["LED", "led"]})
+
+        described = pipeline.describe_frame(frame)
+
+        assert described["status"].tolist() == ["failed", "failed"]
+        assert described["error"].tolist() == ["down", "down"]
+
+    @pytest.mark.unit
+    def test_missing_features_sent_as_empty(self, pd, fake_client):
+        """Test null and NaN feature cells do not reach the prompt as text"""
+        pipeline = make_pipeline(fake_client)
+        frame = pd.DataFrame(
+            {"product_name": ["Lamp", "Desk"], "features": [None, float("nan")]}, dtype=object
+        )
+
+        described = pipeline.describe_frame(frame)
+
+        assert described["status"].tolist() == ["generated", "generated"]
+        for call in pipeline.generator.client.chat.completions.calls:
+            assert "KEY FEATURES:\n\n" in call["messages"][-1]["content"]
@@ -59,6 +59,14 @@ class TestConfig:
         """Test configuration validation"""
         assert Config.validate() is True
 
+    @pytest.mark.unit
+    def test_config_load_is_idempotent(self):
+        """Test loading configuration twice keeps the same values"""
+        Config.load()
+        api_key = Config.GROQ_API_KEY
+        Config.load()
+        assert Config.GROQ_API_KEY == api_key
+
     @pytest.mark.unit
     def test_config_is_production_method(self):
         """Test production environment detection"""
@@ -0,0 +1,83 @@
+"""
+Unit tests for constraint-aware early termination
+"""
+import pytest
+
+from src.generators.backends import GroqBackend
+from src.generators.constraints import OutputConstraint, constraint_for
+from src.generators.content_generator import ContentGenerator
+from src.generators.profiles import GenerationProfile
+
+
+class TestOutputConstraint:
+    """Test suite for length and structure constraints"""
+
+    @pytest.mark.unit
+    def test_constraint_for_content_types(self):
+        """Test constraints derived from request parameters"""
+        assert constraint_for("blog_post", {"word_count": 300}).max_words == 360
+        assert constraint_for("social_post", {"platform": "Twitter/X"}).max_chars == 280
+        assert constraint_for("social_post", {"platform": "LinkedIn"}) is None
+        assert constraint_for("ad_copy", {}).sections[-1] == "CTA:"
+
+    @pytest.mark.unit
+    def test_trim_to_sentence_within_word_limit(self):
+        """Test overshooting text is cut back to a sentence boundary"""
+        constraint = OutputConstraint(max_words=6)
+        text = "One two three. Four five six seven. Eight nine."
+        assert constraint.is_complete(text)
+        assert constraint.trim(text) == "One two three."
+
+    @pytest.mark.unit
+    def test_sections_complete_after_last_marker_line(self):
+        """Test structure is complete once the last marker line ends"""
+        constraint = OutputConstraint(sections=("VARIATION A", "VARIATION C", "CTA:"))
+        partial = "VARIATION A:\nCTA: Go\nVARIATION C:\nCTA: Buy"
+        assert not constraint.is_complete(partial)
+        assert constraint.is_complete(partial + " now\nExtra notes")
+        assert constraint.trim(partial + " now\nExtra notes").endswith("CTA: Buy now")
+
+
+class TestStreamingTermination:
+    """Test the generator closes streams once constraints are met"""
+
+    @pytest.mark.unit
+    def test_stream_closed_early_and_tokens_saved(self, fake_client):
+        """Test a streamed response is cut off at the character limit"""
+        generator = ContentGenerator()
+        client = fake_client(" ".join(["Sentence number one."] * 100))
+        generator.backends["groq"] = GroqBackend(client=client)
+        profile = GenerationProfile(stream=True, max_tokens=500)
+
+        result = generator._call_api(
+            "prompt", profile=profile, constraint=OutputConstraint(max_chars=100)
+        )
+
+        calls = generator.client.chat.completions.calls
+        assert calls[0]["stream"] is True
+        assert result["terminated_early"] is True
+        assert result["tokens_saved"] > 0
+        assert len(result["content"]) <= 100
+
+    @pytest.mark.unit
+    def test_tokens_saved_not_whole_budget(self, fake_client):
+        """Test an early stop near the requested length credits no unused budget"""
+        generator = ContentGenerator()
+        client = fake_client(" ".join(["Sentence number one."] * 100))
+        generator.backends["groq"] = GroqBackend(client=client)
+        profile = GenerationProfile(stream=True, max_tokens=3000)
+
+        result = generator._call_api(
+            "prompt", profile=profile, constraint=OutputConstraint(max_words=60)
+        )
+
+        assert result["terminated_early"] is True
+        assert result["tokens_saved"] < 100
+
+    @pytest.mark.unit
+    def test_stop_sequences_sent(self, fake_client):
+        """Test template stop sequences reach the API"""
+        generator = ContentGenerator()
+        generator.backends["groq"] = GroqBackend(client=fake_client("Landing page"))
+        generator.generate_landing_page("Offer", "Audience", "Casual")
+        assert "\n\nNote:" in generator.client.chat.completions.calls[0]["stop"]
@@ -0,0 +1,171 @@
+"""
+Unit tests for resuming truncated and interrupted generations
+"""
+from types import SimpleNamespace
+
+import pytest
+
+from src.generators.admission import AdmissionDecision
+from src.generators.backends import Completion, CompletionStream, LLMBackend
+from src.generators.constraints import OutputConstraint, estimate_tokens
+from src.generators.content_generator import ContentGenerator
+from src.generators.continuation import merge_continuation
+from src.generators.profiles import GenerationProfile
+
+
+class ScriptedBackend(LLMBackend):
+    """Unmetered backend replaying (text, finish_reason) replies; an exception
+    as finish_reason makes the stream fail after sending the text"""
+
+    uses_api_budget = False
+
+    def __init__(self, *replies):
+        self.replies = list(replies)
+        self.requests = []
+
+    def _next(self, request):
+        self.requests.append(request)
+        return self.replies.pop(0)
+
+    def complete(self, request):
+        text, finish_reason = self._next(request)
+        return Completion(text, 0, finish_reason)
+
+    def stream(self, request):
+        text, finish_reason = self._next(request)
+
+        def chunks():
+            for word in text.split(" "):
+                yield word + " ", None, None
+            if isinstance(finish_reason, Exception):
+                raise finish_reason
+            yield "", None, finish_reason
+
+        return CompletionStream(chunks())
+
+    async def acomplete(self, request):
+        return self.complete(request)
+
+    async def astream(self, request):
+        raise NotImplementedError
+
+
+def generator_with(backend):
+    generator = ContentGenerator()
+    generator.backends["scripted"] = backend
+    return generator
+
+
+class TestMergeContinuation:
+    """Test joining continuations onto partial output"""
+
+    @pytest.mark.unit
+    def test_repeated_words_dropped(self):
+        """Test text the model restates is not duplicated"""
+        merged = merge_continuation("The quick brown fox jumps", " brown fox jumps over the dog")
+        assert merged == "The quick brown fox jumps over the dog"
+
+    @pytest.mark.unit
+    def test_plain_continuation_appended(self):
+        """Test a continuation without overlap is appended as is"""
+        merged = merge_continuation("Half a sent", "ence, then more.")
+        assert merged == "Half a sentence, then more."
+        assert merge_continuation("", "Fresh start") == "Fresh start"
+
+
+class TestContinuations:
+    """Test the generator resumes instead of restarting"""
+
+    @pytest.mark.unit
+    def test_length_cutoff_continued(self):
+        """Test output stopped by the token limit is continued with the partial text"""
+        backend = ScriptedBackend(
+            ("First half of the article", "length"), ("the article, second half.", "stop")
+        )
+        generator = generator_with(backend)
+        profile = GenerationProfile(backend="scripted", max_continuations=2)
+
+        result = generator._call_api("prompt", profile=profile)
+
+        assert result["content"] == "First half of the article, second half."
+        assert result["continuations"] == 1
+        assert result["tokens_salvaged"] > 0
+        follow_up = backend.requests[1].messages
+        assert follow_up[-2] == {"role": "assistant", "content": "First half of the article"}
+        assert "cut off" in follow_up[-1]["content"]
+
+    @pytest.mark.unit
+    def test_continuations_capped(self):
+        """Test no more than max_continuations follow-up calls are made"""
+        backend = ScriptedBackend(*[(f"Part {i}.", "length") for i in range(5)])
+        generator = generator_with(backend)
+        profile = GenerationProfile(backend="scripted", max_continuations=1)
+
+        result = generator._call_api("prompt", profile=profile)
+
+        assert len(backend.requests) == 2
+        assert result["continuations"] == 1
+        assert result["content"] == "Part 0.Part 1."
+
+    @pytest.mark.unit
+    def test_salvaged_text_counted_once(self):
+        """Test each chunk counts as salvaged once, not again at every later resume"""
+        backend = ScriptedBackend(("A" * 40, "length"), ("B" * 40, "length"), ("C.", "stop"))
+        generator = generator_with(backend)
+        profile = GenerationProfile(backend="scripted", max_continuations=2)
+
+        result = generator._call_api("prompt", profile=profile)
+
+        assert result["continuations"] == 2
+        assert result["tokens_salvaged"] == estimate_tokens("A" * 40 + "B" * 40)
+
+    @pytest.mark.unit
+    def test_degraded_request_not_continued(self):
+        """Test output shortened under load is not extended by continuations"""
+        backend = ScriptedBackend(("Shortened answer", "length"), ("never sent", "stop"))
+        backend.uses_api_budget = True
+        generator = generator_with(backend)
+        degraded = AdmissionDecision(True, True, 15, "expected wait 15s")
+        generator.admission = SimpleNamespace(check=lambda lane: degraded, max_wait=None)
+        profile = GenerationProfile(backend="scripted", max_continuations=2)
+
+        result = generator._call_api("prompt", profile=profile)
+
+        assert result["degraded"] is True
+        assert result["continuations"] == 0
+        assert len(backend.requests) == 1
+
+    @pytest.mark.unit
+    def test_interrupted_stream_resumed_on_retry(self):
+        """Test a retry after a dropped stream continues the text received"""
+        backend = ScriptedBackend(
+            ("Intro paragraph about email marketing", ConnectionError("reset")),
+            ("email marketing and the rest of the post.", "stop"),
+        )
+        generator = generator_with(backend)
+        profile = GenerationProfile(backend="scripted", stream=True, retry_delay=0.0)
+
+        result = generator._call_api(
+            "prompt", profile=profile, constraint=OutputConstraint(max_words=500)
+        )
+
+        assert result["success"] is True
+        assert result["content"].strip() == (
+            "Intro paragraph about email marketing and the rest of the post."
+        )
+        assert result["tokens_salvaged"] > 0
+        assert backend.requests[1].messages[-2]["role"] == "assistant"
+
+    @pytest.mark.unit
+    def test_partial_kept_when_retries_exhausted(self):
+        """Test the text received is returned alongside the failure"""
+        backend = ScriptedBackend(("Some text", ConnectionError("reset")))
+        generator = generator_with(backend)
+        profile = GenerationProfile(backend="scripted", stream=True, max_retries=1)
+
+        result = generator._call_api(
+            "prompt", profile=profile, constraint=OutputConstraint(max_words=500)
+        )
+
+        assert result["success"] is False
+        assert result["partial_content"].strip() == "Some text"
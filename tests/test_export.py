@@ -0,0 +1,71 @@
+"""
+Unit tests for streaming bulk export
+"""
+import json
+import zipfile
+from datetime import datetime
+
+import pytest
+
+from src.utils.export import export_jsonl, export_zip, iter_rows, iter_scored
+
+
+def history(count):
+    """Generator of history items like app.py stores in session state"""
+    for index in range(count):
+        yield {
+            "timestamp": datetime(2025, 1, 1, 12, 0, index % 60),
+            "type": "Blog Post",
+            "result": {
+                "content": f"Post {index}",
+                "tokens": 100 + index,
+                "time": 1.5,
+                "model": "test-model",
+                "type": "blog_post",
+                "parameters": {"topic": f"Topic {index}"},
+            },
+        }
+
+
+class TestExport:
+    """Test suite for the exporters"""
+
+    @pytest.mark.unit
+    def test_column_selection(self):
+        """Test only requested columns are emitted"""
+        rows = list(iter_rows(history(2), ["type", "tokens"]))
+        assert rows == [{"type": "blog_post", "tokens": 100}, {"type": "blog_post", "tokens": 101}]
+
+    @pytest.mark.unit
+    def test_unknown_column_rejected(self):
+        """Test typos in column names fail loudly"""
+        with pytest.raises(ValueError):
+            list(iter_rows(history(1), ["tokenz"]))
+
+    @pytest.mark.unit
+    def test_export_jsonl_streams_generator(self, tmp_path):
+        """Test JSONL export consumes a generator and writes every row"""
+        path = tmp_path / "out.jsonl"
+        assert export_jsonl(history(50), str(path)) == 50
+        lines = path.read_text().splitlines()
+        assert json.loads(lines[3])["parameters"] == {"topic": "Topic 3"}
+        assert json.loads(lines[0])["timestamp"] == "2025-01-01T12:00:00"
+
+    @pytest.mark.unit
+    def test_export_zip_with_manifest(self, tmp_path):
+        """Test ZIP export writes one file per piece plus a manifest"""
+        path = tmp_path / "out.zip"
+        assert export_zip(history(3), str(path), columns=["content", "tokens"]) == 3
+        with zipfile.ZipFile(path) as archive:
+            assert archive.read("000001_blog_post.md").decode() == "Post 1"
+            manifest = archive.read("manifest.jsonl").decode().splitlines()
+        assert json.loads(manifest[2]) == {"file": "000002_blog_post.md", "tokens": 102}
+
+    @pytest.mark.unit
+    def test_scores_added_in_chunks(self, tmp_path):
+        """Test scored exports carry a scores column for every record"""
+        pytest.importorskip("numpy")
+        path = tmp_path / "out.jsonl"
+        assert export_jsonl(iter_scored(history(5), chunk_size=2), str(path), ["scores"]) == 5
+        rows = [json.loads(line) for line in path.read_text().splitlines()]
+        assert all(row["scores"]["words"] == 2 for row in rows)
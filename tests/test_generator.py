@@ -23,6 +23,12 @@ class TestContentGeneratorInit:
         assert generator.client is not None
         assert generator.model == "llama-3.3-70b-versatile"
 
+    @pytest.mark.unit
+    def test_client_created_lazily(self):
+        """Test the SDK client is not constructed until first use"""
+        generator = ContentGenerator()
+        assert generator.backends["groq"]._client is None
+
 
 class TestContentGeneratorAPI:
     """Test API call functionality"""
@@ -0,0 +1,162 @@
+"""
+Unit tests for the durable job queue and workers
+"""
+import pytest
+
+from config import Config
+from src.jobs.job_queue import (
+    DONE,
+    FAILED,
+    PENDING,
+    RUNNING,
+    Job,
+    JobQueue,
+    SQLiteJobBackend,
+)
+from src.jobs.worker import Worker
+
+
+class FakeGenerator:
+    """Stand-in for ContentGenerator that records calls"""
+
+    def __init__(self, succeed=True):
+        self.succeed = succeed
+        self.calls = []
+
+    def generate_social_post(self, topic, platform, tone):
+        self.calls.append((topic, platform, tone))
+        if self.succeed:
+            return {"content": f"{topic} on {platform}", "tokens": 10, "success": True}
+        return {"content": None, "error": "boom", "success": False}
+
+
+@pytest.fixture
+def queue(tmp_path):
+    """Fixture for a queue on a temporary database"""
+    return JobQueue("test", SQLiteJobBackend(str(tmp_path / "jobs.db")))
+
+
+class TestJobQueue:
+    """Test suite for leasing and retry behaviour"""
+
+    @pytest.mark.unit
+    def test_submit_and_metrics(self, queue):
+        """Test submitted jobs show up as queue depth"""
+        queue.submit("generate_social_post", topic="AI", platform="LinkedIn", tone="Casual")
+        metrics = queue.metrics()
+        assert metrics[PENDING] == 1
+        assert metrics["depth"] == 1
+
+    @pytest.mark.unit
+    def test_claim_is_exclusive(self, queue):
+        """Test a leased job cannot be claimed by another worker"""
+        queue.submit("generate_social_post", topic="AI", platform="LinkedIn", tone="Casual")
+        first = queue.backend.claim("test", "worker-a", lease_seconds=60)
+        second = queue.backend.claim("test", "worker-b", lease_seconds=60)
+        assert first is not None
+        assert first.status == RUNNING
+        assert second is None
+
+    @pytest.mark.unit
+    def test_expired_lease_is_reclaimed(self, queue):
+        """Test jobs from crashed workers are retried after lease expiry"""
+        job_id = queue.submit("generate_social_post", topic="AI", platform="X", tone="Casual")
+        queue.backend.claim("test", "worker-a", lease_seconds=-1)
+        reclaimed = queue.backend.claim("test", "worker-b", lease_seconds=60)
+        assert reclaimed.id == job_id
+        assert reclaimed.attempts == 2
+        assert not queue.backend.complete(job_id, "worker-a", {"success": True})
+
+    @pytest.mark.unit
+    def test_worker_completes_job(self, queue):
+        """Test worker executes generator methods and stores results"""
+        generator = FakeGenerator()
+        job_id = queue.submit("generate_social_post", topic="AI", platform="X", tone="Casual")
+        worker = Worker(queue.backend, ["test"], generator=generator)
+
+        assert worker.run_once() is True
+        job = queue.get(job_id)
+        assert job.status == DONE
+        assert job.result["content"] == "AI on X"
+        assert generator.calls == [("AI", "X", "Casual")]
+
+    @pytest.mark.unit
+    def test_worker_fails_after_max_attempts(self, queue):
+        """Test failing jobs are retried then marked failed"""
+        job_id = queue.submit(
+            "generate_social_post", max_attempts=1, topic="AI", platform="X", tone="Casual"
+        )
+        worker = Worker(queue.backend, ["test"], generator=FakeGenerator(succeed=False))
+        worker.run_once()
+        job = queue.get(job_id)
+        assert job.status == FAILED
+        assert job.error == "boom"
+
+    @pytest.mark.unit
+    def test_worker_rejects_unknown_method(self, queue):
+        """Test only generator methods can be queued"""
+        job_id = queue.submit("__init__", max_attempts=1)
+        Worker(queue.backend, ["test"], generator=FakeGenerator()).run_once()
+        assert queue.get(job_id).status == FAILED
+
+    @pytest.mark.unit
+    def test_worker_defers_busy_job_without_using_attempt(self, queue):
+        """Test a job shed by admission control goes back to the queue intact"""
+
+        class BusyGenerator(FakeGenerator):
+            def generate_social_post(self, topic, platform, tone):
+                busy = {"busy": True, "retry_after": 30}
+                return {"content": None, "error": "busy", "success": False, **busy}
+
+        job_id = queue.submit(
+            "generate_social_post", max_attempts=1, topic="AI", platform="X", tone="Casual"
+        )
+        Worker(queue.backend, ["test"], generator=BusyGenerator()).run_once()
+        job = queue.get(job_id)
+        assert job.status == PENDING
+        assert job.attempts == 0
+        assert queue.backend.claim("test", "worker-b", lease_seconds=60) is None
+
+    @pytest.mark.unit
+    def test_shortest_predicted_job_claimed_first(self, tmp_path):
+        """Test jobs are claimed by deadline, then predicted cost"""
+        costs = {"long": 40.0, "short": 3.0, "medium": 10.0}
+        queue = JobQueue(
+            "test",
+            SQLiteJobBackend(str(tmp_path / "jobs.db")),
+            estimator=lambda method, params: costs[params["topic"]],
+        )
+        for topic in costs:
+            queue.submit("generate_social_post", topic=topic, platform="X", tone="Casual")
+        urgent = queue.submit(
+            "generate_social_post", deadline=1.0, topic="long", platform="X", tone="Casual"
+        )
+
+        claimed = [queue.backend.claim("test", "w", lease_seconds=60) for _ in range(4)]
+
+        assert claimed[0].id == urgent
+        assert [job.params["topic"] for job in claimed[1:]] == ["short", "medium", "long"]
+
+    @pytest.mark.unit
+    def test_long_waiting_job_not_starved(self, tmp_path, monkeypatch):
+        """Test a job waiting past JOB_MAX_WAIT beats shorter newer jobs"""
+        monkeypatch.setattr(Config, "JOB_MAX_WAIT", 60)
+        backend = SQLiteJobBackend(str(tmp_path / "jobs.db"))
+        old = Job(id="old", queue="test", method="m", params={}, cost=99.0)
+        old.created_at -= 120
+        backend.enqueue(old)
+        backend.enqueue(Job(id="new", queue="test", method="m", params={}, cost=1.0))
+
+        assert backend.claim("test", "w", lease_seconds=60).id == "old"
+
+    @pytest.mark.unit
+    def test_default_estimator_orders_by_prediction(self, queue):
+        """Test queues predict job cost without an explicit estimator"""
+        blog = {"topic": "T", "keywords": "k", "tone": "Casual", "word_count": 1500}
+        queue.submit("generate_blog_post", **blog)
+        queue.submit("generate_social_post", topic="T", platform="X", tone="Casual")
+
+        first = queue.backend.claim("test", "w", lease_seconds=60)
+
+        assert first.method == "generate_social_post"
+        assert 0 < first.cost < queue.get(queue.submit("generate_blog_post", **blog)).cost
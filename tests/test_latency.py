@@ -0,0 +1,130 @@
+"""
+Unit tests for latency prediction
+"""
+import time
+
+import pytest
+
+from src.generators.backends import GroqBackend
+from src.generators.constraints import OutputConstraint
+from src.generators.content_generator import ContentGenerator
+from src.generators.latency import LatencyPredictor, Prediction, target_tokens
+
+
+def train(predictor, samples=20, content_type="email", model="m"):
+    """Record calls whose completion is half the target at 100 tokens/s plus 0.5s"""
+    for index in range(samples):
+        target = 200 + 40 * index
+        completion = target // 2
+        latency = 0.5 + completion / 100
+        predictor.observe(content_type, model, 50, target, completion, latency, Prediction(0, 1.0))
+
+
+class TestLatencyPredictor:
+    """Test suite for fitting, persistence and accuracy reporting"""
+
+    @pytest.mark.unit
+    def test_word_target_drives_length(self):
+        """Test a word count constraint sets the target below max_tokens"""
+        assert target_tokens(2000, OutputConstraint(max_words=600)) == 800
+        assert target_tokens(2000) == 2000
+
+    @pytest.mark.unit
+    def test_prior_before_data(self):
+        """Test predictions exist and grow with the target before any calls are recorded"""
+        predictor = LatencyPredictor()
+        short = predictor.predict("social_post", "m", 100)
+        long = predictor.predict("blog_post", "m", 2000)
+        assert 0 < short.latency < long.latency
+
+    @pytest.mark.unit
+    def test_fit_learns_recorded_behaviour(self):
+        """Test fitted predictions match the recorded relationship"""
+        predictor = LatencyPredictor()
+        train(predictor)
+        prediction = predictor.predict("email", "m", 600)
+        assert prediction.completion_tokens == pytest.approx(300, abs=5)
+        assert prediction.latency == pytest.approx(3.5, abs=0.1)
+
+    @pytest.mark.unit
+    def test_prompt_size_is_a_latency_feature(self):
+        """Test longer prompts predict longer calls once prompt size varies"""
+        predictor = LatencyPredictor()
+        for index in range(30):
+            prompt_tokens = 100 + 300 * (index % 4)
+            completion = 100 + 20 * index
+            latency = 0.5 + completion / 100 + prompt_tokens / 1000
+            predictor.observe(
+                "email", "m", prompt_tokens, 400, completion, latency, Prediction(0, 1.0)
+            )
+
+        short = predictor.predict("email", "m", 400, prompt_tokens=100)
+        long = predictor.predict("email", "m", 400, prompt_tokens=1000)
+        assert long.latency - short.latency == pytest.approx(0.9, abs=0.05)
+
+    @pytest.mark.unit
+    def test_samples_persist_across_processes(self, tmp_path):
+        """Test a new predictor on the same store starts from recorded samples"""
+        path = str(tmp_path / "latency.db")
+        train(LatencyPredictor(path))
+        prediction = LatencyPredictor(path).predict("email", "m", 600)
+        assert prediction.latency == pytest.approx(3.5, abs=0.1)
+
+    @pytest.mark.unit
+    def test_accuracy_flags_drift(self):
+        """Test recent errors well above the long-run error are reported as drift"""
+        predictor = LatencyPredictor()
+        three_days_ago = time.time() - 3 * 86400
+        for _ in range(30):
+            predictor._fit(three_days_ago, "email", "m", 50, 400, 200, 2.0, 200, 2.0)
+        assert predictor.accuracy()["latency_mape"] == 0.0
+
+        for _ in range(10):
+            predictor.observe("email", "m", 50, 400, 200, 4.0, Prediction(200, 2.0))
+
+        report = predictor.accuracy()
+        assert report["samples"] == 40
+        assert report["latency_mape"] == pytest.approx(0.125)
+        assert report["recent_latency_mape"] == pytest.approx(0.5)
+        assert report["drifting"] is True
+
+
+class TestGeneratorEstimates:
+    """Test suite for ETAs and recorded samples in the generator"""
+
+    @pytest.mark.unit
+    def test_calls_are_recorded_with_their_prediction(self, fake_client):
+        """Test each API call feeds the predictor and reports the predicted time"""
+        generator = ContentGenerator(predictor=LatencyPredictor())
+        generator.backends["groq"] = GroqBackend(client=fake_client("Hello " * 50))
+
+        result = generator.generate_email("Welcome", "New users", "Friendly")
+
+        assert result["predicted_time"] > 0
+        assert generator.predictor.accuracy()["samples"] == 1
+
+    @pytest.mark.unit
+    def test_estimate_includes_queue_wait_and_cache(self, fake_client):
+        """Test the ETA adds expected queueing and is zero for cached requests"""
+        generator = ContentGenerator(predictor=LatencyPredictor())
+        generator.backends["groq"] = GroqBackend(client=fake_client("Post"))
+        params = {"topic": "Launch", "platform": "LinkedIn", "tone": "Casual"}
+
+        estimate = generator.estimate("social_post", **params)
+        assert estimate["eta"] == pytest.approx(estimate["time"] + estimate["queue_wait"])
+        assert estimate["time"] > 0
+
+        generator.generate_social_post(**params)
+        assert generator.estimate("social_post", **params)["eta"] == 0.0
+
+    @pytest.mark.unit
+    def test_estimate_job_for_queued_methods(self):
+        """Test job estimates cover generate_* methods and ignore unknown ones"""
+        generator = ContentGenerator(predictor=LatencyPredictor())
+        blog = {"topic": "T", "keywords": "k", "tone": "Casual", "word_count": 1500}
+        social = {"topic": "T", "platform": "LinkedIn", "tone": "Casual"}
+
+        assert generator.estimate_job("generate_blog_post", blog) > generator.estimate_job(
+            "generate_social_post", social
+        )
+        assert generator.estimate_job("repair_sections", {}) == 0.0
@@ -0,0 +1,89 @@
+"""
+Unit tests for the usage ledger, rollups and quota hooks
+"""
+import pytest
+
+from src.generators.backends import GroqBackend
+from src.generators.content_generator import ContentGenerator
+from src.utils.ledger import DailyTokenQuota, QuotaExceededError, UsageLedger, summarize
+from src.utils.request_context import request_scope
+
+
+@pytest.fixture
+def ledger(tmp_path):
+    """Fixture for a ledger on a temporary database"""
+    return UsageLedger(str(tmp_path / "usage.db"))
+
+
+class TestUsageLedger:
+    """Test suite for recording and rolling up usage"""
+
+    @pytest.mark.unit
+    def test_rollups_updated_incrementally(self, ledger):
+        """Test hourly and daily rollups accumulate each recorded call"""
+        ledger.record("acme", "blog_post", "m", 100, 2.0, 0, True, ts=7200)
+        ledger.record("acme", "blog_post", "m", 50, 1.0, 1, False, ts=7300)
+
+        conn = ledger._connection()
+        hourly = conn.execute(
+            "SELECT calls, failures, tokens, retries FROM usage_hourly"
+        ).fetchall()
+        daily = conn.execute("SELECT bucket, tokens FROM usage_daily").fetchall()
+        events = conn.execute("SELECT COUNT(*) FROM usage_events").fetchone()[0]
+
+        assert hourly == [(2, 1, 150, 1)]
+        assert daily == [(0, 150)]
+        assert events == 2
+
+    @pytest.mark.unit
+    def test_daily_quota_hook(self, ledger):
+        """Test quota hooks block clients over their daily budget"""
+        ledger.quota_hooks.append(DailyTokenQuota({"acme": 1000}))
+        ledger.record("acme", "email", "m", 900, 1.0, 0, True)
+
+        ledger.check_quota("other", 5000)
+        with pytest.raises(QuotaExceededError):
+            ledger.check_quota("acme", 200)
+
+    @pytest.mark.unit
+    def test_generator_records_usage_with_context(self, ledger, fake_client):
+        """Test every API call is attributed to the requesting client and type"""
+        generator = ContentGenerator(ledger=ledger)
+        generator.backends["groq"] = GroqBackend(client=fake_client("Product copy"))
+
+        with request_scope(client="acme"):
+            generator.generate_product_description("Lamp", "Bright", "Casual")
+
+        row = (
+            ledger._connection()
+            .execute("SELECT client, content_type, success FROM usage_events")
+            .fetchone()
+        )
+        assert row == ("acme", "product_description", 1)
+
+    @pytest.mark.unit
+    def test_generator_blocked_by_quota(self, ledger, fake_client):
+        """Test a blocked request never reaches the API"""
+        ledger.quota_hooks.append(DailyTokenQuota({}, default_limit=10))
+        generator = ContentGenerator(ledger=ledger)
+        generator.backends["groq"] = GroqBackend(client=fake_client("unused"))
+
+        result = generator.generate_email("Welcome", "Subscribers", "Friendly")
+
+        assert result["success"] is False
+        assert result["quota_exceeded"] is True
+        assert generator.client.chat.completions.calls == []
+
+    @pytest.mark.unit
+    def test_summarize_by_content_type(self, ledger):
+        """Test vectorized summary of rollups with cost estimate"""
+        pytest.importorskip("pandas")
+        ledger.record("acme", "blog_post", "llama-3.3-70b-versatile", 1_000_000, 4.0, 0, True)
+        ledger.record("acme", "email", "llama-3.3-70b-versatile", 10, 1.0, 0, False)
+
+        summary = summarize(ledger.rollups("daily"), ["content_type"])
+
+        top = summary.iloc[0]
+        assert top["content_type"] == "blog_post"
+        assert top["cost"] == pytest.approx(0.69)
+        assert summary.iloc[1]["failure_rate"] == 1.0
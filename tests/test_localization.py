@@ -0,0 +1,120 @@
+"""
+Unit tests for multi-locale fan-out
+"""
+import json
+import time
+
+import pytest
+
+from src.generators.backends import GroqBackend
+from src.generators.content_generator import ContentGenerator
+from src.generators.localization import generate_localized, localize
+
+LONG_POST = "Email marketing still delivers the best return of any channel. " * 40
+
+
+class TestLocalization:
+    """Test suite for translation fan-out, batching and caching"""
+
+    @pytest.mark.unit
+    def test_source_generated_once_and_locales_fan_out(self, fake_client):
+        """Test one generation plus one translation call per locale"""
+        generator = ContentGenerator()
+        generator.backends["groq"] = GroqBackend(client=fake_client(LONG_POST))
+
+        outcome = generate_localized(
+            generator,
+            "generate_blog_post",
+            ["de-DE", "fr-FR", "ja-JP"],
+            topic="Email",
+            keywords="email",
+            tone="Professional",
+            word_count=500,
+        )
+
+        calls = generator.client.chat.completions.calls
+        prompts = [call["messages"][1]["content"] for call in calls]
+        assert len(calls) == 4
+        assert sum("Translate and culturally adapt" in prompt for prompt in prompts) == 3
+        assert set(outcome.translations) == {"de-DE", "fr-FR", "ja-JP"}
+        assert outcome.translations["ja-JP"]["locale"] == "ja-JP"
+        assert outcome.translations["ja-JP"]["type"] == "blog_post"
+
+    @pytest.mark.unit
+    def test_translations_cached_per_source_and_locale(self, fake_client):
+        """Test re-localizing an unchanged piece makes no new calls"""
+        generator = ContentGenerator()
+        generator.backends["groq"] = GroqBackend(client=fake_client("Übersetzt " * 200))
+        source = {"content": LONG_POST, "type": "blog_post", "success": True}
+
+        localize(generator, source, ["de-DE"])
+        again = localize(generator, source, ["de-DE"])
+
+        assert len(generator.client.chat.completions.calls) == 1
+        assert again.translations["de-DE"]["cached"] is True
+
+    @pytest.mark.unit
+    def test_locales_run_concurrently(self, fake_client):
+        """Test wall-clock stays near one translation, not one per locale"""
+        generator = ContentGenerator()
+        client = fake_client("Translated " * 200)
+        create = client.chat.completions.create
+
+        def slow_create(**kwargs):
+            time.sleep(0.2)
+            return create(**kwargs)
+
+        client.chat.completions.create = slow_create
+        generator.backends["groq"] = GroqBackend(client=client)
+        source = {"content": LONG_POST, "type": "blog_post", "success": True}
+
+        outcome = localize(generator, source, ["de-DE", "fr-FR", "es-ES", "it-IT"])
+
+        assert not outcome.failed
+        assert outcome.elapsed < 0.6
+
+    @pytest.mark.unit
+    def test_short_items_batched_into_one_call(self, fake_client):
+        """Test a social post is localized for every locale in one JSON call"""
+        generator = ContentGenerator()
+        reply = json.dumps({"de-DE": {"1": "Neu! #KI"}, "fr-FR": {"1": "Nouveau ! #IA"}})
+        generator.backends["groq"] = GroqBackend(client=fake_client(reply))
+        source = {"content": "New! #AI", "type": "social_post", "success": True}
+
+        outcome = localize(generator, source, ["de-DE", "fr-FR"])
+        single = generator.translate("New! #AI", "fr-FR", "social_post")
+
+        calls = generator.client.chat.completions.calls
+        assert len(calls) == 1
+        assert calls[0]["response_format"] == {"type": "json_object"}
+        assert outcome.translations["de-DE"]["content"] == "Neu! #KI"
+        assert single["content"] == "Nouveau ! #IA"
+        assert single["cached"] is True
+
+    @pytest.mark.unit
+    def test_batch_split_by_token_budget(self, fake_client):
+        """Test many short items are packed into calls under the budget"""
+        generator = ContentGenerator()
+        reply = json.dumps({"de-DE": {str(i): f"Betreff {i}" for i in range(1, 7)}})
+        generator.backends["groq"] = GroqBackend(client=fake_client(reply))
+        subjects = [f"Subject line number {i}" for i in range(1, 7)]
+
+        translations = generator.translate_batch(subjects, ["de-DE"], "email", max_tokens=120)
+
+        assert len(generator.client.chat.completions.calls) == 3
+        assert translations["de-DE"] == [f"Betreff {i}" for i in range(1, 7)]
+
+    @pytest.mark.unit
+    def test_malformed_locale_falls_back_to_single_call(self, fake_client):
+        """Test a locale mapped to a non-object is retried alone, keeping the others"""
+        generator = ContentGenerator()
+        reply = json.dumps({"de-DE": ["Hallo"], "fr-FR": {"1": "Salut"}})
+        generator.backends["groq"] = GroqBackend(client=fake_client(reply, "Hallo!"))
+        source = {"content": "Hello!", "type": "social_post", "success": True}
+
+        outcome = localize(generator, source, ["de-DE", "fr-FR"])
+
+        assert not outcome.failed
+        assert outcome.translations["fr-FR"]["content"] == "Salut"
+        assert outcome.translations["de-DE"]["content"] == "Hallo!"
+        assert len(generator.client.chat.completions.calls) == 2
@@ -0,0 +1,49 @@
+"""
+Unit tests for the queue-based structured logging pipeline
+"""
+import json
+import logging
+import queue
+
+import pytest
+
+from src.utils.log_pipeline import ContextQueueHandler, JsonFormatter
+from src.utils.request_context import request_scope
+
+
+class TestLogPipeline:
+    """Test suite for deferred formatting and JSON records"""
+
+    @pytest.mark.unit
+    def test_queue_handler_defers_formatting_and_captures_context(self):
+        """Test records are enqueued unformatted with request context attached"""
+        log_queue = queue.SimpleQueue()
+        handler = ContextQueueHandler(log_queue)
+        logger = logging.getLogger("test.pipeline")
+        logger.addHandler(handler)
+        logger.propagate = False
+        try:
+            with request_scope(request_id="req-1", content_type="email"):
+                logger.warning("Generated %d tokens", 42, extra={"tokens": 42})
+        finally:
+            logger.removeHandler(handler)
+
+        record = log_queue.get_nowait()
+        assert record.msg == "Generated %d tokens"
+        assert record.args == (42,)
+        assert record.request_id == "req-1"
+        assert record.content_type == "email"
+
+    @pytest.mark.unit
+    def test_json_formatter_includes_extra_fields(self):
+        """Test JSON lines carry message, context and extra fields"""
+        record = logging.LogRecord("gen", logging.INFO, "", 0, "Took %.1fs", (1.25,), None)
+        record.tokens = 120
+        record.request_id = "abc"
+
+        entry = json.loads(JsonFormatter().format(record))
+
+        assert entry["message"] == "Took 1.2s"
+        assert entry["tokens"] == 120
+        assert entry["request_id"] == "abc"
+        assert entry["level"] == "INFO"
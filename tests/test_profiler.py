@@ -0,0 +1,62 @@
+"""
+Unit tests for the sampling profiler
+"""
+import os
+import time
+
+import pytest
+
+from src.utils.profiler import SamplingProfiler
+
+
+def busy_wait(seconds):
+    end = time.time() + seconds
+    while time.time() < end:
+        pass
+
+
+class TestSamplingProfiler:
+    """Test stack sampling, aggregation and dumps"""
+
+    @pytest.mark.unit
+    def test_disabled_scope_records_nothing(self):
+        """Test scopes are no-ops while profiling is off"""
+        profiler = SamplingProfiler(interval=0.001, enabled=False)
+        with profiler.scope("blog_post"):
+            busy_wait(0.02)
+        assert profiler.collapsed() == {}
+
+    @pytest.mark.unit
+    def test_samples_attributed_to_enclosing_scopes(self):
+        """Test a nested call shows up under both its own and the outer label"""
+        profiler = SamplingProfiler(interval=0.001, enabled=True)
+        try:
+            with profiler.scope("app_rerun"):
+                with profiler.scope("blog_post"):
+                    busy_wait(0.1)
+        finally:
+            profiler.disable()
+
+        summary = profiler.summary()
+        assert summary["blog_post"]["samples"] > 0
+        assert summary["app_rerun"]["samples"] >= summary["blog_post"]["samples"]
+        hottest, _ = summary["blog_post"]["self"][0]
+        assert hottest == "test_profiler.py:busy_wait"
+
+    @pytest.mark.unit
+    def test_dump_writes_collapsed_stacks_and_summary(self, tmp_path):
+        """Test dump() writes flamegraph input per label and a summary"""
+        profiler = SamplingProfiler(interval=0.001, enabled=True)
+        try:
+            with profiler.scope("email"):
+                busy_wait(0.05)
+        finally:
+            profiler.disable()
+
+        paths = profiler.dump(str(tmp_path))
+
+        names = {os.path.basename(path) for path in paths}
+        assert names == {"email.collapsed", "summary.json", "summary.txt"}
+        with open(next(p for p in paths if p.endswith(".collapsed"))) as collapsed:
+            stack, count = collapsed.readline().rsplit(" ", 1)
+        assert ";" in stack and int(count) > 0
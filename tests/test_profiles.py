@@ -0,0 +1,109 @@
+"""
+Unit tests for generation profiles and hot reload
+"""
+import json
+import os
+
+import pytest
+
+from config import Config
+from src.generators.backends import GroqBackend
+from src.generators.content_generator import ContentGenerator
+from src.generators.profiles import ProfileError, ProfileStore, parse_profiles
+
+
+def write_profiles(path, data, mtime=None):
+    """Write a profile file, optionally forcing its mtime"""
+    path.write_text(json.dumps(data))
+    if mtime is not None:
+        os.utime(path, (mtime, mtime))
+
+
+class TestProfiles:
+    """Test suite for profile parsing and lookup"""
+
+    @pytest.mark.unit
+    def test_builtin_token_budgets(self):
+        """Test content types keep their token budgets without a file"""
+        profiles = parse_profiles({})
+        assert profiles[("blog_post", None)].max_tokens == 3000
+        assert profiles[("social_post", None)].max_tokens == 500
+
+    @pytest.mark.unit
+    def test_platform_override_inherits_content_type(self):
+        """Test platform profiles layer on top of the content type"""
+        profiles = parse_profiles(
+            {
+                "defaults": {"temperature": 0.5},
+                "content_types": {
+                    "social_post": {
+                        "cache_ttl": 60,
+                        "platforms": {"Twitter/X": {"max_tokens": 120}},
+                    }
+                },
+            }
+        )
+        twitter = profiles[("social_post", "Twitter/X")]
+        assert twitter.max_tokens == 120
+        assert twitter.cache_ttl == 60
+        assert twitter.temperature == 0.5
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize(
+        "data",
+        [
+            {"defaults": {"temperature": 3}},
+            {"defaults": {"max_tokens": "many"}},
+            {"content_types": {"email": {"unknown": 1}}},
+            {"defaults": []},
+            {"content_types": {"blog_post": 5}},
+            {"content_types": {"social_post": {"platforms": ["Twitter/X"]}}},
+        ],
+    )
+    def test_invalid_profiles_rejected(self, data):
+        """Test invalid values and unknown keys raise ProfileError"""
+        with pytest.raises(ProfileError):
+            parse_profiles(data)
+
+    @pytest.mark.unit
+    def test_hot_reload_and_bad_edit_ignored(self, tmp_path):
+        """Test file changes are picked up and invalid edits keep the last good profile"""
+        path = tmp_path / "profiles.json"
+        write_profiles(path, {"content_types": {"email": {"max_tokens": 800}}}, mtime=1000)
+        store = ProfileStore(str(path), check_interval=0)
+        assert store.get("email").max_tokens == 800
+
+        write_profiles(path, {"content_types": {"email": {"max_tokens": 900}}}, mtime=2000)
+        assert store.get("email").max_tokens == 900
+
+        write_profiles(path, {"content_types": {"email": {"max_tokens": -1}}}, mtime=3000)
+        assert store.get("email").max_tokens == 900
+
+        write_profiles(path, {"content_types": {"email": 5}}, mtime=4000)
+        assert store.get("email").max_tokens == 900
+
+    @pytest.mark.unit
+    def test_defaults_read_config_when_built(self, monkeypatch):
+        """Test profile defaults follow Config values loaded after import"""
+        monkeypatch.setattr(Config, "GROQ_MODEL", "llama-test")
+        monkeypatch.setattr(Config, "MAX_CONTINUATIONS", 5)
+        profile = parse_profiles({})[("default", None)]
+        assert profile.model == "llama-test"
+        assert profile.max_continuations == 5
+
+    @pytest.mark.unit
+    def test_generator_uses_profile_and_cache(self, tmp_path, fake_client):
+        """Test generate_* applies the profile and serves repeats from cache"""
+        path = tmp_path / "profiles.json"
+        write_profiles(path, {"content_types": {"ad_copy": {"max_tokens": 321, "cache_ttl": 60}}})
+        generator = ContentGenerator(ProfileStore(str(path)))
+        generator.backends["groq"] = GroqBackend(client=fake_client("VARIATION A: Buy now"))
+
+        first = generator.generate_ad_copy("Widget", "Makers", "Casual")
+        second = generator.generate_ad_copy("Widget", "Makers", "Casual")
+
+        calls = generator.client.chat.completions.calls
+        assert len(calls) == 1
+        assert calls[0]["max_tokens"] == 321
+        assert first["type"] == "ad_copy"
+        assert second.get("cached") is True
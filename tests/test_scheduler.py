@@ -0,0 +1,108 @@
+"""
+Unit tests for the fair-share scheduler
+"""
+import threading
+import time
+
+import pytest
+
+from src.generators.scheduler import FairScheduler, SchedulerTimeout
+
+
+def queue_requests(scheduler, requests, order):
+    """Start one thread per (lane, client) request, waiting until each is queued"""
+    threads = []
+    for lane, client in requests:
+
+        def run(lane=lane, client=client):
+            with scheduler.slot(lane, client, estimated_tokens=10):
+                order.append((lane, client))
+
+        thread = threading.Thread(target=run)
+        thread.start()
+        expected = len(threads) + 1
+        while sum(lane["waiting"] for lane in scheduler.metrics()["lanes"].values()) < expected:
+            time.sleep(0.001)
+        threads.append(thread)
+    return threads
+
+
+class TestFairScheduler:
+    """Test suite for lanes, fairness and budgets"""
+
+    @pytest.mark.unit
+    def test_interactive_lane_preempts_batch(self):
+        """Test queued interactive work is admitted before earlier batch work"""
+        scheduler = FairScheduler(max_concurrency=1)
+        order = []
+        scheduler.acquire("batch", "bulk")
+        threads = queue_requests(
+            scheduler, [("batch", "bulk"), ("api", "svc"), ("interactive", "user")], order
+        )
+
+        scheduler.release()
+        for thread in threads:
+            thread.join(timeout=2)
+
+        assert [lane for lane, _ in order] == ["interactive", "api", "batch"]
+
+    @pytest.mark.unit
+    def test_fair_share_between_clients(self):
+        """Test a client with a deep backlog cannot starve another client"""
+        scheduler = FairScheduler(max_concurrency=1)
+        order = []
+        scheduler.acquire("batch", "big")
+        threads = queue_requests(
+            scheduler,
+            [("batch", "big"), ("batch", "big"), ("batch", "big"), ("batch", "small")],
+            order,
+        )
+
+        scheduler.release()
+        for thread in threads:
+            thread.join(timeout=2)
+
+        assert [client for _, client in order][:2] == ["big", "small"]
+
+    @pytest.mark.unit
+    def test_token_budget_and_timeout(self):
+        """Test requests beyond the token budget wait and can time out"""
+        scheduler = FairScheduler(max_concurrency=4, tokens_per_minute=60)
+        scheduler.acquire("interactive", "a", estimated_tokens=60)
+
+        with pytest.raises(SchedulerTimeout):
+            scheduler.acquire("interactive", "b", estimated_tokens=30, timeout=0.05)
+
+        assert scheduler.metrics()["lanes"]["interactive"]["waiting"] == 0
+
+    @pytest.mark.unit
+    def test_refund_unused_tokens(self):
+        """Test over-estimated tokens are returned to the budget"""
+        scheduler = FairScheduler(max_concurrency=4, tokens_per_minute=100)
+        with scheduler.slot("api", "a", estimated_tokens=100) as slot:
+            slot["actual_tokens"] = 20
+        assert scheduler.metrics()["token_budget"] >= 80
+
+    @pytest.mark.unit
+    def test_metrics_record_waits(self):
+        """Test per-lane admission counts and wait percentiles"""
+        scheduler = FairScheduler(max_concurrency=2)
+        with scheduler.slot("interactive", "a"):
+            pass
+        lane = scheduler.metrics()["lanes"]["interactive"]
+        assert lane["admitted"] == 1
+        assert lane["wait_p95"] >= 0
+
+    @pytest.mark.unit
+    def test_batch_backlog_leaves_interactive_slot(self):
+        """Test saturating batch work cannot hold every slot or drain the budget"""
+        scheduler = FairScheduler(max_concurrency=3, tokens_per_minute=1000)
+        for _ in range(2):
+            scheduler.acquire("batch", "bulk", estimated_tokens=400)
+
+        with pytest.raises(SchedulerTimeout):
+            scheduler.acquire("batch", "bulk", estimated_tokens=100, timeout=0.05)
+
+        waited = scheduler.acquire("interactive", "user", estimated_tokens=100, timeout=0.5)
+        assert waited < 0.5
+        assert scheduler.metrics()["in_flight"] == 3
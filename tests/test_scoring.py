@@ -0,0 +1,89 @@
+"""
+Unit tests for SEO and readability scoring
+"""
+import pytest
+
+from src.generators.scoring import (
+    parse_keywords,
+    score_content,
+    score_many,
+    score_results,
+)
+
+POST = """# Email Marketing Guide
+
+Email marketing still works. It delivers the best return of any channel.
+
+## Why email marketing matters
+
+Subscribers chose to hear from you. That makes every message valuable.
+
+## Getting started
+
+Start a newsletter today and grow your list with automation.
+"""
+
+
+@pytest.fixture(autouse=True)
+def numpy():
+    """Scoring needs NumPy, which only batch tooling installs"""
+    return pytest.importorskip("numpy")
+
+
+class TestScoring:
+    """Test suite for keyword, structure and readability metrics"""
+
+    @pytest.mark.unit
+    def test_keyword_metrics(self):
+        """Test coverage, density and heading placement of target keywords"""
+        scores = score_content(POST, "Email Marketing, automation, SEO tools")
+        assert scores["keyword_coverage"] == pytest.approx(2 / 3, abs=1e-3)
+        assert scores["keywords_in_headings"] == pytest.approx(1 / 3, abs=1e-3)
+        # Three two-word "email marketing" hits plus one "automation"
+        assert scores["keyword_density"] == pytest.approx(7 / scores["words"], abs=1e-3)
+
+    @pytest.mark.unit
+    def test_structure_and_readability(self):
+        """Test headings are excluded from sentence stats and counted by level"""
+        scores = score_content(POST)
+        assert (scores["h1"], scores["subheadings"], scores["heading_skips"]) == (1, 2, 0)
+        assert scores["sentences"] == 5
+        assert scores["paragraphs"] == 3
+        assert scores["reading_ease"] > 50
+        assert scores["keyword_coverage"] is None
+
+    @pytest.mark.unit
+    def test_seo_score_rewards_structure(self):
+        """Test a structured post outscores the same text as one wall of words"""
+        flat = " ".join(line.lstrip("# ") for line in POST.splitlines())
+        keywords = "email marketing, automation"
+        assert (
+            score_content(POST, keywords)["seo_score"] > score_content(flat, keywords)["seo_score"]
+        )
+
+    @pytest.mark.unit
+    def test_batch_matches_single(self):
+        """Test vectorized batch scoring agrees with one-at-a-time scoring"""
+        texts = [POST, "Short text.", "", POST.replace("## Getting", "#### Getting")]
+        batch = score_many(texts, ["email marketing", None, "x", None])
+        assert batch[0] == score_content(POST, "email marketing")
+        assert batch[2]["words"] == 0
+        assert batch[3]["heading_skips"] == 1
+
+    @pytest.mark.unit
+    def test_results_scored_once(self):
+        """Test results get scores from their keywords and keep existing ones"""
+        results = [
+            {"content": POST, "parameters": {"keywords": "automation"}},
+            {"content": POST, "scores": {"seo_score": 1.0}},
+            {"content": None, "success": False},
+        ]
+        score_results(results)
+        assert results[0]["scores"]["keyword_coverage"] == 1.0
+        assert results[1]["scores"] == {"seo_score": 1.0}
+        assert "scores" not in results[2]
+
+    @pytest.mark.unit
+    def test_keywords_parsed_case_insensitively(self):
+        """Test keyword strings are split, trimmed, lower-cased and de-duplicated"""
+        assert parse_keywords(" SEO, seo ,Email Marketing,") == ["seo", "email marketing"]
@@ -0,0 +1,75 @@
+"""
+Unit tests for per-session memory accounting and idle spilling
+"""
+import gc
+import os
+import time
+
+import pytest
+
+from src.utils.session_memory import SessionMemory, SpillableSession, deep_sizeof
+
+
+def make_session(tmp_path):
+    return SpillableSession(
+        str(tmp_path), generated_content=None, generation_history=[{"content": "x" * 50000}]
+    )
+
+
+class TestSessionMemory:
+    """Test session sizing, eviction and lazy restore"""
+
+    @pytest.mark.unit
+    def test_deep_sizeof_counts_nested_payloads(self):
+        """Test nested content is included in the size"""
+        small = deep_sizeof({"history": []})
+        large = deep_sizeof({"history": [{"content": "x" * 100000}]})
+        assert large - small >= 100000
+
+    @pytest.mark.unit
+    def test_idle_session_spilled_and_restored(self, tmp_path):
+        """Test an idle session's payloads go to disk and come back on access"""
+        memory = SessionMemory(idle_seconds=60)
+        session = memory.track(make_session(tmp_path))
+        session.last_access = time.time() - 120
+
+        assert memory.evict_idle() == 1
+        assert session.spilled
+        assert os.path.exists(session.spill_path)
+        assert memory.metrics()["spilled_sessions"] == 1
+        assert memory.metrics()["session_bytes"] == 0
+
+        assert session["generation_history"][0]["content"] == "x" * 50000
+        assert not session.spilled
+        assert not os.path.exists(session.spill_path)
+
+    @pytest.mark.unit
+    def test_active_session_kept_in_memory(self, tmp_path):
+        """Test recently used sessions are not spilled"""
+        memory = SessionMemory(idle_seconds=60)
+        session = memory.track(make_session(tmp_path))
+
+        assert memory.evict_idle() == 0
+        assert memory.metrics()["session_bytes"] >= 50000
+        assert not session.spilled
+
+    @pytest.mark.unit
+    def test_closed_sessions_forgotten_and_files_removed(self, tmp_path):
+        """Test a garbage-collected session leaves no registry entry or spill file"""
+        memory = SessionMemory(idle_seconds=60)
+        session = memory.track(make_session(tmp_path))
+        session.last_access = 0
+        memory.evict_idle()
+        path = session.spill_path
+
+        del session
+        gc.collect()
+
+        assert memory.metrics()["sessions"] == 0
+        assert not os.path.exists(path)
+
+    @pytest.mark.unit
+    def test_shared_resources_sized(self):
+        """Test shared resources are reported by name"""
+        metrics = SessionMemory(idle_seconds=0).metrics(shared={"cache": ["y" * 10000]})
+        assert metrics["shared_bytes"]["cache"] >= 10000
@@ -0,0 +1,113 @@
+"""
+Unit tests for structured JSON output
+"""
+import json
+
+import pytest
+
+from src.generators.backends import GroqBackend
+from src.generators.content_generator import ContentGenerator
+from src.generators.structured import (
+    AdCopyResult,
+    EmailResult,
+    StructuredOutputError,
+    json_schema,
+    parse_structured,
+    repair_json,
+)
+from src.generators.validation import validate_content
+
+EMAIL = {
+    "subject_line": "Welcome aboard",
+    "preview": "Your first week, planned",
+    "body": "Hi there,\n\nThanks for joining.",
+    "cta": "Get started",
+    "ps": "Reply with questions anytime.",
+}
+
+
+class TestStructuredParsing:
+    """Test suite for parsing and local repair"""
+
+    @pytest.mark.unit
+    def test_schema_lists_nested_fields(self):
+        """Test schemas are derived from the result dataclasses"""
+        schema = json_schema(AdCopyResult)
+        item = schema["properties"]["variations"]["items"]
+        assert item["required"] == ["headline", "body", "cta", "usp"]
+
+    @pytest.mark.unit
+    def test_parse_aliases_into_slots_dataclass(self):
+        """Test aliased keys validate into a compact typed result"""
+        data, repaired = parse_structured("email", json.dumps(EMAIL))
+        assert isinstance(data, EmailResult)
+        assert data.subject == "Welcome aboard"
+        assert repaired is False
+        assert not hasattr(data, "__dict__")
+
+    @pytest.mark.unit
+    def test_rendered_text_passes_section_validation(self):
+        """Test the text rendering keeps the template's section layout"""
+        data, _ = parse_structured("email", json.dumps(EMAIL))
+        assert validate_content("email", data.to_text()).valid
+
+    @pytest.mark.unit
+    def test_local_repair_of_fences_and_trailing_commas(self):
+        """Test common defects are fixed without another call"""
+        text = 'Here you go:\n```json\n{"text": "Big news", "hashtags": ["launch",],}\n```'
+        data, repaired = parse_structured("social_post", text)
+        assert repaired is True
+        assert data.hashtags == ("launch",)
+
+    @pytest.mark.unit
+    def test_local_repair_of_truncated_output(self):
+        """Test output cut off mid-object is closed"""
+        assert repair_json('{"text": "Big news", "hashtags": ["launch", "ai') == {
+            "text": "Big news",
+            "hashtags": ["launch", "ai"],
+        }
+        assert repair_json('{"text": "Big news", "hasht') == {"text": "Big news"}
+
+    @pytest.mark.unit
+    def test_missing_field_is_an_error(self):
+        """Test schema violations raise"""
+        with pytest.raises(StructuredOutputError, match="missing 'ps'"):
+            parse_structured("email", json.dumps({k: v for k, v in EMAIL.items() if k != "ps"}))
+
+
+class TestGenerateStructured:
+    """Test suite for the structured generation path"""
+
+    @pytest.mark.unit
+    def test_requests_json_response_format(self, fake_client):
+        """Test the API is asked for a JSON object"""
+        generator = ContentGenerator()
+        generator.backends["groq"] = GroqBackend(client=fake_client(json.dumps(EMAIL)))
+
+        result = generator.generate_structured(
+            "email", purpose="Welcome", audience="Subscribers", tone="Friendly"
+        )
+
+        call = generator.client.chat.completions.calls[0]
+        assert call["response_format"] == {"type": "json_object"}
+        assert result["json_repair"] == "none"
+        assert result["data"].cta == "Get started"
+        assert result["content"].startswith("Subject Line: Welcome aboard")
+
+    @pytest.mark.unit
+    def test_invalid_output_repaired_with_short_call(self, fake_client):
+        """Test a schema violation triggers one repair call, not a regeneration"""
+        generator = ContentGenerator()
+        broken = json.dumps({k: v for k, v in EMAIL.items() if k != "cta"})
+        generator.backends["groq"] = GroqBackend(client=fake_client(broken, json.dumps(EMAIL)))
+
+        result = generator.generate_structured(
+            "email", purpose="Welcome", audience="Subscribers", tone="Friendly"
+        )
+
+        calls = generator.client.chat.completions.calls
+        assert len(calls) == 2
+        assert calls[1]["temperature"] == 0
+        assert "JSON TO FIX" in calls[1]["messages"][1]["content"]
+        assert result["json_repair"] == "api"
+        assert result["success"] is True
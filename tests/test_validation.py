@@ -0,0 +1,154 @@
+"""
+Unit tests for section validation and targeted regeneration
+"""
+import pytest
+
+from src.generators.backends import GroqBackend
+from src.generators.content_generator import ContentGenerator
+from src.generators.validation import merge_section, validate_content
+
+EMAIL = """Subject Line: Welcome aboard!
+Preview Text: Your first week starts here
+
+Hi there,
+
+Thanks for joining us. Here is what to expect.
+
+CTA Button: Get Started
+P.S. Reply to this email with any questions."""
+
+# Shaped like real model output for PromptTemplates.email_template: markdown
+# labels and a CTA written as free text in the body
+REALISTIC_EMAIL = """**Subject Line:** Your 14-day trial starts today
+
+**Preview Text:** Everything you need to launch your first campaign
+
+Hi Sarah,
+
+Welcome to Growces! You're one step away from campaigns that practically write themselves.
+
+Over the next two weeks you'll set up your brand voice, import your audience and
+send your first automated sequence.
+
+Problem is, most teams never get past the setup screen. We made sure you will.
+
+[Start My First Campaign]
+
+Cheers,
+The Growces Team
+
+**P.S.** Finish setup this week and we'll double your trial credits."""
+
+# Markdown headings, echoed guidance and prose lines that start with heading words
+REALISTIC_LANDING_PAGE = """## 1. HERO SECTION
+# Launch Campaigns in Minutes, Not Weeks
+Subheadline: AI copy that sounds like your brand.
+**[Start Free Trial]**
+
+## 2. PROBLEM STATEMENT:
+Marketing teams spend days on drafts. Problem is, the deadlines don't move.
+
+## 3. SOLUTION
+Growces writes on-brand drafts in seconds.
+Solutions like ours used to need an agency; now your team owns the process.
+
+## 4. KEY BENEFITS (3-5 bullet points):
+- Ship campaigns 5x faster
+- Benefits compound as the model learns your voice
+- Consistent tone across channels
+
+## 5. SOCIAL PROOF
+"We cut our content calendar prep from a week to a day." - Dana M., Head of Marketing
+
+## 6. FINAL CTA SECTION
+Offer ends Friday. [Claim Your Trial] - 30-day money-back guarantee."""
+
+
+class TestSectionValidation:
+    """Test suite for parsing and validating sections"""
+
+    @pytest.mark.unit
+    def test_valid_email(self):
+        """Test a complete email has no issues"""
+        report = validate_content("email", EMAIL)
+        assert report.valid
+        assert report.sections["subject"].value == "Welcome aboard!"
+
+    @pytest.mark.unit
+    def test_missing_ps_and_long_subject_flagged(self):
+        """Test missing and over-long sections are reported"""
+        text = EMAIL.replace("Welcome aboard!", "W" * 60).split("P.S.")[0]
+        report = validate_content("email", text)
+        assert report.issues["ps"] == "missing"
+        assert report.issues["subject"].startswith("too long")
+
+    @pytest.mark.unit
+    def test_merge_replaces_and_inserts(self):
+        """Test merged sections replace in place or insert in template order"""
+        replaced = merge_section("email", EMAIL, "subject", "Subject Line: Hello!")
+        assert replaced.startswith("Subject Line: Hello!\nPreview Text:")
+
+        without_preview = EMAIL.replace("Preview Text: Your first week starts here\n", "")
+        inserted = merge_section("email", without_preview, "preview", "Preview Text: Hi")
+        assert validate_content("email", inserted).sections["preview"].value == "Hi"
+
+    @pytest.mark.unit
+    def test_landing_page_sections(self):
+        """Test landing page headings are recognised with list numbering"""
+        text = "1. HERO SECTION:\nBig headline\n\n2. PROBLEM STATEMENT:\nPain\n"
+        report = validate_content("landing_page", text)
+        assert "hero" in report.sections
+        assert report.issues["final_cta"] == "missing"
+
+    @pytest.mark.unit
+    def test_realistic_email_needs_no_repair(self):
+        """Test an email with a free-text CTA, as the template asks, validates"""
+        report = validate_content("email", REALISTIC_EMAIL)
+        assert report.valid, report.issues
+        assert report.sections["subject"].value == "Your 14-day trial starts today"
+
+    @pytest.mark.unit
+    def test_realistic_landing_page_sections(self):
+        """Test headings are found and prose starting with heading words is not"""
+        report = validate_content("landing_page", REALISTIC_LANDING_PAGE)
+        assert report.valid, report.issues
+
+        sections = report.sections
+        problem = REALISTIC_LANDING_PAGE[sections["problem"].start : sections["problem"].end]
+        assert "Problem is, the deadlines" in problem
+        assert "Solutions like ours" in sections["solution"].value
+        assert "Benefits compound" in sections["benefits"].value
+
+    @pytest.mark.unit
+    def test_prose_is_not_a_heading(self):
+        """Test a line merely starting with a section word is not taken as the section"""
+        text = "HERO SECTION:\nHeadline\n\nProblem is, teams are slow.\n"
+        report = validate_content("landing_page", text)
+        assert report.issues["problem"] == "missing"
+
+
+class TestTargetedRegeneration:
+    """Test only broken sections are regenerated"""
+
+    @pytest.mark.unit
+    def test_repair_only_missing_section(self, fake_client):
+        """Test a missing P.S. costs one small focused call"""
+        generator = ContentGenerator()
+        generator.backends["groq"] = GroqBackend(client=fake_client("P.S. Offer ends Friday."))
+        result = {
+            "content": EMAIL.split("P.S.")[0].rstrip(),
+            "type": "email",
+            "parameters": {"purpose": "Welcome", "audience": "Subscribers", "tone": "Friendly"},
+            "tokens": 100,
+            "time": 1.0,
+            "success": True,
+        }
+
+        repaired = generator.repair_sections(result)
+
+        calls = generator.client.chat.completions.calls
+        assert len(calls) == 1
+        assert calls[0]["max_tokens"] == 300
+        assert repaired["validation"]["repaired"] == ["ps"]
+        assert repaired["content"].endswith("P.S. Offer ends Friday.")
+        assert repaired["tokens"] > 100
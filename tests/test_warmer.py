@@ -0,0 +1,138 @@
+"""
+Unit tests for the cache warmer and the shared response store
+"""
+from datetime import datetime
+
+import pytest
+
+from src.generators.backends import GroqBackend
+from src.generators.cache import ResponseCache
+from src.generators.content_generator import ContentGenerator
+from src.generators.profiles import ProfileStore
+from src.generators.warmer import CacheWarmer, expand_manifest, in_window
+
+
+def make_profiles(tmp_path, cache_ttl=3600):
+    """Profile store caching social posts but not blog posts"""
+    path = tmp_path / "profiles.json"
+    path.write_text(
+        '{"content_types": {"social_post": {"cache_ttl": %d}, "blog_post": {}}}' % cache_ttl
+    )
+    return ProfileStore(path=str(path))
+
+
+class TestManifest:
+    """Test suite for manifest expansion and off-peak windows"""
+
+    @pytest.mark.unit
+    def test_expand_crosses_lists(self):
+        """Test list values are crossed and tones fall back to the manifest"""
+        requests = expand_manifest(
+            {
+                "tones": ["Professional", "Casual"],
+                "entries": [
+                    {
+                        "content_type": "social_post",
+                        "topic": ["Launch", "Sale"],
+                        "platform": "LinkedIn",
+                    }
+                ],
+            }
+        )
+        assert len(requests) == 4
+        assert ("social_post", {"topic": "Sale", "platform": "LinkedIn", "tone": "Casual"}) in (
+            requests
+        )
+
+    @pytest.mark.unit
+    def test_expand_rejects_missing_parameters(self):
+        """Test incomplete entries fail loudly"""
+        with pytest.raises(ValueError, match="missing"):
+            expand_manifest({"entries": [{"content_type": "ad_copy", "product": "X"}]})
+
+    @pytest.mark.unit
+    def test_window_wraps_midnight(self):
+        """Test off-peak windows spanning midnight"""
+        assert in_window("22:00-04:00", datetime(2024, 1, 1, 23, 30))
+        assert in_window("22:00-04:00", datetime(2024, 1, 1, 3, 0))
+        assert not in_window("22:00-04:00", datetime(2024, 1, 1, 12, 0))
+        assert in_window(None)
+
+
+class TestCacheWarmer:
+    """Test suite for warm-up runs"""
+
+    @pytest.mark.unit
+    def test_warm_generates_then_reports_coverage(self, tmp_path, fake_client):
+        """Test a second pass finds every entry already cached"""
+        generator = ContentGenerator(profiles=make_profiles(tmp_path))
+        generator.cache = ResponseCache(path=str(tmp_path / "responses.db"))
+        generator.backends["groq"] = GroqBackend(client=fake_client("Warm post"))
+        requests = [
+            ("social_post", {"topic": "Launch", "platform": "LinkedIn", "tone": "Casual"}),
+            ("social_post", {"topic": "Sale", "platform": "LinkedIn", "tone": "Casual"}),
+            ("blog_post", {"topic": "T", "keywords": "k", "tone": "Casual", "word_count": 300}),
+        ]
+        warmer = CacheWarmer(generator, requests_per_minute=0)
+
+        first = warmer.warm(requests)
+        assert (first.generated, first.already_cached, first.uncacheable) == (2, 0, 1)
+        assert first.coverage_before == 0.0
+        assert first.coverage_after == 1.0
+
+        second = warmer.warm(requests)
+        assert (second.generated, second.already_cached) == (0, 2)
+        assert second.coverage_before == 1.0
+        assert len(generator.client.chat.completions.calls) == 2
+
+    @pytest.mark.unit
+    def test_warmed_entries_shared_across_processes(self, tmp_path, fake_client):
+        """Test another cache on the same store serves warmed entries"""
+        store = str(tmp_path / "responses.db")
+        warm_generator = ContentGenerator(profiles=make_profiles(tmp_path))
+        warm_generator.cache = ResponseCache(path=store)
+        warm_generator.backends["groq"] = GroqBackend(client=fake_client("Warm post"))
+        params = {"topic": "Launch", "platform": "LinkedIn", "tone": "Casual"}
+        CacheWarmer(warm_generator, requests_per_minute=0).warm([("social_post", params)])
+
+        serving = ContentGenerator(profiles=make_profiles(tmp_path))
+        serving.cache = ResponseCache(path=store)
+        serving.backends["groq"] = GroqBackend(client=fake_client("Fresh post"))
+        result = serving.generate_social_post(**params)
+
+        assert result["cached"] is True
+        assert result["content"] == "Warm post"
+        assert serving.cache.stats()["hits"] == 1
+
+    @pytest.mark.unit
+    def test_closed_window_stops_run(self, tmp_path, fake_client):
+        """Test nothing is generated outside the off-peak window"""
+        generator = ContentGenerator(profiles=make_profiles(tmp_path))
+        generator.backends["groq"] = GroqBackend(client=fake_client())
+        params = {"topic": "Launch", "platform": "LinkedIn", "tone": "Casual"}
+        now = datetime.now()
+        closed = f"{(now.hour + 2) % 24:02d}:00-{(now.hour + 3) % 24:02d}:00"
+
+        report = CacheWarmer(generator, requests_per_minute=0).warm(
+            [("social_post", params)], window=closed
+        )
+        assert report.generated == 0
+        assert report.remaining == 1
+
+    @pytest.mark.unit
+    def test_warm_keys_match_interactive_profile(self, tmp_path, fake_client):
+        """Test a batch-lane model override does not change what gets warmed"""
+        path = tmp_path / "profiles.json"
+        path.write_text(
+            '{"content_types": {"social_post": {"cache_ttl": 3600, "batch_model": "small"}}}'
+        )
+        generator = ContentGenerator(profiles=ProfileStore(path=str(path)))
+        generator.cache = ResponseCache(path=str(tmp_path / "responses.db"))
+        generator.backends["groq"] = GroqBackend(client=fake_client("Warm post"))
+        params = {"topic": "Launch", "platform": "LinkedIn", "tone": "Casual"}
+
+        CacheWarmer(generator, requests_per_minute=0).warm([("social_post", params)])
+        result = generator.generate_social_post(**params)
+
+        assert result["cached"] is True
+        assert generator.client.chat.completions.calls[0]["model"] != "small"